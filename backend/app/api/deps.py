@@ -1,3 +1,6 @@
+import threading
+import time
+from collections import OrderedDict
 from collections.abc import Generator
 
 from fastapi import Depends, Header, HTTPException, status
@@ -10,7 +13,8 @@ from app.core.database import SessionLocal
 from app.core.security import SCOPE_FULL_ACCESS, decode_access_token
 from app.models import User
 from app.schemas import TokenPayload
-from app.services import user_service
+from app.services import advice_service, user_service
+from app.services.user_service import UserSnapshot
 
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/login")
@@ -32,56 +36,132 @@ def _credentials_exception() -> HTTPException:
     )
 
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
+# Bearer token -> verified claims. An entry is dropped at the token's exp, so a
+# hit returns exactly what decoding the token again would.
+_verified_tokens: OrderedDict[str, TokenPayload] = OrderedDict()
+_verified_tokens_lock = threading.Lock()
+
+
+def verify_token(token: str) -> TokenPayload:
+    """Signature-checked, validated claims of ``token``; raises ``JWTError``."""
+    now = time.time()
+    with _verified_tokens_lock:
+        claims = _verified_tokens.get(token)
+        if claims is not None:
+            if claims.exp > now:
+                _verified_tokens.move_to_end(token)
+                return claims
+            del _verified_tokens[token]
+    claims = TokenPayload(**decode_access_token(token))
+    if claims.exp is not None:
+        with _verified_tokens_lock:
+            _verified_tokens[token] = claims
+            while len(_verified_tokens) > settings.VERIFIED_TOKEN_CACHE_SIZE:
+                _verified_tokens.popitem(last=False)
+    return claims
+
+
+def get_token_payload(token: str = Depends(oauth2_scheme)) -> TokenPayload:
+    """Claims of the bearer token; FastAPI resolves this once per request."""
     try:
-        payload = decode_access_token(token)
-        token_data = TokenPayload(**payload)
-    except JWTError as exc:  # pragma: no cover - FastAPI handles response
+        return verify_token(token)
+    except JWTError as exc:
         raise _credentials_exception() from exc
-    if token_data.sub is None:
+
+
+def _user_id(token_payload: TokenPayload) -> int:
+    if token_payload.sub is None:
         raise _credentials_exception()
-    user = user_service.get(db, int(token_data.sub))
+    return int(token_payload.sub)
+
+
+def _require_not_banned(user: User | UserSnapshot) -> None:
+    if user.is_banned:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Account is banned",
+        )
+
+
+def get_current_user(
+    db: Session = Depends(get_db), token_payload: TokenPayload = Depends(get_token_payload)
+) -> User:
+    """The caller as a ``User`` row, for endpoints that read or change the profile."""
+    user = user_service.get(db, _user_id(token_payload))
     if not user:
         raise _credentials_exception()
+    _require_not_banned(user)
     return user
 
 
-def get_token_payload(token: str = Depends(oauth2_scheme)) -> TokenPayload:
-    try:
-        payload = decode_access_token(token)
-        return TokenPayload(**payload)
-    except JWTError as exc:  # pragma: no cover
-        raise _credentials_exception() from exc
+def get_current_user_snapshot(
+    db: Session = Depends(get_db), token_payload: TokenPayload = Depends(get_token_payload)
+) -> UserSnapshot:
+    """The caller's id, role, tier and currency, usually without touching the DB."""
+    snapshot = user_service.get_snapshot(db, _user_id(token_payload))
+    if not snapshot:
+        raise _credentials_exception()
+    _require_not_banned(snapshot)
+    return snapshot
 
 
-def get_current_full_access_user(
-    current_user: User = Depends(get_current_user),
-    token_payload: TokenPayload = Depends(get_token_payload),
-) -> User:
+def _require_full_access(token_payload: TokenPayload) -> None:
     if SCOPE_FULL_ACCESS not in token_payload.scopes:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Email verification required for this action",
         )
+
+
+def get_current_full_access_user(
+    current_user: User = Depends(get_current_user),
+    token_payload: TokenPayload = Depends(get_token_payload),
+) -> User:
+    _require_full_access(token_payload)
     return current_user
 
 
-def get_current_admin_user(current_user: User = Depends(get_current_user)) -> User:
+def get_full_access_user_snapshot(
+    current_user: UserSnapshot = Depends(get_current_user_snapshot),
+    token_payload: TokenPayload = Depends(get_token_payload),
+) -> UserSnapshot:
+    _require_full_access(token_payload)
+    return current_user
+
+
+def get_advice_quota_user(
+    current_user: User = Depends(get_current_full_access_user),
+) -> User:
+    """Full-access caller with an advice request left in their tier's daily quota."""
+    advice_service.consume_request_quota(current_user)
+    return current_user
+
+
+def _require_admin(current_user: User | UserSnapshot) -> None:
     if current_user.role != "ADMIN":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required",
         )
+
+
+def get_current_admin_user(current_user: User = Depends(get_current_user)) -> User:
+    _require_admin(current_user)
+    return current_user
+
+
+def get_admin_user_snapshot(
+    current_user: UserSnapshot = Depends(get_current_user_snapshot),
+) -> UserSnapshot:
+    _require_admin(current_user)
     return current_user
 
 
 def get_current_step_up_admin_user(
-    current_user: User = Depends(get_current_admin_user),
+    current_user: UserSnapshot = Depends(get_admin_user_snapshot),
     step_up_token: str | None = Header(
         default=None, alias="X-Admin-Step-Up-Token"),
-) -> User:
+) -> UserSnapshot:
     if not step_up_token:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -89,8 +169,7 @@ def get_current_step_up_admin_user(
         )
 
     try:
-        payload = decode_access_token(step_up_token)
-        token_data = TokenPayload(**payload)
+        token_data = verify_token(step_up_token)
     except JWTError as exc:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
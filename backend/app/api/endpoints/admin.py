@@ -1,23 +1,28 @@
 from datetime import datetime, timezone
 from time import perf_counter
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import func, select, text
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.api import deps
 from app.core.config import settings
 from app.core.security import create_access_token, token_expiration, verify_password
-from app.models import User
+from app.models import TransactionType, User
 from app.schemas import (
     AdminStatsResponse,
     AdminStepUpRequest,
     AdminStepUpResponse,
     AdminTierBreakdown,
     AdminUserUpdate,
+    ExchangeRateLoadResult,
     UserRead,
 )
-from app.services import user_service
+from app.services import currency_service, export_service, user_service
+from app.services.transaction_service import EXPORT_COLUMNS
+from app.services.user_service import UserSnapshot
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -70,7 +75,7 @@ def step_up_verify(
 def admin_stats(
     *,
     db: Session = Depends(deps.get_db),
-    _: User = Depends(deps.get_current_step_up_admin_user),
+    _: UserSnapshot = Depends(deps.get_current_step_up_admin_user),
 ) -> AdminStatsResponse:
     total_users = db.scalar(select(func.count(User.id))) or 0
     free_count = db.scalar(select(func.count(User.id)).where(
@@ -97,18 +102,74 @@ def admin_stats(
 def list_all_users(
     *,
     db: Session = Depends(deps.get_db),
-    _: User = Depends(deps.get_current_step_up_admin_user),
+    _: UserSnapshot = Depends(deps.get_current_step_up_admin_user),
 ) -> list[UserRead]:
     return user_service.list_users(db)
 
 
+@router.get("/transactions/export", response_class=StreamingResponse)
+def export_all_transactions(
+    *,
+    _: UserSnapshot = Depends(deps.get_current_step_up_admin_user),
+    export_format: str = Query(
+        default="parquet", alias="format", pattern=export_service.FORMAT_PATTERN),
+    user_id: int | None = None,
+    start_at: datetime | None = None,
+    end_at: datetime | None = None,
+    category: str | None = None,
+    transaction_type: TransactionType | None = None,
+) -> StreamingResponse:
+    """Stream transactions across all users (or one ``user_id``) for analytics."""
+    return export_service.streaming_response(
+        user_id,
+        export_format,
+        filename="all-transactions" if user_id is None else f"user-{user_id}-transactions",
+        columns=("user_id", *EXPORT_COLUMNS),
+        start_at=start_at,
+        end_at=end_at,
+        category=category,
+        transaction_type=transaction_type,
+    )
+
+
+@router.post("/exchange-rates", response_model=ExchangeRateLoadResult)
+def load_exchange_rates(
+    *,
+    db: Session = Depends(deps.get_db),
+    _: UserSnapshot = Depends(deps.get_current_step_up_admin_user),
+    file: UploadFile = File(...),
+    file_format: str | None = Query(default=None, alias="format"),
+) -> ExchangeRateLoadResult:
+    """Load an ECB reference-rate file (XML or CSV); existing dates are overwritten."""
+    resolved_format = currency_service.detect_format(file.filename, file_format)
+    if resolved_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported file format. Use xml or csv.",
+        )
+    try:
+        stored = currency_service.load_file(db, file.file, resolved_format)
+    except (ValueError, SyntaxError, IntegrityError) as exc:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Malformed rate file: {exc}",
+        ) from exc
+    snapshot = currency_service.rates()
+    return ExchangeRateLoadResult(
+        stored=stored,
+        currencies=len(snapshot.currencies),
+        latest_rate_date=snapshot.latest_date,
+    )
+
+
 @router.patch("/users/{user_id}", response_model=UserRead)
 def update_user_admin_fields(
     *,
     db: Session = Depends(deps.get_db),
     user_id: int,
     user_in: AdminUserUpdate,
-    current_admin: User = Depends(deps.get_current_step_up_admin_user),
+    current_admin: UserSnapshot = Depends(deps.get_current_step_up_admin_user),
 ) -> UserRead:
     user = user_service.get(db, user_id)
     if not user:
@@ -132,7 +193,7 @@ def delete_user(
     *,
     db: Session = Depends(deps.get_db),
     user_id: int,
-    current_admin: User = Depends(deps.get_current_step_up_admin_user),
+    current_admin: UserSnapshot = Depends(deps.get_current_step_up_admin_user),
 ) -> Response:
     user = user_service.get(db, user_id)
     if not user:
@@ -153,6 +214,5 @@ def delete_user(
             detail="You cannot delete another admin",
         )
 
-    db.delete(user)
-    db.commit()
+    user_service.delete(db, user)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
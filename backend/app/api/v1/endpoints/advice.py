@@ -1,26 +1,38 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.orm import Session
 
-from app.api import deps
+from app.api import conditional, deps
 from app.models import User
 from app.schemas import AdviceRead, AdviceRequest, ConversationSummary
-from app.services import advice_service
+from app.services import advice_service, data_version_service
+from app.services.user_service import UserSnapshot
 
 router = APIRouter(prefix="/advice", tags=["advice"])
 
 
 @router.get("", response_model=list[AdviceRead])
 def list_advice(
-    *, db: Session = Depends(deps.get_db), current_user: User = Depends(deps.get_current_user), limit: int = 20
+    *, db: Session = Depends(deps.get_db), current_user: UserSnapshot = Depends(deps.get_current_user_snapshot), limit: int = 20
 ) -> list[AdviceRead]:
     return advice_service.list_advice(db, current_user.id, limit)
 
 
 @router.get("/conversations", response_model=list[ConversationSummary])
 def list_conversations(
-    *, db: Session = Depends(deps.get_db), current_user: User = Depends(deps.get_current_user)
-) -> list[ConversationSummary]:
+    *,
+    request: Request,
+    response: Response,
+    db: Session = Depends(deps.get_db),
+    current_user: UserSnapshot = Depends(deps.get_current_user_snapshot),
+) -> list[ConversationSummary] | Response:
     """Get list of all conversations for the current user."""
+    etag = conditional.make_etag(
+        "conversations",
+        current_user.id,
+        data_version_service.current(db, current_user.id, data_version_service.ADVICE),
+    )
+    if cached := conditional.not_modified(request, response, etag):
+        return cached
     return advice_service.list_conversations(db, current_user.id)
 
 
@@ -28,7 +40,7 @@ def list_conversations(
 def get_conversation(
     *,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: UserSnapshot = Depends(deps.get_current_user_snapshot),
     conversation_id: str
 ) -> list[AdviceRead]:
     """Get all messages in a specific conversation."""
@@ -36,20 +48,20 @@ def get_conversation(
 
 
 @router.post("", response_model=AdviceRead, status_code=status.HTTP_201_CREATED)
-def create_advice(
+async def create_advice(
     *,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_full_access_user),
+    current_user: User = Depends(deps.get_advice_quota_user),
     advice_in: AdviceRequest,
 ) -> AdviceRead:
-    return advice_service.generate_advice(db, current_user, advice_in)
+    return await advice_service.generate_advice(db, current_user, advice_in)
 
 
 @router.delete("/conversations/{conversation_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_conversation(
     *,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_full_access_user),
+    current_user: UserSnapshot = Depends(deps.get_full_access_user_snapshot),
     conversation_id: str
 ) -> None:
     """Delete a specific conversation."""
@@ -58,7 +70,7 @@ def delete_conversation(
 
 @router.delete("", status_code=status.HTTP_204_NO_CONTENT)
 def clear_advice_history(
-    *, db: Session = Depends(deps.get_db), current_user: User = Depends(deps.get_current_full_access_user)
+    *, db: Session = Depends(deps.get_db), current_user: UserSnapshot = Depends(deps.get_full_access_user_snapshot)
 ) -> None:
     """Clear all advice history for the current user."""
     advice_service.clear_advice(db, current_user.id)
@@ -1,5 +1,3 @@
-from datetime import datetime, timedelta, timezone
-
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel
 from sqlalchemy.exc import IntegrityError
@@ -7,10 +5,12 @@ from sqlalchemy.orm import Session
 
 from app.api import deps
 from app.core.config import settings
+from app.core.rate_limit import RateLimiter
 from app.core.security import (
     SCOPE_FULL_ACCESS,
     SCOPE_READ_ONLY,
     SCOPE_VERIFICATION_PENDING,
+    PasswordHasherBusyError,
     create_access_token,
     token_expiration,
 )
@@ -24,28 +24,13 @@ from app.services.email_service import (
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-_ip_attempts: dict[str, list[datetime]] = {}
-
-
-def _is_ip_rate_limited(client_ip: str) -> bool:
-    now = datetime.now(timezone.utc)
-    window_start = now - timedelta(minutes=settings.AUTH_LOCKOUT_MINUTES)
-    attempts = [ts for ts in _ip_attempts.get(
-        client_ip, []) if ts >= window_start]
-    _ip_attempts[client_ip] = attempts
-    return len(attempts) >= settings.AUTH_MAX_FAILED_ATTEMPTS
-
-
-def _record_ip_failure(client_ip: str) -> None:
-    now = datetime.now(timezone.utc)
-    attempts = _ip_attempts.get(client_ip, [])
-    attempts.append(now)
-    window_start = now - timedelta(minutes=settings.AUTH_LOCKOUT_MINUTES)
-    _ip_attempts[client_ip] = [ts for ts in attempts if ts >= window_start]
-
-
-def _clear_ip_failures(client_ip: str) -> None:
-    _ip_attempts.pop(client_ip, None)
+# Failed logins per client IP, shared by the workers with a shared backend.
+_failed_logins = RateLimiter(
+    "login_failures",
+    limit=settings.AUTH_MAX_FAILED_ATTEMPTS,
+    window_seconds=settings.AUTH_LOCKOUT_MINUTES * 60,
+    buckets=settings.AUTH_LOCKOUT_MINUTES,
+)
 
 
 class VerifyEmailRequest(BaseModel):
@@ -74,6 +59,8 @@ def register_user(*, db: Session = Depends(deps.get_db), user_in: UserCreate) ->
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         ) from exc
+    except PasswordHasherBusyError:
+        raise  # answered with a 503 by the app's exception handler
     except Exception as exc:
         db.rollback()
         raise HTTPException(
@@ -126,7 +113,7 @@ def resend_verification(*, db: Session = Depends(deps.get_db), request: ResendVe
 @router.post("/login", response_model=Token)
 def login(*, request: Request, db: Session = Depends(deps.get_db), credentials: LoginRequest) -> Token:
     client_ip = request.client.host if request.client else "unknown"
-    if _is_ip_rate_limited(client_ip):
+    if _failed_logins.is_limited(client_ip):
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail="Too many failed login attempts. Try again later.",
@@ -139,22 +126,16 @@ def login(*, request: Request, db: Session = Depends(deps.get_db), credentials:
             detail="Account is temporarily locked due to failed login attempts.",
         )
 
-    auth_user = user_service.authenticate(
-        db, credentials.email, credentials.password)
-    if not auth_user:
-        if user:
-            user_service.register_failed_login(db, user)
-        _record_ip_failure(client_ip)
+    if not user_service.check_login(db, user, credentials.password):
+        _failed_logins.hit(client_ip)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect email or password",
         )
 
-    user_service.reset_login_failures(db, auth_user)
-    user_service.register_successful_login(db, auth_user)
-    _clear_ip_failures(client_ip)
+    _failed_logins.reset(client_ip)
 
-    if auth_user.is_email_verified:
+    if user.is_email_verified:
         scopes = [SCOPE_FULL_ACCESS, SCOPE_READ_ONLY]
         expires = token_expiration(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -166,10 +147,10 @@ def login(*, request: Request, db: Session = Depends(deps.get_db), credentials:
         requires_verification = True
 
     access_token = create_access_token(
-        auth_user.id,
+        user.id,
         expires,
         scopes=scopes,
-        email_verified=auth_user.is_email_verified,
+        email_verified=user.is_email_verified,
     )
     return Token(
         access_token=access_token,
@@ -1,26 +1,45 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
-from app.api import deps
-from app.models import User
+from app.api import conditional, deps
 from app.schemas import BudgetCreate, BudgetRead, BudgetUpdate
-from app.services import budget_service
+from app.services import budget_service, data_version_service, display_service
+from app.services.user_service import UserSnapshot
 
 router = APIRouter(prefix="/budgets", tags=["budgets"])
 
 
 @router.get("", response_model=list[BudgetRead])
 def list_budgets(
-    *, db: Session = Depends(deps.get_db), current_user: User = Depends(deps.get_current_user)
-) -> list[BudgetRead]:
-    return budget_service.list_budgets(db, current_user.id)
+    *,
+    request: Request,
+    response: Response,
+    db: Session = Depends(deps.get_db),
+    current_user: UserSnapshot = Depends(deps.get_current_user_snapshot),
+    display_currency: str | None = Query(default=None, min_length=3, max_length=3),
+) -> list[BudgetRead] | Response:
+    """List budgets; ``display_currency`` adds ``display_limit_amount`` at the rate on ``starts_on``."""
+    display_currency = display_service.resolve(display_currency)
+    etag = conditional.make_etag(
+        "budgets",
+        current_user.id,
+        data_version_service.current(db, current_user.id, data_version_service.BUDGETS),
+        current_user.currency,
+        display_service.etag_part(display_currency),
+    )
+    if cached := conditional.not_modified(request, response, etag):
+        return cached
+    budgets = budget_service.list_budgets(db, current_user.id)
+    if display_currency:
+        display_service.budgets(budgets, current_user.currency, display_currency)
+    return budgets
 
 
 @router.post("", response_model=BudgetRead, status_code=status.HTTP_201_CREATED)
 def create_budget(
     *,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_full_access_user),
+    current_user: UserSnapshot = Depends(deps.get_full_access_user_snapshot),
     budget_in: BudgetCreate,
 ) -> BudgetRead:
     return budget_service.create_budget(db, current_user.id, budget_in)
@@ -30,7 +49,7 @@ def create_budget(
 def update_budget(
     *,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_full_access_user),
+    current_user: UserSnapshot = Depends(deps.get_full_access_user_snapshot),
     budget_id: int,
     budget_in: BudgetUpdate,
 ) -> BudgetRead:
@@ -39,6 +58,6 @@ def update_budget(
 
 @router.delete("/{budget_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_budget(
-    *, db: Session = Depends(deps.get_db), current_user: User = Depends(deps.get_current_full_access_user), budget_id: int
+    *, db: Session = Depends(deps.get_db), current_user: UserSnapshot = Depends(deps.get_full_access_user_snapshot), budget_id: int
 ) -> None:
     budget_service.delete_budget(db, current_user.id, budget_id)
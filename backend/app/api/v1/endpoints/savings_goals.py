@@ -1,18 +1,29 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.orm import Session
 
-from app.api import deps
-from app.models import User
+from app.api import conditional, deps
 from app.schemas import SavingsGoalCreate, SavingsGoalRead, SavingsGoalUpdate
-from app.services import savings_goal_service
+from app.services import data_version_service, savings_goal_service
+from app.services.user_service import UserSnapshot
 
 router = APIRouter(prefix="/savings-goals", tags=["savings-goals"])
 
 
 @router.get("", response_model=list[SavingsGoalRead])
 def list_savings_goals(
-    *, db: Session = Depends(deps.get_db), current_user: User = Depends(deps.get_current_user)
-) -> list[SavingsGoalRead]:
+    *,
+    request: Request,
+    response: Response,
+    db: Session = Depends(deps.get_db),
+    current_user: UserSnapshot = Depends(deps.get_current_user_snapshot),
+) -> list[SavingsGoalRead] | Response:
+    etag = conditional.make_etag(
+        "savings_goals",
+        current_user.id,
+        data_version_service.current(db, current_user.id, data_version_service.SAVINGS_GOALS),
+    )
+    if cached := conditional.not_modified(request, response, etag):
+        return cached
     return savings_goal_service.list_savings_goals(db, current_user.id)
 
 
@@ -20,7 +31,7 @@ def list_savings_goals(
 def create_savings_goal(
     *,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_full_access_user),
+    current_user: UserSnapshot = Depends(deps.get_full_access_user_snapshot),
     goal_in: SavingsGoalCreate,
 ) -> SavingsGoalRead:
     return savings_goal_service.create_savings_goal(db, current_user.id, goal_in)
@@ -30,7 +41,7 @@ def create_savings_goal(
 def update_savings_goal(
     *,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_full_access_user),
+    current_user: UserSnapshot = Depends(deps.get_full_access_user_snapshot),
     goal_id: int,
     goal_in: SavingsGoalUpdate,
 ) -> SavingsGoalRead:
@@ -39,6 +50,6 @@ def update_savings_goal(
 
 @router.delete("/{goal_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_savings_goal(
-    *, db: Session = Depends(deps.get_db), current_user: User = Depends(deps.get_current_full_access_user), goal_id: int
+    *, db: Session = Depends(deps.get_db), current_user: UserSnapshot = Depends(deps.get_full_access_user_snapshot), goal_id: int
 ) -> None:
     savings_goal_service.delete_savings_goal(db, current_user.id, goal_id)
@@ -1,12 +1,34 @@
-from datetime import date, datetime, time, timezone
+import codecs
+import csv
+from datetime import date, datetime
+from typing import Literal
 
-from fastapi import APIRouter, Query, Depends, status
+from fastapi import APIRouter, File, Query, Depends, HTTPException, Request, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.api import deps
-from app.models import TransactionType, User
-from app.schemas import CategoryBreakdown, MonthlyInsight, TransactionCreate, TransactionRead, TransactionUpdate
-from app.services import transaction_service
+from app.api import conditional, deps
+from app.core.config import settings
+from app.models import TransactionType
+from app.schemas import (
+    MonthlyInsight,
+    TimeSeriesResponse,
+    TransactionBatchRequest,
+    TransactionBatchResponse,
+    TransactionCreate,
+    TransactionImportResult,
+    TransactionRead,
+    TransactionUpdate,
+)
+from app.services import (
+    data_version_service,
+    display_service,
+    export_service,
+    import_service,
+    transaction_service,
+    user_service,
+)
+from app.services.user_service import UserSnapshot
 
 router = APIRouter(prefix="/transactions", tags=["transactions"])
 
@@ -14,16 +36,48 @@ router = APIRouter(prefix="/transactions", tags=["transactions"])
 @router.get("", response_model=list[TransactionRead])
 def list_my_transactions(
     *,
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: UserSnapshot = Depends(deps.get_current_user_snapshot),
     start_at: datetime | None = None,
     end_at: datetime | None = None,
     category: str | None = None,
     transaction_type: TransactionType | None = None,
     limit: int = Query(default=100, ge=1, le=500),
     offset: int = Query(default=0, ge=0),
-) -> list[TransactionRead]:
-    return transaction_service.list_transactions(
+    cursor: str | None = None,
+    q: str | None = Query(default=None, max_length=200),
+    display_currency: str | None = Query(default=None, min_length=3, max_length=3),
+) -> list[TransactionRead] | Response:
+    """List transactions, newest first.
+
+    Full pages carry an ``X-Next-Cursor`` header; pass it back as ``cursor`` to
+    fetch the next page. ``offset`` is kept for older clients only.
+    ``q`` searches notes and categories and orders by relevance; page search
+    results with ``offset``. ``display_currency`` adds ``display_amount``,
+    converted at the rate on each transaction's date. ``limit`` and
+    ``start_at`` are capped by the subscription tier.
+    """
+    if cursor and offset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either cursor or offset, not both",
+        )
+    display_currency = display_service.resolve(display_currency)
+    limit = user_service.transaction_page_limit(current_user, limit)
+    start_at = user_service.transaction_history_start(current_user, start_at)
+    etag = conditional.make_etag(
+        "transactions",
+        current_user.id,
+        data_version_service.current(db, current_user.id, data_version_service.TRANSACTIONS),
+        sorted(request.query_params.multi_items()),
+        (limit, start_at),
+        display_service.etag_part(display_currency),
+    )
+    if cached := conditional.not_modified(request, response, etag):
+        return cached
+    transactions = transaction_service.list_transactions(
         db,
         current_user.id,
         start_at=start_at,
@@ -32,6 +86,42 @@ def list_my_transactions(
         transaction_type=transaction_type,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        q=q,
+    )
+    if display_currency:
+        display_service.transactions(transactions, display_currency)
+    next_cursor = None if q else transaction_service.next_cursor(transactions, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return transactions
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_my_transactions(
+    *,
+    current_user: UserSnapshot = Depends(deps.get_current_user_snapshot),
+    export_format: str = Query(
+        default="csv", alias="format", pattern=export_service.FORMAT_PATTERN),
+    start_at: datetime | None = None,
+    end_at: datetime | None = None,
+    category: str | None = None,
+    transaction_type: TransactionType | None = None,
+) -> StreamingResponse:
+    """Stream every matching transaction as CSV, TSV, NDJSON, a JSON array,
+    an Arrow IPC stream or Parquet.
+
+    Takes the same filters as the list endpoint but has no page cap; the
+    tier's history window still applies. Rows come from a server-side
+    cursor, so memory use does not grow with the export size.
+    """
+    return export_service.streaming_response(
+        current_user.id,
+        export_format,
+        start_at=user_service.transaction_history_start(current_user, start_at),
+        end_at=end_at,
+        category=category,
+        transaction_type=transaction_type,
     )
 
 
@@ -39,15 +129,63 @@ def list_my_transactions(
 def create_transaction(
     *,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_full_access_user),
+    current_user: UserSnapshot = Depends(deps.get_full_access_user_snapshot),
     tx_in: TransactionCreate,
 ) -> TransactionRead:
     return transaction_service.create_transaction(db, current_user.id, tx_in)
 
 
+@router.post("/batch", response_model=TransactionBatchResponse)
+def apply_transaction_batch(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_user: UserSnapshot = Depends(deps.get_full_access_user_snapshot),
+    batch_in: TransactionBatchRequest,
+) -> TransactionBatchResponse:
+    """Apply many create/update/delete operations with a single commit."""
+    return transaction_service.apply_batch(db, current_user.id, batch_in)
+
+
+@router.post("/import", response_model=TransactionImportResult)
+def import_transactions(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_user: UserSnapshot = Depends(deps.get_full_access_user_snapshot),
+    file: UploadFile = File(...),
+    file_format: str | None = Query(default=None, alias="format"),
+    batch_size: int | None = Query(
+        default=None, ge=1, le=settings.TRANSACTION_IMPORT_MAX_BATCH_SIZE),
+) -> TransactionImportResult:
+    """Bulk-import a CSV, OFX or QIF bank export.
+
+    The upload is parsed as a stream; invalid rows are reported per row and
+    everything valid is committed together.
+    """
+    resolved_format = import_service.detect_format(file.filename, file_format)
+    if resolved_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported file format. Use csv, ofx or qif.",
+        )
+    stream = codecs.getreader("utf-8-sig")(file.file, errors="replace")
+    try:
+        return import_service.import_transactions(
+            db,
+            current_user.id,
+            stream,
+            resolved_format,
+            batch_size=batch_size or settings.TRANSACTION_IMPORT_BATCH_SIZE,
+        )
+    except csv.Error as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Malformed file: {exc}",
+        ) from exc
+
+
 @router.get("/{transaction_id}", response_model=TransactionRead)
 def get_transaction(
-    *, db: Session = Depends(deps.get_db), current_user: User = Depends(deps.get_current_user), transaction_id: int
+    *, db: Session = Depends(deps.get_db), current_user: UserSnapshot = Depends(deps.get_current_user_snapshot), transaction_id: int
 ) -> TransactionRead:
     return transaction_service.get_transaction(db, current_user.id, transaction_id)
 
@@ -56,7 +194,7 @@ def get_transaction(
 def update_transaction(
     *,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_full_access_user),
+    current_user: UserSnapshot = Depends(deps.get_full_access_user_snapshot),
     transaction_id: int,
     tx_in: TransactionUpdate,
 ) -> TransactionRead:
@@ -65,7 +203,7 @@ def update_transaction(
 
 @router.delete("/{transaction_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_transaction(
-    *, db: Session = Depends(deps.get_db), current_user: User = Depends(deps.get_current_full_access_user), transaction_id: int
+    *, db: Session = Depends(deps.get_db), current_user: UserSnapshot = Depends(deps.get_full_access_user_snapshot), transaction_id: int
 ) -> None:
     transaction_service.delete_transaction(db, current_user.id, transaction_id)
 
@@ -73,40 +211,90 @@ def delete_transaction(
 @router.get("/insights/monthly", response_model=MonthlyInsight)
 def monthly_insight(
     *,
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: UserSnapshot = Depends(deps.get_current_user_snapshot),
     reference_date: date | None = None,
-) -> MonthlyInsight:
-    from decimal import Decimal
-    from dateutil.relativedelta import relativedelta
-
-    reference = reference_date or date.today()
-    reference_dt = datetime.combine(reference, time.min, tzinfo=timezone.utc)
-
-    # Current month data
-    total_income, total_expense = transaction_service.monthly_summary(
-        db, current_user.id, reference_dt)
-    categories = transaction_service.top_expense_categories(
-        db, current_user.id, reference_dt)
-    balance = total_income - total_expense
-
-    # Previous month data for trends and carryover
-    prev_month_date = reference - relativedelta(months=1)
-    prev_month_dt = datetime.combine(
-        prev_month_date, time.min, tzinfo=timezone.utc)
-    prev_total_income, prev_total_expense = transaction_service.monthly_summary(
-        db, current_user.id, prev_month_dt)
-    carryover = prev_total_income - prev_total_expense  # Previous month's leftover
-
-    return MonthlyInsight(
-        month=reference.strftime("%Y-%m"),
-        total_income=total_income,
-        total_expense=total_expense,
-        balance=balance,
-        top_expense_categories=[
-            CategoryBreakdown(category=category, amount=amount) for category, amount in categories
-        ],
-        prev_total_income=prev_total_income,
-        prev_total_expense=prev_total_expense,
-        carryover=carryover,
+    display_currency: str | None = Query(default=None, min_length=3, max_length=3),
+) -> MonthlyInsight | Response:
+    """Totals of the month of ``reference_date`` (default today) and the one before.
+
+    ``reference_date`` is moved forward into the subscription tier's history
+    window, and nothing before the window is counted: a previous month that
+    starts earlier reports zeros.
+    """
+    start_at = user_service.transaction_history_start(current_user, None)
+    reference = user_service.transaction_history_first_day(
+        current_user, reference_date or date.today())
+    display_currency = display_service.resolve(display_currency)
+    etag = conditional.make_etag(
+        "insight",
+        current_user.id,
+        data_version_service.current(db, current_user.id, data_version_service.TRANSACTIONS),
+        reference.isoformat(),
+        start_at,
+        display_service.etag_part(display_currency),
+    )
+    if cached := conditional.not_modified(request, response, etag):
+        return cached
+    insight = transaction_service.monthly_insight(db, current_user.id, reference, start_at=start_at)
+    if display_currency:
+        return display_service.insight(insight, current_user.currency, display_currency)
+    return insight
+
+
+@router.get("/insights/series", response_model=TimeSeriesResponse)
+def time_series(
+    *,
+    request: Request,
+    response: Response,
+    db: Session = Depends(deps.get_db),
+    current_user: UserSnapshot = Depends(deps.get_current_user_snapshot),
+    granularity: Literal["day", "week", "month", "year"] = "month",
+    start: date | None = None,
+    end: date | None = None,
+    group_by: Literal["category", "type"] = "type",
+    transaction_type: TransactionType | None = None,
+    display_currency: str | None = Query(default=None, min_length=3, max_length=3),
+) -> TimeSeriesResponse | Response:
+    """Dense income/expense series per category or type, one point per bucket.
+
+    Without ``start`` the last 30 days, 12 weeks, 12 months or 5 years up to
+    ``end`` (default today) are returned. ``display_currency`` converts
+    every point at the rate on its first day. ``start`` is moved forward into the
+    subscription tier's history window, and nothing before the window is
+    counted, so the first bucket may only cover part of its week, month or year.
+    """
+    start_at = user_service.transaction_history_start(current_user, None)
+    end = end or date.today()
+    start = user_service.transaction_history_first_day(
+        current_user, start or transaction_service.default_series_start(end, granularity))
+    display_currency = display_service.resolve(display_currency)
+    etag = conditional.make_etag(
+        "series",
+        current_user.id,
+        data_version_service.current(db, current_user.id, data_version_service.TRANSACTIONS),
+        granularity,
+        start,
+        start_at,
+        end,
+        group_by,
+        transaction_type,
+        display_service.etag_part(display_currency),
+    )
+    if cached := conditional.not_modified(request, response, etag):
+        return cached
+    series = transaction_service.time_series(
+        db,
+        current_user.id,
+        granularity=granularity,
+        start=start,
+        end=end,
+        group_by=group_by,
+        transaction_type=transaction_type,
+        start_at=start_at,
     )
+    if display_currency:
+        return display_service.series(series, current_user.currency, display_currency)
+    return series
@@ -1,17 +1,18 @@
 import base64
 import os
 import uuid
-from decimal import Decimal
+from datetime import datetime
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
-from pydantic import BaseModel
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Response, UploadFile, status
+from pydantic import BaseModel, ConfigDict
 from sqlalchemy.orm import Session
 
 from app.api import deps
-from app.models import User, Transaction, BudgetGoal
+from app.models import CurrencyChangeStatus, User
 from app.schemas import PasswordChange, UserRead, UserUpdate
-from app.services import user_service
-from app.services.currency_service import convert_amount, get_supported_currencies
+from app.services import currency_change_service, user_service
+from app.services.currency_service import get_supported_currencies
+from app.services.user_service import UserSnapshot
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -141,6 +142,23 @@ class CurrencyChangeResponse(BaseModel):
     transactions_converted: int
     budgets_converted: int
     message: str
+    job_id: int | None = None  # Set when the conversion continues in the background
+
+
+class CurrencyChangeJobRead(BaseModel):
+    id: int
+    status: CurrencyChangeStatus
+    old_currency: str
+    new_currency: str
+    convert_values: bool
+    total_transactions: int
+    processed_transactions: int
+    budgets_converted: int
+    error: str | None
+    created_at: datetime
+    finished_at: datetime | None
+
+    model_config = ConfigDict(from_attributes=True)
 
 
 @router.get("/me/supported-currencies")
@@ -154,10 +172,15 @@ def change_currency(
     *,
     db: Session = Depends(deps.get_db),
     request: CurrencyChangeRequest,
-    current_user: User = Depends(deps.get_current_user),
+    response: Response,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(deps.get_current_full_access_user),
 ):
     """
     Change user's currency and optionally convert all transaction and budget values.
+
+    Large histories are converted in the background: the response is 202 with
+    a ``job_id`` to poll at ``/me/change-currency/jobs/{job_id}``.
     """
     new_currency = request.new_currency.upper()
     old_currency = current_user.currency.upper()
@@ -180,45 +203,60 @@ def change_currency(
             message="Валутата е веќе поставена.",
         )
 
-    transactions_converted = 0
-    budgets_converted = 0
-
-    if request.convert_values:
-        # Convert all transactions
-        transactions = db.query(Transaction).filter(
-            Transaction.user_id == current_user.id).all()
-        for tx in transactions:
-            old_amount = Decimal(str(tx.amount))
-            tx.amount = convert_amount(old_amount, old_currency, new_currency)
-            tx.currency = new_currency
-            transactions_converted += 1
-
-        # Convert all budgets
-        budgets = db.query(BudgetGoal).filter(
-            BudgetGoal.user_id == current_user.id).all()
-        for budget in budgets:
-            old_amount = Decimal(str(budget.limit_amount))
-            budget.limit_amount = convert_amount(
-                old_amount, old_currency, new_currency)
-            budgets_converted += 1
-
-        # Convert monthly income
-        if current_user.monthly_income:
-            old_income = Decimal(str(current_user.monthly_income))
-            current_user.monthly_income = convert_amount(
-                old_income, old_currency, new_currency)
-
-    # Update user's currency
-    current_user.currency = new_currency
-    db.add(current_user)
-    db.commit()
-    db.refresh(current_user)
+    job = currency_change_service.start(
+        db, current_user, new_currency, request.convert_values)
+    if currency_change_service.runs_in_background(job):
+        background_tasks.add_task(currency_change_service.run_by_id, job.id)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return CurrencyChangeResponse(
+            success=True,
+            old_currency=old_currency,
+            new_currency=new_currency,
+            transactions_converted=0,
+            budgets_converted=0,
+            message="Промената на валутата се извршува во позадина.",
+            job_id=job.id,
+        )
 
+    currency_change_service.run(db, job)
+    if job.status != CurrencyChangeStatus.COMPLETED:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Промената на валутата не успеа.",
+        )
     return CurrencyChangeResponse(
         success=True,
         old_currency=old_currency,
         new_currency=new_currency,
-        transactions_converted=transactions_converted,
-        budgets_converted=budgets_converted,
+        transactions_converted=job.processed_transactions if job.convert_values else 0,
+        budgets_converted=job.budgets_converted,
         message=f"Валутата е променета од {old_currency} во {new_currency}.",
+        job_id=job.id,
     )
+
+
+@router.get("/me/change-currency/jobs/{job_id}", response_model=CurrencyChangeJobRead)
+def read_currency_change_job(
+    job_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: UserSnapshot = Depends(deps.get_current_user_snapshot),
+):
+    """Progress of a currency change."""
+    return currency_change_service.get_job(db, current_user.id, job_id)
+
+
+@router.post(
+    "/me/change-currency/jobs/{job_id}/resume",
+    response_model=CurrencyChangeJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def resume_currency_change_job(
+    job_id: int,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_full_access_user),
+):
+    """Continue a failed or interrupted currency change from its last committed chunk."""
+    job = currency_change_service.prepare_resume(db, current_user.id, job_id)
+    background_tasks.add_task(currency_change_service.run_by_id, job.id)
+    return job
@@ -1,7 +1,7 @@
 from functools import lru_cache
 import json
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -29,14 +29,58 @@ class Settings(BaseSettings):
     AUTH_LOCKOUT_MINUTES: int = 15
     ADMIN_STEP_UP_TTL_MINUTES: int = 15
     ADMIN_STEP_UP_PIN: str | None = None
+    # bcrypt worker processes (0 hashes inline on the request thread).
+    PASSWORD_HASH_WORKERS: int = 2
+    # Hash/verify calls allowed to wait for a worker before answering 503.
+    PASSWORD_HASH_MAX_PENDING: int = 8
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+    # Per-process cache of the authenticated user's id/role/tier/currency.
+    USER_SNAPSHOT_TTL_SECONDS: float = 30.0
+    USER_SNAPSHOT_CACHE_SIZE: int = 10000
+    # last_login_at is written in batches this often (0 writes on every login).
+    LAST_LOGIN_FLUSH_SECONDS: float = 5.0
+    # Verified bearer tokens remembered per process (each until its exp).
+    VERIFIED_TOKEN_CACHE_SIZE: int = 4096
+    # Where rate-limit counters live: "memory" (per process) or "sqlite" (a
+    # file shared by all workers on the host).
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_SQLITE_PATH: str = "./rate_limits.db"
+    # Keys the memory backend keeps before dropping the least recently used.
+    RATE_LIMIT_MAX_KEYS: int = 50000
 
     OPENAI_API_KEY: str | None = None
     GOOGLE_GEMINI_API_KEY: str | None = None
     GROQ_API_KEY: str | None = None
+    OPENAI_API_BASE_URL: str = "https://api.openai.com/v1"
+    GOOGLE_GEMINI_API_BASE_URL: str = "https://generativelanguage.googleapis.com/v1beta"
+    GROQ_API_BASE_URL: str = "https://api.groq.com/openai/v1"
+    AI_HTTP_TIMEOUT_SECONDS: float = 30.0
+    # How providers are tried: "sequential", "hedged" or "race". Hedged and race
+    # may pay for more than one call per request, so they are opt-in.
+    AI_PROVIDER_STRATEGY: Literal["sequential", "hedged", "race"] = "sequential"
+    # Try the provider with the best latency/error EWMAs first.
+    AI_PROVIDER_ADAPTIVE_ORDER: bool = True
+    AI_PROVIDER_EWMA_ALPHA: float = 0.2
+    # "hedged" starts the next provider once the running one has taken longer
+    # than this percentile of its recent latencies (the default delay until
+    # there are enough samples).
+    AI_HEDGE_PERCENTILE: float = 95.0
+    AI_HEDGE_DEFAULT_DELAY_SECONDS: float = 2.0
+    # Pooled keep-alive connections per LLM provider; more requests wait for one.
+    AI_HTTP_MAX_CONNECTIONS_PER_PROVIDER: int = 20
     AI_ASSISTANT_NAME: str = "Finson"
     AI_MAX_TOKENS_PER_DAY_PER_USER: int = 20000
     AI_MAX_INPUT_CHARS: int = 6000
 
+    TRANSACTION_IMPORT_BATCH_SIZE: int = 1000
+    TRANSACTION_IMPORT_MAX_BATCH_SIZE: int = 10000
+    CURRENCY_CHANGE_CHUNK_SIZE: int = 2000
+    # Accounts with more transactions than this change currency in the background.
+    CURRENCY_CHANGE_BACKGROUND_THRESHOLD: int = 20000
+
+    # How often a worker checks exchange_rates for newly loaded rates.
+    EXCHANGE_RATES_REFRESH_SECONDS: int = 300
+
     MARKET_HTTP_TIMEOUT_SECONDS: float = 8.0
     MARKET_CACHE_TTL_SECONDS: int = 60
 
@@ -1,5 +1,9 @@
+import copy
+from collections.abc import Iterator
+from contextlib import contextmanager
+
 from sqlalchemy import create_engine, event
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 from app.core.config import settings
 
@@ -22,9 +26,35 @@ if _is_sqlite:
         cursor = dbapi_conn.cursor()
         cursor.execute("PRAGMA journal_mode=WAL")
         cursor.close()
+        # pysqlite only opens a transaction before DML, so a SAVEPOINT issued
+        # first would start (and its RELEASE commit) the whole transaction.
+        # Let SQLAlchemy emit BEGIN itself instead.
+        dbapi_conn.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _sqlite_begin(conn):
+        conn.exec_driver_sql("BEGIN")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
 class Base(DeclarativeBase):
     pass
+
+
+@contextmanager
+def savepoint(db: Session) -> Iterator[None]:
+    """``db.begin_nested()`` that also restores ``db.info`` if it rolls back.
+
+    Services stage work for after the commit in ``Session.info`` (cache
+    entries to publish or evict); what a rolled-back savepoint staged is
+    dropped along with its rows.
+    """
+    staged = copy.deepcopy(db.info)
+    try:
+        with db.begin_nested():
+            yield
+    except BaseException:
+        db.info.clear()
+        db.info.update(staged)
+        raise
@@ -0,0 +1,273 @@
+"""Sliding-window rate limits backed by fixed-size rings of counters.
+
+A limiter splits its window into ``buckets`` slots of equal width and counts
+hits per slot; the hits in the window are the sum of the slots that are not
+older than the window. Memory per key is fixed (``buckets`` counters), and a
+hit expires between one slot width short of the window and the window itself.
+
+Counters live in a backend chosen by ``RATE_LIMIT_BACKEND``:
+
+- ``memory``: per process, at most ``RATE_LIMIT_MAX_KEYS`` keys, least
+  recently used dropped first.
+- ``sqlite``: a file (``RATE_LIMIT_SQLITE_PATH``) shared by every worker on
+  the host, so limits hold across uvicorn workers.
+"""
+from __future__ import annotations
+
+import math
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
+
+from app.core.config import settings
+
+# (bucket number, hits) of the live slots of a key, oldest first.
+Buckets = list[tuple[int, int]]
+
+
+class RateLimitBackend(ABC):
+    """Per-key rings of hit counters; ``bucket`` numbers are absolute."""
+
+    @abstractmethod
+    def hit(self, key: str, bucket: int, buckets: int, expires_at: float, cost: int = 1) -> int:
+        """Add ``cost`` hits to ``bucket``; returns the hits in the live slots.
+
+        ``expires_at`` is the wall time at which the slot leaves the window.
+        """
+
+    def count(self, key: str, bucket: int, buckets: int) -> int:
+        return sum(hits for _, hits in self.live(key, bucket, buckets))
+
+    @abstractmethod
+    def live(self, key: str, bucket: int, buckets: int) -> Buckets:
+        """Slots of ``key`` newer than ``bucket - buckets``."""
+
+    @abstractmethod
+    def clear(self, key: str) -> None:
+        ...
+
+
+class _Ring:
+    __slots__ = ("stamps", "counts")
+
+    def __init__(self, size: int) -> None:
+        self.stamps = array("q", [-1]) * size
+        self.counts = array("q", [0]) * size
+
+    def live(self, bucket: int) -> Buckets:
+        # Reading from the slot after ``bucket`` around to it yields the live
+        # slots oldest first.
+        oldest = bucket - len(self.stamps)
+        start = (bucket + 1) % len(self.stamps)
+        stamps = self.stamps[start:] + self.stamps[:start]
+        counts = self.counts[start:] + self.counts[:start]
+        return [(stamp, count) for stamp, count in zip(stamps, counts)
+                if stamp > oldest and count]
+
+    def total(self, bucket: int) -> int:
+        oldest = bucket - len(self.stamps)
+        return sum(count for stamp, count in zip(self.stamps, self.counts) if stamp > oldest)
+
+
+class MemoryBackend(RateLimitBackend):
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        self._rings: OrderedDict[str, _Ring] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, bucket: int, buckets: int, expires_at: float, cost: int = 1) -> int:
+        with self._lock:
+            ring = self._rings.get(key)
+            if ring is None or len(ring.stamps) != buckets:
+                ring = self._rings[key] = _Ring(buckets)
+                while len(self._rings) > self.max_keys:
+                    self._rings.popitem(last=False)
+            else:
+                self._rings.move_to_end(key)
+            slot = bucket % buckets
+            if ring.stamps[slot] != bucket:
+                ring.stamps[slot] = bucket
+                ring.counts[slot] = 0
+            ring.counts[slot] += cost
+            return ring.total(bucket)
+
+    def count(self, key: str, bucket: int, buckets: int) -> int:
+        with self._lock:
+            ring = self._rings.get(key)
+            return ring.total(bucket) if ring is not None else 0
+
+    def live(self, key: str, bucket: int, buckets: int) -> Buckets:
+        with self._lock:
+            ring = self._rings.get(key)
+            return ring.live(bucket) if ring is not None else []
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._rings.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._rings)
+
+
+class SQLiteBackend(RateLimitBackend):
+    """Counters in a SQLite file; each bucket is a row that expires with it."""
+
+    PRUNE_INTERVAL_SECONDS = 60.0
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+        self._pruned_at = float("-inf")
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+                " key TEXT NOT NULL, bucket INTEGER NOT NULL,"
+                " hits INTEGER NOT NULL, expires_at REAL NOT NULL,"
+                " PRIMARY KEY (key, bucket)) WITHOUT ROWID"
+            )
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _select(connection: sqlite3.Connection, key: str, bucket: int, buckets: int) -> Buckets:
+        return connection.execute(
+            "SELECT bucket, hits FROM rate_limit_buckets"
+            " WHERE key = ? AND bucket > ? ORDER BY bucket",
+            (key, bucket - buckets),
+        ).fetchall()
+
+    def _prune(self, connection: sqlite3.Connection) -> None:
+        now = time.time()
+        if now - self._pruned_at < self.PRUNE_INTERVAL_SECONDS:
+            return
+        self._pruned_at = now
+        connection.execute("DELETE FROM rate_limit_buckets WHERE expires_at <= ?", (now,))
+
+    def hit(self, key: str, bucket: int, buckets: int, expires_at: float, cost: int = 1) -> int:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "INSERT INTO rate_limit_buckets (key, bucket, hits, expires_at)"
+                " VALUES (?, ?, ?, ?) ON CONFLICT (key, bucket)"
+                " DO UPDATE SET hits = hits + excluded.hits, expires_at = excluded.expires_at",
+                (key, bucket, cost, expires_at),
+            )
+            (total,) = connection.execute(
+                "SELECT COALESCE(SUM(hits), 0) FROM rate_limit_buckets"
+                " WHERE key = ? AND bucket > ?",
+                (key, bucket - buckets),
+            ).fetchone()
+            self._prune(connection)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return total
+
+    def live(self, key: str, bucket: int, buckets: int) -> Buckets:
+        return self._select(self._connection(), key, bucket, buckets)
+
+    def clear(self, key: str) -> None:
+        self._connection().execute("DELETE FROM rate_limit_buckets WHERE key = ?", (key,))
+
+
+_backend: RateLimitBackend | None = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> RateLimitBackend:
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if settings.RATE_LIMIT_BACKEND == "sqlite":
+                    _backend = SQLiteBackend(settings.RATE_LIMIT_SQLITE_PATH)
+                elif settings.RATE_LIMIT_BACKEND == "memory":
+                    _backend = MemoryBackend(settings.RATE_LIMIT_MAX_KEYS)
+                else:
+                    raise ValueError(
+                        f"Unknown RATE_LIMIT_BACKEND: {settings.RATE_LIMIT_BACKEND}")
+    return _backend
+
+
+class RateLimiter:
+    """At most ``limit`` hits per key in any ``window_seconds``."""
+
+    def __init__(
+        self,
+        name: str,
+        limit: int,
+        window_seconds: float,
+        *,
+        buckets: int = 30,
+        backend: RateLimitBackend | None = None,
+    ) -> None:
+        self.name = name
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.buckets = buckets
+        self.width = window_seconds / buckets
+        self._backend = backend
+
+    @property
+    def backend(self) -> RateLimitBackend:
+        return self._backend if self._backend is not None else get_backend()
+
+    def _key(self, key: str) -> str:
+        return f"{self.name}:{key}"
+
+    def _bucket(self, now: float | None) -> int:
+        return int((time.time() if now is None else now) // self.width)
+
+    def hit(self, key: str, cost: int = 1, now: float | None = None) -> int:
+        """Record ``cost`` hits for ``key``; returns the hits now in the window."""
+        bucket = self._bucket(now)
+        expires_at = (bucket + self.buckets) * self.width
+        return self.backend.hit(self._key(key), bucket, self.buckets, expires_at, cost)
+
+    def acquire(self, key: str, cost: int = 1, now: float | None = None) -> bool:
+        """Record ``cost`` hits unless that takes ``key`` over the limit.
+
+        Hits first and checks the returned total, so concurrent callers cannot
+        both take the last unit; a refused hit is taken back.
+        """
+        now = time.time() if now is None else now
+        if self.hit(key, cost, now) <= self.limit:
+            return True
+        self.hit(key, -cost, now)
+        return False
+
+    def count(self, key: str, now: float | None = None) -> int:
+        return self.backend.count(self._key(key), self._bucket(now), self.buckets)
+
+    def is_limited(self, key: str, now: float | None = None) -> bool:
+        """Whether ``key`` has used up its limit for the current window."""
+        return self.count(key, now) >= self.limit
+
+    def retry_after(self, key: str, now: float | None = None) -> int:
+        """Whole seconds until ``key`` is below its limit again (0 if it is)."""
+        now = time.time() if now is None else now
+        live = self.backend.live(self._key(key), self._bucket(now), self.buckets)
+        remaining = sum(hits for _, hits in live)
+        for stamp, hits in live:
+            if remaining < self.limit:
+                return 0
+            remaining -= hits
+            if remaining < self.limit:
+                # The slot leaves the window when slot ``stamp + buckets`` starts.
+                freed_at = (stamp + self.buckets) * self.width
+                return max(math.ceil(freed_at - now), 1)
+        return 0 if remaining < self.limit else math.ceil(self.window_seconds)
+
+    def reset(self, key: str) -> None:
+        self.backend.clear(self._key(key))
@@ -1,5 +1,8 @@
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Callable, TypeVar
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -8,17 +11,86 @@ from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+_T = TypeVar("_T")
+
 SCOPE_FULL_ACCESS = "full_access"
 SCOPE_VERIFICATION_PENDING = "verification_pending"
 SCOPE_READ_ONLY = "read_only"
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+class PasswordHasherBusyError(Exception):
+    """More bcrypt calls are queued than ``PASSWORD_HASH_MAX_PENDING`` allows."""
+
+
+# bcrypt runs in worker processes so a login burst burns their CPU instead
+# of holding request threads (and the GIL) for ~250 ms per call. Callers
+# still wait for the result, but at most PASSWORD_HASH_MAX_PENDING of them;
+# the rest are refused at once and answered with a 503.
+_hash_pool: Executor | None = None
+_hash_pool_lock = threading.Lock()
+_hash_slots = threading.BoundedSemaphore(settings.PASSWORD_HASH_MAX_PENDING)
+
+
+def _get_hash_pool() -> Executor:
+    global _hash_pool
+    if _hash_pool is None:
+        with _hash_pool_lock:
+            if _hash_pool is None:
+                # spawn: forking a process that already runs threads can copy
+                # held locks. Spawned workers re-import the main module, so
+                # scripts that hash passwords need a __main__ guard.
+                _hash_pool = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _hash_pool
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def _load_backend() -> None:
+    pwd_context.handler("bcrypt").get_backend()
+
+
+def start_hash_pool() -> None:
+    """Start the worker processes now rather than on the first login."""
+    if settings.PASSWORD_HASH_WORKERS > 0:
+        pool = _get_hash_pool()
+        for future in [pool.submit(_load_backend) for _ in range(settings.PASSWORD_HASH_WORKERS)]:
+            future.result()
+
+
+def shutdown_hash_pool() -> None:
+    global _hash_pool
+    with _hash_pool_lock:
+        pool, _hash_pool = _hash_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _run_hash(function: Callable[..., _T], *args: Any) -> _T:
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return function(*args)
+    if not _hash_slots.acquire(blocking=False):
+        raise PasswordHasherBusyError
+    try:
+        return _get_hash_pool().submit(function, *args).result()
+    finally:
+        _hash_slots.release()
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return _run_hash(_verify, plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return _run_hash(_hash, password)
 
 
 def create_access_token(
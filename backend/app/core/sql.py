@@ -0,0 +1,78 @@
+"""Dialect-portable SQL helpers for the databases we run (SQLite and MySQL)."""
+from sqlalchemy import String
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class _DateBucket(FunctionElement):
+    """Text label of the calendar bucket a date/datetime falls in, usable in GROUP BY.
+
+    Each granularity is its own class so it gets its own statement cache key.
+    """
+
+    type = String()
+    inherit_cache = True
+
+
+class day_bucket(_DateBucket):
+    """``YYYY-MM-DD``."""
+
+    name = "day_bucket"
+    inherit_cache = True
+
+
+class week_bucket(_DateBucket):
+    """``YYYY-MM-DD`` of the Monday starting the (ISO) week."""
+
+    name = "week_bucket"
+    inherit_cache = True
+
+
+class month_bucket(_DateBucket):
+    """``YYYY-MM``."""
+
+    name = "month_bucket"
+    inherit_cache = True
+
+
+class year_bucket(_DateBucket):
+    """``YYYY``."""
+
+    name = "year_bucket"
+    inherit_cache = True
+
+
+_FORMATS = {
+    day_bucket: ("YYYY-MM-DD", "%Y-%m-%d"),
+    month_bucket: ("YYYY-MM", "%Y-%m"),
+    year_bucket: ("YYYY", "%Y"),
+}
+
+
+@compiles(_DateBucket)
+def _date_bucket_default(element, compiler, **kw):
+    column = compiler.process(element.clauses, **kw)
+    if isinstance(element, week_bucket):
+        return f"to_char(date_trunc('week', {column}), 'YYYY-MM-DD')"
+    return f"to_char({column}, '{_FORMATS[type(element)][0]}')"
+
+
+@compiles(_DateBucket, "sqlite")
+def _date_bucket_sqlite(element, compiler, **kw):
+    column = compiler.process(element.clauses, **kw)
+    if isinstance(element, week_bucket):
+        # Forward to Sunday (or stay on it), then back to that week's Monday.
+        return f"date({column}, 'weekday 0', '-6 days')"
+    return f"strftime('{_FORMATS[type(element)][1]}', {column})"
+
+
+@compiles(_DateBucket, "mysql")
+def _date_bucket_mysql(element, compiler, **kw):
+    column = compiler.process(element.clauses, **kw)
+    if isinstance(element, week_bucket):
+        column = f"DATE_SUB({column}, INTERVAL WEEKDAY({column}) DAY)"
+        date_format = "%Y-%m-%d"
+    else:
+        date_format = _FORMATS[type(element)][1]
+    # pymysql uses the "format" paramstyle, so literal percent signs are doubled.
+    return f"DATE_FORMAT({column}, '{date_format.replace('%', '%%')}')"
@@ -1,23 +1,49 @@
 import os
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from app import models  # keep this import for Alembic metadata discovery
 from app.api.v1.router import api_router
 from app.core.config import settings
+from app.core.security import PasswordHasherBusyError, shutdown_hash_pool, start_hash_pool
+from app.services import advice_service, last_login_service
 
 # Ensure uploads directory exists
 UPLOAD_DIR = os.path.join(os.path.dirname(__file__), "uploads")
 os.makedirs(os.path.join(UPLOAD_DIR, "avatars"), exist_ok=True)
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    await run_in_threadpool(start_hash_pool)
+    last_login_service.start_writer()
+    advice_service.open_http_clients()
+    yield
+    await advice_service.close_http_clients()
+    await run_in_threadpool(last_login_service.stop_writer)
+    await run_in_threadpool(shutdown_hash_pool)
+
+
+async def password_hasher_busy(_: Request, __: PasswordHasherBusyError) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+    )
+
+
 def get_application() -> FastAPI:
     app = FastAPI(
         title=settings.PROJECT_NAME,
         version=settings.API_VERSION,
+        lifespan=lifespan,
     )
+    app.add_exception_handler(PasswordHasherBusyError, password_hasher_busy)
 
     app.add_middleware(
         CORSMiddleware,
@@ -25,6 +51,7 @@ def get_application() -> FastAPI:
         allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "ETag"],
     )
 
     @app.get("/health")
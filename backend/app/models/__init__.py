@@ -2,9 +2,21 @@ from app.models.account import Account
 from app.models.advice import AdviceEntry
 from app.models.asset import Asset, AssetTransaction
 from app.models.budget import BudgetGoal
-from app.models.enums import AccountType, AssetTransactionType, AssetType, BudgetPeriod, TransactionType
+from app.models.category import Category
+from app.models.currency_change_job import CurrencyChangeJob
+from app.models.enums import (
+    AccountType,
+    AssetTransactionType,
+    AssetType,
+    BudgetPeriod,
+    CurrencyChangeStatus,
+    TransactionType,
+)
+from app.models.exchange_rate import ExchangeRate
 from app.models.savings_goal import SavingsGoal
 from app.models.transaction import Transaction
+from app.models.transaction_rollup import TransactionRollup
+from app.models import transaction_search  # noqa: F401  (registers the FTS5 DDL)
 from app.models.user import User
 
 __all__ = [
@@ -17,8 +29,13 @@ __all__ = [
     "AssetType",
     "BudgetGoal",
     "BudgetPeriod",
+    "Category",
+    "CurrencyChangeJob",
+    "CurrencyChangeStatus",
+    "ExchangeRate",
     "SavingsGoal",
     "Transaction",
+    "TransactionRollup",
     "TransactionType",
     "User",
 ]
@@ -2,10 +2,11 @@ from datetime import date, datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Date, DateTime, Enum, ForeignKey, Integer, Numeric, String, func
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Date, DateTime, Enum, ForeignKey, Integer, Numeric, func, select
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
 
 from app.core.database import Base
+from app.models.category import Category
 from app.models.enums import BudgetPeriod
 
 
@@ -15,7 +16,8 @@ class BudgetGoal(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey(
         "users.id", ondelete="CASCADE"), index=True)
-    category: Mapped[str] = mapped_column(String(64), nullable=False)
+    category_id: Mapped[int] = mapped_column(
+        ForeignKey("categories.id"), nullable=False)
     limit_amount: Mapped[Decimal] = mapped_column(
         Numeric(14, 2), nullable=False)
     period: Mapped[BudgetPeriod] = mapped_column(
@@ -29,6 +31,15 @@ class BudgetGoal(Base):
     )
 
     user: Mapped["User"] = relationship(back_populates="budgets")
+    category_ref: Mapped["Category"] = relationship(lazy="raise")
+
+    # Category name for the API, read with the row by primary-key lookup.
+    category: Mapped[str] = column_property(
+        select(Category.name)
+        .where(Category.id == category_id)
+        .correlate_except(Category)
+        .scalar_subquery()
+    )
 
 
 if TYPE_CHECKING:  # pragma: no cover
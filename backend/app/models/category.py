@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.core.database import Base
+
+
+class Category(Base):
+    """A user's category name, stored once and referenced by integer id."""
+
+    __tablename__ = "categories"
+    __table_args__ = (
+        UniqueConstraint("user_id", "name", name="uq_categories_user_name"),
+        # Category half of transaction search on MySQL (see transaction_search)
+        Index("ix_categories_search", "name",
+              mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey(
+        "users.id", ondelete="CASCADE"), nullable=False)
+    name: Mapped[str] = mapped_column(String(64), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now())
+
+    user: Mapped["User"] = relationship(back_populates="categories")
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from app.models.user import User
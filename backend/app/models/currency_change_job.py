@@ -0,0 +1,50 @@
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.core.database import Base
+from app.models.enums import CurrencyChangeStatus
+
+
+class CurrencyChangeJob(Base):
+    """A user's currency change, converted in committed id-range chunks.
+
+    ``last_transaction_id`` is the resume point: every transaction up to it
+    has been converted and committed.
+    """
+
+    __tablename__ = "currency_change_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey(
+        "users.id", ondelete="CASCADE"), index=True)
+    old_currency: Mapped[str] = mapped_column(String(3), nullable=False)
+    new_currency: Mapped[str] = mapped_column(String(3), nullable=False)
+    convert_values: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    status: Mapped[CurrencyChangeStatus] = mapped_column(
+        Enum(CurrencyChangeStatus, native_enum=False, length=16),
+        default=CurrencyChangeStatus.PENDING, nullable=False)
+    total_transactions: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False)
+    processed_transactions: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False)
+    last_transaction_id: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False)
+    budgets_converted: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True)
+
+    user: Mapped["User"] = relationship(back_populates="currency_change_jobs")
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from app.models.user import User
@@ -29,3 +29,10 @@ class BudgetPeriod(StrEnum):
     MONTHLY = "monthly"
     WEEKLY = "weekly"
     YEARLY = "yearly"
+
+
+class CurrencyChangeStatus(StrEnum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
@@ -0,0 +1,17 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import Date, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class ExchangeRate(Base):
+    """Units of ``currency`` per 1 EUR on ``rate_date`` (ECB reference-rate convention)."""
+
+    __tablename__ = "exchange_rates"
+
+    rate_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    currency: Mapped[str] = mapped_column(String(3), primary_key=True)
+    rate: Mapped[Decimal] = mapped_column(Numeric(18, 8), nullable=False)
@@ -2,23 +2,41 @@ from typing import TYPE_CHECKING
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Integer, Numeric, String, Text, func
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Index, Integer, Numeric, String, Text, func, select
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
 
 from app.core.database import Base
+from app.models.category import Category
 from app.models.enums import TransactionType
 
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Keyset pagination: WHERE user_id = ? ORDER BY occurred_at DESC, id DESC
+        Index("ix_transactions_user_occurred_id",
+              "user_id", "occurred_at", "id"),
+        # Covering indexes for the aggregates in transaction_service
+        Index("ix_transactions_user_occurred_type_amount",
+              "user_id", "occurred_at", "transaction_type", "amount_base"),
+        Index("ix_transactions_user_type_occurred_category_amount",
+              "user_id", "transaction_type", "occurred_at", "category_id", "amount_base"),
+        # Full-text search on MySQL; SQLite uses the FTS5 table in transaction_search
+        Index("ix_transactions_search", "note",
+              mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey(
         "users.id", ondelete="CASCADE"), index=True)
     account_id: Mapped[int | None] = mapped_column(ForeignKey(
         "accounts.id", ondelete="SET NULL"), index=True, nullable=True)
-    category: Mapped[str] = mapped_column(String(64), nullable=False)
+    category_id: Mapped[int] = mapped_column(
+        ForeignKey("categories.id"), nullable=False)
     amount: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
+    # ``amount`` in the owner's currency at the rate in effect when written;
+    # every aggregate sums this column so mixed-currency rows add up.
+    amount_base: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False)
     currency: Mapped[str] = mapped_column(
         String(3), nullable=False, default="EUR")
     transaction_type: Mapped[TransactionType] = mapped_column(
@@ -34,6 +52,16 @@ class Transaction(Base):
 
     user: Mapped["User"] = relationship(back_populates="transactions")
     account: Mapped["Account"] = relationship(back_populates="transactions")
+    # The name is the ``category`` column below; never lazy-load the row.
+    category_ref: Mapped["Category"] = relationship(lazy="raise")
+
+    # Category name for the API, read with the row by primary-key lookup.
+    category: Mapped[str] = column_property(
+        select(Category.name)
+        .where(Category.id == category_id)
+        .correlate_except(Category)
+        .scalar_subquery()
+    )
 
 
 if TYPE_CHECKING:  # pragma: no cover
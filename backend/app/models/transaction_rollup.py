@@ -0,0 +1,33 @@
+from datetime import date
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+from sqlalchemy import Date, Enum, ForeignKey, Integer, Numeric
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.core.database import Base
+from app.models.enums import TransactionType
+
+
+class TransactionRollup(Base):
+    """Per-user monthly totals, kept in step with every transaction write."""
+
+    __tablename__ = "transaction_rollups"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey(
+        "users.id", ondelete="CASCADE"), primary_key=True)
+    month: Mapped[date] = mapped_column(Date, primary_key=True)
+    transaction_type: Mapped[TransactionType] = mapped_column(
+        Enum(TransactionType, native_enum=False, length=16), primary_key=True
+    )
+    category_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    total_amount: Mapped[Decimal] = mapped_column(
+        Numeric(16, 2), nullable=False, default=Decimal("0.00"))
+    transaction_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0)
+
+    user: Mapped["User"] = relationship(back_populates="transaction_rollups")
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from app.models.user import User
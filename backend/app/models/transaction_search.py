@@ -0,0 +1,51 @@
+"""SQLite FTS5 index over transaction notes and category names.
+
+A contentless FTS5 table keyed by transaction id is kept in sync by
+triggers, so every write path (ORM, bulk Core inserts, currency conversion)
+updates it in the same transaction. Category names are looked up from
+``categories`` inside the triggers; names never change once created, so the
+values removed on update/delete are the ones that were indexed. MySQL uses
+FULLTEXT indexes on ``transactions.note`` and ``categories.name`` instead.
+"""
+from sqlalchemy import DDL, event
+
+from app.models.transaction import Transaction
+
+FTS_TABLE = "transactions_fts"
+
+_CATEGORY_NAME = "(SELECT name FROM categories WHERE id = {row}.category_id)"
+
+SQLITE_SEARCH_DDL = (
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        category, note,
+        content='',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON transactions BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, category, note)
+        VALUES (new.id, {_CATEGORY_NAME.format(row="new")}, new.note);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, category, note)
+        VALUES ('delete', old.id, {_CATEGORY_NAME.format(row="old")}, old.note);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF category_id, note ON transactions BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, category, note)
+        VALUES ('delete', old.id, {_CATEGORY_NAME.format(row="old")}, old.note);
+        INSERT INTO {FTS_TABLE}(rowid, category, note)
+        VALUES (new.id, {_CATEGORY_NAME.format(row="new")}, new.note);
+    END""",
+)
+
+SQLITE_REBUILD = (
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('delete-all')",
+    f"""INSERT INTO {FTS_TABLE}(rowid, category, note)
+        SELECT transactions.id, categories.name, transactions.note
+        FROM transactions JOIN categories ON categories.id = transactions.category_id""",
+)
+
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(Transaction.__table__, "after_create",
+                 DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(Transaction.__table__, "after_drop",
+             DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect="sqlite"))
@@ -10,8 +10,11 @@ from app.core.database import Base
 if TYPE_CHECKING:  # pragma: no cover - typing helpers
     from app.models.advice import AdviceEntry
     from app.models.budget import BudgetGoal
+    from app.models.category import Category
+    from app.models.currency_change_job import CurrencyChangeJob
     from app.models.savings_goal import SavingsGoal
     from app.models.transaction import Transaction
+    from app.models.transaction_rollup import TransactionRollup
     from app.models.account import Account
     from app.models.asset import Asset
 
@@ -47,6 +50,15 @@ class User(Base):
         String(3), default="EUR", nullable=False)
     monthly_income: Mapped[Decimal] = mapped_column(
         Numeric(12, 2), default=0, nullable=False)
+    # Bumped by every write to the matching data; see data_version_service.
+    transactions_version: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False)
+    budgets_version: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False)
+    savings_goals_version: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False)
+    advice_version: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
@@ -56,6 +68,12 @@ class User(Base):
     transactions: Mapped[list["Transaction"]] = relationship(
         back_populates="user", cascade="all, delete-orphan"
     )
+    transaction_rollups: Mapped[list["TransactionRollup"]] = relationship(
+        back_populates="user", cascade="all, delete-orphan"
+    )
+    categories: Mapped[list["Category"]] = relationship(
+        back_populates="user", cascade="all, delete-orphan"
+    )
     budgets: Mapped[list["BudgetGoal"]] = relationship(
         back_populates="user", cascade="all, delete-orphan"
     )
@@ -71,3 +89,6 @@ class User(Base):
     assets: Mapped[list["Asset"]] = relationship(
         back_populates="user", cascade="all, delete-orphan"
     )
+    currency_change_jobs: Mapped[list["CurrencyChangeJob"]] = relationship(
+        back_populates="user", cascade="all, delete-orphan"
+    )
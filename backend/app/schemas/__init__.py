@@ -1,11 +1,26 @@
 from app.schemas.advice import AdviceRead, AdviceRequest, ConversationSummary
-from app.schemas.admin import AdminStatsResponse, AdminStepUpRequest, AdminStepUpResponse, AdminTierBreakdown
+from app.schemas.admin import (
+    AdminStatsResponse,
+    AdminStepUpRequest,
+    AdminStepUpResponse,
+    AdminTierBreakdown,
+    ExchangeRateLoadResult,
+)
 from app.schemas.auth import LoginRequest, Token, TokenPayload
 from app.schemas.budget import BudgetCreate, BudgetRead, BudgetUpdate
-from app.schemas.insight import CategoryBreakdown, MonthlyInsight
+from app.schemas.insight import CategoryBreakdown, MonthlyInsight, Series, SeriesPoint, TimeSeriesResponse
 from app.schemas.market import MarketChartPoint, MarketListResponse, MarketQuote, MarketSearchItem
 from app.schemas.savings_goal import SavingsGoalCreate, SavingsGoalRead, SavingsGoalUpdate
-from app.schemas.transaction import TransactionCreate, TransactionRead, TransactionUpdate
+from app.schemas.transaction import (
+    TransactionBatchRequest,
+    TransactionBatchResponse,
+    TransactionBatchResult,
+    TransactionCreate,
+    TransactionImportError,
+    TransactionImportResult,
+    TransactionRead,
+    TransactionUpdate,
+)
 from app.schemas.user import AdminUserUpdate, PasswordChange, SubscriptionTier, UserCreate, UserRead, UserRole, UserUpdate
 
 __all__ = [
@@ -21,6 +36,7 @@ __all__ = [
     "BudgetRead",
     "BudgetUpdate",
     "CategoryBreakdown",
+    "ExchangeRateLoadResult",
     "LoginRequest",
     "MarketChartPoint",
     "MarketListResponse",
@@ -31,9 +47,17 @@ __all__ = [
     "SavingsGoalCreate",
     "SavingsGoalRead",
     "SavingsGoalUpdate",
+    "Series",
+    "SeriesPoint",
+    "TimeSeriesResponse",
     "Token",
     "TokenPayload",
+    "TransactionBatchRequest",
+    "TransactionBatchResponse",
+    "TransactionBatchResult",
     "TransactionCreate",
+    "TransactionImportError",
+    "TransactionImportResult",
     "TransactionRead",
     "TransactionUpdate",
     "UserCreate",
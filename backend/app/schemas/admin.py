@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 
 from pydantic import BaseModel, Field
 
@@ -24,3 +24,9 @@ class AdminStatsResponse(BaseModel):
     tiers: AdminTierBreakdown
     system_health: str
     api_latency_ms: float
+
+
+class ExchangeRateLoadResult(BaseModel):
+    stored: int
+    currencies: int
+    latest_rate_date: date | None
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 
 class LoginRequest(BaseModel):
@@ -19,3 +19,6 @@ class TokenPayload(BaseModel):
     scopes: list[str] = Field(default_factory=list)
     email_verified: bool = False
     token_kind: str = "access"
+
+    # Verified payloads are cached and shared between requests.
+    model_config = ConfigDict(frozen=True)
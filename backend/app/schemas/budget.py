@@ -29,5 +29,8 @@ class BudgetRead(BudgetBase):
     user_id: int
     created_at: datetime
     updated_at: datetime
+    # Only with ?display_currency=: limit_amount converted at the rate on starts_on.
+    display_limit_amount: Decimal | None = None
+    display_currency: str | None = None
 
     model_config = ConfigDict(from_attributes=True)
@@ -1,4 +1,6 @@
+from datetime import date
 from decimal import Decimal
+from typing import Literal
 
 from pydantic import BaseModel, Field
 
@@ -22,3 +24,26 @@ class MonthlyInsight(BaseModel):
     # Carryover from previous month (leftover balance)
     carryover: Decimal = Field(default=Decimal(
         "0"), description="Balance carried over from previous month")
+    display_currency: str | None = Field(
+        default=None, description="Set when amounts were converted for display")
+
+
+class SeriesPoint(BaseModel):
+    period_start: date = Field(description="First day of the bucket")
+    amount: Decimal
+    count: int
+
+
+class Series(BaseModel):
+    key: str = Field(description="Category or transaction type")
+    points: list[SeriesPoint]
+
+
+class TimeSeriesResponse(BaseModel):
+    granularity: Literal["day", "week", "month", "year"]
+    group_by: Literal["category", "type"]
+    start: date = Field(description="First day read: the first bucket's, or the history window's if later")
+    end: date = Field(description="Last day of the last bucket")
+    series: list[Series]
+    display_currency: str | None = Field(
+        default=None, description="Set when amounts were converted for display")
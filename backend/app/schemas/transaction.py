@@ -1,5 +1,6 @@
 from datetime import datetime
 from decimal import Decimal
+from typing import Annotated, Literal
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -32,5 +33,66 @@ class TransactionRead(TransactionBase):
     id: int
     user_id: int
     created_at: datetime
+    # Only with ?display_currency=: amount converted at the rate on occurred_at.
+    display_amount: Decimal | None = None
+    display_currency: str | None = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class TransactionImportError(BaseModel):
+    row: int = Field(description="1-based record number in the uploaded file")
+    error: str
+
+
+class TransactionImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: list[TransactionImportError]
+    errors_truncated: bool = False
+
+
+MAX_BATCH_OPERATIONS = 500
+
+
+class TransactionBatchCreate(BaseModel):
+    op: Literal["create"]
+    data: TransactionCreate
+
+
+class TransactionBatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: int
+    data: TransactionUpdate
+
+
+class TransactionBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: int
+
+
+TransactionBatchOperation = Annotated[
+    TransactionBatchCreate | TransactionBatchUpdate | TransactionBatchDelete,
+    Field(discriminator="op"),
+]
+
+
+class TransactionBatchRequest(BaseModel):
+    operations: list[TransactionBatchOperation] = Field(
+        min_length=1, max_length=MAX_BATCH_OPERATIONS)
+    mode: Literal["atomic", "best_effort"] = "atomic"
+
+
+class TransactionBatchResult(BaseModel):
+    index: int
+    op: Literal["create", "update", "delete"]
+    id: int | None = None
+    ok: bool
+    status_code: int
+    transaction: TransactionRead | None = None
+    error: str | None = None
+
+
+class TransactionBatchResponse(BaseModel):
+    committed: bool
+    results: list[TransactionBatchResult]
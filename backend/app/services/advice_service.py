@@ -1,18 +1,24 @@
+import asyncio
+from collections import deque
 from datetime import datetime
-from decimal import Decimal
 import logging
 import re
+import time
 from typing import Any
 
 import httpx
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.rate_limit import RateLimiter
 from app.models import AdviceEntry, User
 from app.schemas.advice import AdviceRequest
-from app.schemas.insight import CategoryBreakdown, MonthlyInsight
-from app.services import transaction_service
+from app.schemas.insight import MonthlyInsight
+from app.services import data_version_service, transaction_service
+from app.services.user_service import TIER_LIMITS, normalize_subscription_tier
 
 logger = logging.getLogger(__name__)
 
@@ -21,28 +27,63 @@ _UUID_RE = re.compile(
     r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[1-5][0-9a-fA-F]{3}-[89abAB][0-9a-fA-F]{3}-[0-9a-fA-F]{12}\b")
 _LONG_ID_RE = re.compile(r"\b\d{6,}\b")
 
-# In-memory budget control, keyed by user/day. Swap with Redis for multi-instance deployments.
-_token_usage_by_user_day: dict[str, int] = {}
-
-
-def compose_summary(
-    total_income: Decimal,
-    total_expense: Decimal,
-    balance: Decimal,
-    categories: list[tuple[str, Decimal]],
-    month_label: str,
-) -> MonthlyInsight:
-    return MonthlyInsight(
-        month=month_label,
-        total_income=total_income,
-        total_expense=total_expense,
-        balance=balance,
-        top_expense_categories=[
-            CategoryBreakdown(category=category, amount=amount) for category, amount in categories
-        ],
+_DAY_SECONDS = 24 * 60 * 60
+
+# Estimated LLM tokens per user over the last 24 hours (hourly slots).
+_token_budget = RateLimiter(
+    "advice_tokens", settings.AI_MAX_TOKENS_PER_DAY_PER_USER, _DAY_SECONDS, buckets=24)
+# Advice requests per user over the last 24 hours. The limiters share a name,
+# so a tier change keeps the requests already made.
+_request_quotas = {
+    tier: RateLimiter(
+        "advice_requests", limits["max_advice_requests_per_day"], _DAY_SECONDS, buckets=24)
+    for tier, limits in TIER_LIMITS.items()
+}
+
+
+PROVIDERS = ("groq", "gemini", "openai")
+
+# One keep-alive connection pool per provider, opened by the app lifespan.
+_http_clients: dict[str, httpx.AsyncClient] = {}
+
+
+def _new_http_client() -> httpx.AsyncClient:
+    connections = settings.AI_HTTP_MAX_CONNECTIONS_PER_PROVIDER
+    return httpx.AsyncClient(
+        timeout=settings.AI_HTTP_TIMEOUT_SECONDS,
+        limits=httpx.Limits(
+            max_connections=connections, max_keepalive_connections=connections),
     )
 
 
+def open_http_clients() -> None:
+    for provider in PROVIDERS:
+        if provider not in _http_clients:
+            _http_clients[provider] = _new_http_client()
+
+
+async def close_http_clients() -> None:
+    clients = list(_http_clients.values())
+    _http_clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+async def _post_json(provider: str, url: str, **kwargs: Any) -> Any:
+    client = _http_clients.get(provider)
+    if client is None:
+        # Outside the app lifespan (scripts, bare test clients): one-off client.
+        async with _new_http_client() as client:
+            return await _send_json(client, url, **kwargs)
+    return await _send_json(client, url, **kwargs)
+
+
+async def _send_json(client: httpx.AsyncClient, url: str, **kwargs: Any) -> Any:
+    response = await client.post(url, **kwargs)
+    response.raise_for_status()
+    return response.json()
+
+
 def _summary_text(summary: MonthlyInsight) -> str:
     top_categories = ", ".join(
         f"{item.category}: {item.amount:.2f}" for item in summary.top_expense_categories
@@ -85,21 +126,19 @@ def _estimate_tokens(text: str) -> int:
     return max(1, len(text) // 4)
 
 
-def _daily_usage_key(user_id: int) -> str:
-    return f"{user_id}:{datetime.utcnow().strftime('%Y-%m-%d')}"
-
-
-def _get_used_tokens_today(user_id: int) -> int:
-    return _token_usage_by_user_day.get(_daily_usage_key(user_id), 0)
+def _reserve_tokens(user_id: int, amount: int) -> bool:
+    return _token_budget.acquire(str(user_id), cost=amount)
 
 
-def _reserve_tokens(user_id: int, amount: int) -> bool:
-    key = _daily_usage_key(user_id)
-    used = _token_usage_by_user_day.get(key, 0)
-    if used + amount > settings.AI_MAX_TOKENS_PER_DAY_PER_USER:
-        return False
-    _token_usage_by_user_day[key] = used + amount
-    return True
+def consume_request_quota(user: User) -> None:
+    """Count one advice request against the tier's daily quota; 429 when used up."""
+    limiter = _request_quotas[normalize_subscription_tier(user.subscription_tier)]
+    if not limiter.acquire(str(user.id)):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Daily advice request limit reached for your plan",
+            headers={"Retry-After": str(max(limiter.retry_after(str(user.id)), 1))},
+        )
 
 
 def _fallback_response(summary: MonthlyInsight, question: str, user: User) -> str:
@@ -200,7 +239,7 @@ def _build_ai_prompt(
     return system_prompt, user_prompt
 
 
-def _gemini_response(
+async def _gemini_response(
     summary: MonthlyInsight,
     question: str,
     user: User,
@@ -221,27 +260,26 @@ def _gemini_response(
     }
 
     try:
-        with httpx.Client(timeout=30.0) as client:
-            response = client.post(
-                f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={settings.GOOGLE_GEMINI_API_KEY}",
-                json=payload,
-            )
-            response.raise_for_status()
-            data = response.json()
-            candidates = data.get("candidates", [])
-            if candidates:
-                parts = candidates[0].get("content", {}).get("parts", [])
-                if parts:
-                    text = parts[0].get("text", "")
-                    if text:
-                        return f"[{settings.AI_ASSISTANT_NAME}] {text.strip()}"
+        data = await _post_json(
+            "gemini",
+            f"{settings.GOOGLE_GEMINI_API_BASE_URL}/models/gemini-1.5-flash:generateContent",
+            params={"key": settings.GOOGLE_GEMINI_API_KEY},
+            json=payload,
+        )
+        candidates = data.get("candidates", [])
+        if candidates:
+            parts = candidates[0].get("content", {}).get("parts", [])
+            if parts:
+                text = parts[0].get("text", "")
+                if text:
+                    return f"[{settings.AI_ASSISTANT_NAME}] {text.strip()}"
     except Exception as exc:
         logger.warning("advice_provider_failed", extra={
                        "provider": "gemini", "error": str(exc)})
     return None
 
 
-def _groq_response(
+async def _groq_response(
     summary: MonthlyInsight,
     question: str,
     user: User,
@@ -263,25 +301,23 @@ def _groq_response(
     }
 
     try:
-        with httpx.Client(timeout=30.0) as client:
-            response = client.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                headers={"Authorization": f"Bearer {settings.GROQ_API_KEY}"},
-                json=payload,
-            )
-            response.raise_for_status()
-            data = response.json()
-            content = data.get("choices", [{}])[0].get(
-                "message", {}).get("content")
-            if content:
-                return f"[{settings.AI_ASSISTANT_NAME}] {content.strip()}"
+        data = await _post_json(
+            "groq",
+            f"{settings.GROQ_API_BASE_URL}/chat/completions",
+            headers={"Authorization": f"Bearer {settings.GROQ_API_KEY}"},
+            json=payload,
+        )
+        content = data.get("choices", [{}])[0].get(
+            "message", {}).get("content")
+        if content:
+            return f"[{settings.AI_ASSISTANT_NAME}] {content.strip()}"
     except Exception as exc:
         logger.warning("advice_provider_failed", extra={
                        "provider": "groq", "error": str(exc)})
     return None
 
 
-def _openai_response(
+async def _openai_response(
     summary: MonthlyInsight,
     question: str,
     user: User,
@@ -303,48 +339,144 @@ def _openai_response(
     }
 
     try:
-        with httpx.Client(timeout=30.0) as client:
-            response = client.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={"Authorization": f"Bearer {settings.OPENAI_API_KEY}"},
-                json=payload,
-            )
-            response.raise_for_status()
-            data = response.json()
-            content = data.get("choices", [{}])[0].get(
-                "message", {}).get("content")
-            if content:
-                return f"[{settings.AI_ASSISTANT_NAME}] {content.strip()}"
+        data = await _post_json(
+            "openai",
+            f"{settings.OPENAI_API_BASE_URL}/chat/completions",
+            headers={"Authorization": f"Bearer {settings.OPENAI_API_KEY}"},
+            json=payload,
+        )
+        content = data.get("choices", [{}])[0].get(
+            "message", {}).get("content")
+        if content:
+            return f"[{settings.AI_ASSISTANT_NAME}] {content.strip()}"
     except Exception as exc:
         logger.warning("advice_provider_failed", extra={
                        "provider": "openai", "error": str(exc)})
     return None
 
 
-def generate_advice(db: Session, user: User, request: AdviceRequest) -> AdviceEntry:
-    import uuid
+class ProviderStats:
+    """Latency and error EWMAs of one provider, plus recent successful latencies."""
+
+    __slots__ = ("latency", "errors", "recent")
+
+    def __init__(self) -> None:
+        self.latency: float | None = None
+        self.errors = 0.0
+        self.recent: deque[float] = deque(maxlen=200)
+
+    def record(self, seconds: float, ok: bool) -> None:
+        alpha = settings.AI_PROVIDER_EWMA_ALPHA
+        self.latency = seconds if self.latency is None else \
+            alpha * seconds + (1 - alpha) * self.latency
+        self.errors = alpha * (0.0 if ok else 1.0) + (1 - alpha) * self.errors
+        if ok:
+            self.recent.append(seconds)
+
+    def expected_seconds(self) -> float:
+        """Rough time to an answer; 0 for a provider not measured yet."""
+        if self.latency is None:
+            return 0.0
+        return self.latency / max(1.0 - self.errors, 0.05)
+
+    def hedge_delay(self) -> float:
+        """How long to wait for this provider before starting the next one."""
+        if len(self.recent) < 10:
+            return settings.AI_HEDGE_DEFAULT_DELAY_SECONDS
+        ordered = sorted(self.recent)
+        index = min(int(len(ordered) * settings.AI_HEDGE_PERCENTILE / 100), len(ordered) - 1)
+        return ordered[index]
+
+
+_PROVIDER_CALLS = {
+    "groq": _groq_response,
+    "gemini": _gemini_response,
+    "openai": _openai_response,
+}
+_PROVIDER_KEYS = {
+    "groq": "GROQ_API_KEY",
+    "gemini": "GOOGLE_GEMINI_API_KEY",
+    "openai": "OPENAI_API_KEY",
+}
+provider_stats = {provider: ProviderStats() for provider in PROVIDERS}
+
+
+def ranked_providers() -> list[str]:
+    """Providers with an API key, expected-fastest first if adaptive ordering is on."""
+    providers = [provider for provider in PROVIDERS
+                 if getattr(settings, _PROVIDER_KEYS[provider])]
+    if settings.AI_PROVIDER_ADAPTIVE_ORDER:
+        providers.sort(key=lambda provider: provider_stats[provider].expected_seconds())
+    return providers
+
+
+async def _timed_call(provider: str, *args: Any) -> str | None:
+    start = time.perf_counter()
+    try:
+        answer = await _PROVIDER_CALLS[provider](*args)
+    except asyncio.CancelledError:
+        # Outrun by another provider: the elapsed time is a lower bound on its
+        # latency, so a provider that always loses still drifts down the ranking.
+        provider_stats[provider].record(time.perf_counter() - start, ok=False)
+        raise
+    provider_stats[provider].record(time.perf_counter() - start, answer is not None)
+    return answer
+
+
+async def _provider_answer(*args: Any) -> str | None:
+    """First answer from the providers, per ``AI_PROVIDER_STRATEGY``.
+
+    - ``sequential``: the next provider starts when the previous one fails;
+    - ``hedged``: it also starts once the running provider has taken longer
+      than its ``AI_HEDGE_PERCENTILE`` latency;
+    - ``race``: all providers start at once.
+
+    The first answer wins and the calls still running are cancelled.
+    """
+    strategy = settings.AI_PROVIDER_STRATEGY
+    waiting = deque(ranked_providers())
+    running: set[asyncio.Task] = set()
+
+    def _start_next() -> float | None:
+        provider = waiting.popleft()
+        running.add(asyncio.create_task(_timed_call(provider, *args)))
+        if strategy == "race":
+            return 0.0
+        if strategy == "hedged":
+            return provider_stats[provider].hedge_delay()
+        return None
 
-    reference = datetime.now()
-    total_income, total_expense = transaction_service.monthly_summary(
-        db, user.id, reference)
-    categories = transaction_service.top_expense_categories(
-        db, user.id, reference)
-    balance = total_income - total_expense
-    summary = compose_summary(
-        total_income=total_income,
-        total_expense=total_expense,
-        balance=balance,
-        categories=categories,
-        month_label=reference.strftime("%Y-%m"),
-    )
+    try:
+        delay = _start_next() if waiting else None
+        while running:
+            done, _ = await asyncio.wait(
+                running, timeout=delay if waiting else None,
+                return_when=asyncio.FIRST_COMPLETED)
+            running.difference_update(done)
+            for task in done:
+                if answer := task.result():
+                    return answer
+            if waiting:
+                # A provider failed or outran its hedge delay.
+                delay = _start_next()
+        return None
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+
+def _load_context(db: Session, user_id: int) -> tuple[MonthlyInsight, dict[str, Any]]:
+    summary = transaction_service.monthly_insight(db, user_id, datetime.now().date())
 
     all_time_income, all_time_expense = transaction_service.all_time_summary(
-        db, user.id)
+        db, user_id)
     all_time_categories = transaction_service.all_time_expense_categories(
-        db, user.id)
+        db, user_id)
     monthly_breakdown = transaction_service.monthly_breakdown(
-        db, user.id, months=6)
-    recent_txs = transaction_service.list_transactions(db, user.id, limit=20)
+        db, user_id, months=6)
+    recent_txs = transaction_service.list_transactions(db, user_id, limit=20)
     recent_transactions = [
         {
             "date": tx.occurred_at.strftime("%Y-%m-%d"),
@@ -366,12 +498,38 @@ def generate_advice(db: Session, user: User, request: AdviceRequest) -> AdviceEn
         "monthly_breakdown": monthly_breakdown,
         "recent_transactions": recent_transactions,
     }
+    return summary, historical_data
+
+
+def _save_advice(db: Session, user_id: int, conversation_id: str, prompt: str, response: str) -> AdviceEntry:
+    advice = AdviceEntry(
+        user_id=user_id,
+        conversation_id=conversation_id,
+        prompt=prompt,
+        response=response,
+    )
+    db.add(advice)
+    data_version_service.bump(db, user_id, data_version_service.ADVICE)
+    db.commit()
+    db.refresh(advice)
+    return advice
+
+
+async def generate_advice(db: Session, user: User, request: AdviceRequest) -> AdviceEntry:
+    """Answer ``request`` and store it.
+
+    Database work runs in the threadpool; the provider calls are awaited on
+    the event loop, so no thread is held while a provider responds.
+    """
+    import uuid
+
+    summary, historical_data = await run_in_threadpool(_load_context, db, user.id)
 
     safe_question = _scrub_text(
         request.question[: settings.AI_MAX_INPUT_CHARS])
     estimated_tokens = _estimate_tokens(safe_question) + 512
 
-    if not _reserve_tokens(user.id, estimated_tokens):
+    if not await run_in_threadpool(_reserve_tokens, user.id, estimated_tokens):
         logger.info("advice_budget_exceeded", extra={"user_id": user.id})
         response = (
             f"[{settings.AI_ASSISTANT_NAME}] Достигнат е дневниот лимит за AI совети. "
@@ -386,28 +544,14 @@ def generate_advice(db: Session, user: User, request: AdviceRequest) -> AdviceEn
                 "question_length": len(safe_question),
             },
         )
-        response = _groq_response(
+        response = await _provider_answer(
             summary, safe_question, user, historical_data)
-        if not response:
-            response = _gemini_response(
-                summary, safe_question, user, historical_data)
-        if not response:
-            response = _openai_response(
-                summary, safe_question, user, historical_data)
         if not response:
             response = _fallback_response(summary, safe_question, user)
 
     conversation_id = request.conversation_id or str(uuid.uuid4())
-    advice = AdviceEntry(
-        user_id=user.id,
-        conversation_id=conversation_id,
-        prompt=request.question,
-        response=response,
-    )
-    db.add(advice)
-    db.commit()
-    db.refresh(advice)
-    return advice
+    return await run_in_threadpool(
+        _save_advice, db, user.id, conversation_id, request.question, response)
 
 
 def list_advice(db: Session, user_id: int, limit: int = 20) -> list[AdviceEntry]:
@@ -477,6 +621,7 @@ def delete_conversation(db: Session, user_id: int, conversation_id: str) -> None
         .where(AdviceEntry.conversation_id == conversation_id)
     )
     db.execute(statement)
+    data_version_service.bump(db, user_id, data_version_service.ADVICE)
     db.commit()
 
 
@@ -485,4 +630,5 @@ def clear_advice(db: Session, user_id: int) -> None:
 
     statement = delete(AdviceEntry).where(AdviceEntry.user_id == user_id)
     db.execute(statement)
+    data_version_service.bump(db, user_id, data_version_service.ADVICE)
     db.commit()
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 
 from app.models import BudgetGoal
 from app.schemas.budget import BudgetCreate, BudgetUpdate
+from app.services import category_service, data_version_service
 
 
 def list_budgets(db: Session, user_id: int) -> list[BudgetGoal]:
@@ -15,12 +16,13 @@ def list_budgets(db: Session, user_id: int) -> list[BudgetGoal]:
 def create_budget(db: Session, user_id: int, budget_in: BudgetCreate) -> BudgetGoal:
     budget = BudgetGoal(
         user_id=user_id,
-        category=budget_in.category,
+        category_id=category_service.id_for(db, user_id, budget_in.category),
         limit_amount=budget_in.limit_amount,
         period=budget_in.period,
         starts_on=budget_in.starts_on,
     )
     db.add(budget)
+    data_version_service.bump(db, user_id, data_version_service.BUDGETS)
     db.commit()
     db.refresh(budget)
     return budget
@@ -36,9 +38,14 @@ def get_budget(db: Session, user_id: int, budget_id: int) -> BudgetGoal:
 
 def update_budget(db: Session, user_id: int, budget_id: int, budget_in: BudgetUpdate) -> BudgetGoal:
     budget = get_budget(db, user_id, budget_id)
-    for field, value in budget_in.model_dump(exclude_unset=True).items():
+    update_data = budget_in.model_dump(exclude_unset=True)
+    category = update_data.pop("category", None)
+    if category:
+        update_data["category_id"] = category_service.id_for(db, user_id, category)
+    for field, value in update_data.items():
         setattr(budget, field, value)
     db.add(budget)
+    data_version_service.bump(db, user_id, data_version_service.BUDGETS)
     db.commit()
     db.refresh(budget)
     return budget
@@ -47,4 +54,5 @@ def update_budget(db: Session, user_id: int, budget_id: int, budget_in: BudgetUp
 def delete_budget(db: Session, user_id: int, budget_id: int) -> None:
     budget = get_budget(db, user_id, budget_id)
     db.delete(budget)
+    data_version_service.bump(db, user_id, data_version_service.BUDGETS)
     db.commit()
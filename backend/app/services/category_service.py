@@ -0,0 +1,170 @@
+"""Per-user category dictionary.
+
+Transactions, budgets and rollups store an integer ``category_id``; the API
+keeps speaking names. Writes, filters, aggregates and series translate
+through a per-process, per-user id<->name map. Names never change once
+created, so a cached map can be incomplete but never wrong: a miss simply
+reloads it.
+
+Loaded transactions and budgets read their name through the models'
+``category`` column property instead: a primary-key probe in the same
+statement, so it costs no extra round trip and stays right for rows loaded by
+any query or refresh, where a map lookup would have to be threaded through
+every serializer.
+
+Categories created inside a unit of work are only published to the shared
+cache after that unit of work commits; a rollback discards them, and
+``app.core.database.savepoint`` discards the ones created inside a
+rolled-back savepoint.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.models import Category
+
+MAX_CACHED_USERS = 1024
+
+# Session.info key: {user_id: {category_id: name}} created but not yet committed.
+_PENDING = "pending_categories"
+
+
+class CategoryMap:
+    """Immutable id<->name snapshot for one user."""
+
+    __slots__ = ("by_id", "by_name")
+
+    def __init__(self, by_id: dict[int, str]) -> None:
+        self.by_id = by_id
+        self.by_name = {name: category_id for category_id, name in by_id.items()}
+
+
+_cache: OrderedDict[int, CategoryMap] = OrderedDict()
+_lock = threading.Lock()
+
+
+def _cached(user_id: int) -> CategoryMap | None:
+    with _lock:
+        mapping = _cache.get(user_id)
+        if mapping is not None:
+            _cache.move_to_end(user_id)
+        return mapping
+
+
+def _store(user_id: int, mapping: CategoryMap) -> None:
+    with _lock:
+        _cache[user_id] = mapping
+        _cache.move_to_end(user_id)
+        while len(_cache) > MAX_CACHED_USERS:
+            _cache.popitem(last=False)
+
+
+def _pending(db: Session, user_id: int) -> dict[int, str]:
+    return db.info.setdefault(_PENDING, {}).setdefault(user_id, {})
+
+
+def _load(db: Session, user_id: int) -> CategoryMap:
+    pending = _pending(db, user_id)
+    rows = db.execute(
+        select(Category.id, Category.name).where(Category.user_id == user_id))
+    mapping = CategoryMap({
+        category_id: name for category_id, name in rows if category_id not in pending
+    })
+    _store(user_id, mapping)
+    return mapping
+
+
+def _insert_ignore(db: Session):
+    table = Category.__table__
+    if db.get_bind().dialect.name == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+        return mysql_insert(table).prefix_with("IGNORE")
+
+    from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+    return sqlite_insert(table).on_conflict_do_nothing(
+        index_elements=[table.c.user_id, table.c.name])
+
+
+def _create(db: Session, user_id: int, names: list[str]) -> dict[str, int]:
+    # Another request may create the same name concurrently; ignore the
+    # conflict and read back whichever row won.
+    db.execute(_insert_ignore(db), [
+               {"user_id": user_id, "name": name} for name in names])
+    created = dict(db.execute(
+        select(Category.name, Category.id).where(
+            Category.user_id == user_id, Category.name.in_(names))
+    ).all())
+    _pending(db, user_id).update(
+        {category_id: name for name, category_id in created.items()})
+    return created
+
+
+def ids_by_name(
+    db: Session, user_id: int, names: Iterable[str], *, create: bool = False
+) -> dict[str, int]:
+    """Map names to ids; unknown names are created if ``create``, else left out."""
+    wanted = set(names)
+    if not wanted:
+        return {}
+    pending = {name: category_id for category_id,
+               name in _pending(db, user_id).items()}
+
+    def _resolve(mapping: CategoryMap) -> dict[str, int]:
+        return {
+            name: category_id
+            for name in wanted
+            if (category_id := mapping.by_name.get(name, pending.get(name))) is not None
+        }
+
+    mapping = _cached(user_id)
+    found = _resolve(mapping) if mapping is not None else {}
+    if len(found) < len(wanted):
+        found = _resolve(_load(db, user_id))
+    if create and len(found) < len(wanted):
+        found.update(_create(db, user_id, sorted(wanted - found.keys())))
+    return found
+
+
+def id_for(db: Session, user_id: int, name: str) -> int:
+    """Id of ``name``, creating the category on first use."""
+    return ids_by_name(db, user_id, [name], create=True)[name]
+
+
+def names_by_id(db: Session, user_id: int, ids: Iterable[int]) -> dict[int, str]:
+    wanted = set(ids)
+    pending = _pending(db, user_id)
+    mapping = _cached(user_id)
+    if mapping is None or not wanted <= mapping.by_id.keys() | pending.keys():
+        mapping = _load(db, user_id)
+    return {
+        category_id: mapping.by_id[category_id] if category_id in mapping.by_id else pending[category_id]
+        for category_id in wanted
+    }
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    if session.in_nested_transaction():
+        return  # released savepoint; the outer transaction may still roll back
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+    with _lock:
+        for user_id, created in pending.items():
+            mapping = _cache.get(user_id)
+            if mapping is not None and created:
+                _cache[user_id] = CategoryMap({**mapping.by_id, **created})
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    if session.in_nested_transaction():
+        return  # savepoint() restores what was pending before it
+    session.info.pop(_PENDING, None)
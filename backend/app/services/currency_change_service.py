@@ -0,0 +1,255 @@
+"""Change a user's currency with chunked, set-based UPDATEs.
+
+Every change is recorded as a ``CurrencyChangeJob``. Transactions are
+converted in primary-key ranges of ``CURRENCY_CHANGE_CHUNK_SIZE`` rows with
+one ``UPDATE ... SET amount = ROUND(amount * factor, 2)`` executed once per
+currency and exchange-rate period found in the range, so each row converts
+at the rate in effect on its ``occurred_at``. Each range commits on its own,
+so no single write transaction (or SQLite write lock) spans the whole
+history. The job row keeps the last converted
+id, so a job that failed or whose worker died resumes where it stopped.
+Budgets, monthly income, the rollups and ``users.currency`` switch together
+in the final commit; until then insights may mix converted and unconverted
+months. Budgets and monthly income are limits for the months ahead rather
+than dated amounts, so they convert at the latest rates when the job
+finishes.
+
+Transaction writes are refused with 409 while a job is unfinished (pending,
+running or failed): a row written meanwhile would get ``amount_base`` in
+the old currency, and the chunk cursor may already be past it.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+
+from fastapi import HTTPException, status
+from sqlalchemy import Numeric, and_, bindparam, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import BudgetGoal, CurrencyChangeJob, CurrencyChangeStatus, Transaction, User
+from app.services import data_version_service, rollup_service, user_service
+from app.services.currency_service import conversion_factor, convert_amount, rates
+
+logger = logging.getLogger(__name__)
+
+# A running job that has not committed a chunk for this long is presumed dead.
+STALE_AFTER = timedelta(minutes=5)
+
+# A failed job has converted part of the history, so it counts until resumed.
+_UNFINISHED = (CurrencyChangeStatus.PENDING, CurrencyChangeStatus.RUNNING,
+               CurrencyChangeStatus.FAILED)
+
+# Bounds standing in for the open ends of the first and last rate periods.
+_EARLIEST = date(1900, 1, 1)
+_LATEST = date(9999, 1, 1)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _unfinished_job(db: Session, user_id: int) -> int | None:
+    return db.scalar(select(CurrencyChangeJob.id).where(
+        CurrencyChangeJob.user_id == user_id, CurrencyChangeJob.status.in_(_UNFINISHED)))
+
+
+def ensure_no_unfinished_change(db: Session, user_id: int) -> None:
+    """409 while a currency change of ``user_id`` is pending, running or failed."""
+    unfinished = _unfinished_job(db, user_id)
+    if unfinished is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Currency change {unfinished} is not finished; "
+                   "transactions cannot be changed until it completes",
+        )
+
+
+def start(db: Session, user: User, new_currency: str, convert_values: bool) -> CurrencyChangeJob:
+    """Record a pending change for ``user``; run it with ``run`` or ``run_by_id``."""
+    unfinished = _unfinished_job(db, user.id)
+    if unfinished is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Currency change {unfinished} is not finished; resume it first",
+        )
+    job = CurrencyChangeJob(
+        user_id=user.id,
+        old_currency=user.currency.upper(),
+        new_currency=new_currency.upper(),
+        convert_values=convert_values,
+        total_transactions=db.scalar(select(func.count(Transaction.id)).where(
+            Transaction.user_id == user.id)) or 0,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def runs_in_background(job: CurrencyChangeJob) -> bool:
+    return job.total_transactions > settings.CURRENCY_CHANGE_BACKGROUND_THRESHOLD
+
+
+def get_job(db: Session, user_id: int, job_id: int) -> CurrencyChangeJob:
+    job = db.get(CurrencyChangeJob, job_id)
+    if not job or job.user_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Currency change not found")
+    return job
+
+
+def prepare_resume(db: Session, user_id: int, job_id: int) -> CurrencyChangeJob:
+    """Check that ``job_id`` can be resumed (failed, or running with no recent progress)."""
+    job = get_job(db, user_id, job_id)
+    resumable = job.status == CurrencyChangeStatus.FAILED or (
+        job.status == CurrencyChangeStatus.RUNNING and _is_stale(job))
+    if not resumable:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Currency change is {job.status.value} and cannot be resumed",
+        )
+    return job
+
+
+def _is_stale(job: CurrencyChangeJob) -> bool:
+    updated_at = job.updated_at
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    return updated_at < _now() - STALE_AFTER
+
+
+def _claim(db: Session, job: CurrencyChangeJob) -> bool:
+    """Mark ``job`` running unless another worker is actively running it."""
+    claimed = db.execute(
+        update(CurrencyChangeJob)
+        .where(
+            CurrencyChangeJob.id == job.id,
+            or_(
+                CurrencyChangeJob.status.in_(
+                    [CurrencyChangeStatus.PENDING, CurrencyChangeStatus.FAILED]),
+                and_(
+                    CurrencyChangeJob.status == CurrencyChangeStatus.RUNNING,
+                    CurrencyChangeJob.updated_at < _now() - STALE_AFTER,
+                ),
+            ),
+        )
+        .values(status=CurrencyChangeStatus.RUNNING, error=None, updated_at=_now())
+    ).rowcount
+    db.commit()
+    db.refresh(job)
+    return claimed == 1
+
+
+def _convert_chunk(db: Session, job: CurrencyChangeJob) -> bool:
+    """Convert the next id range and commit it; False once nothing is left."""
+    rows = db.execute(
+        select(Transaction.id, Transaction.currency, Transaction.occurred_at)
+        .where(Transaction.user_id == job.user_id, Transaction.id > job.last_transaction_id)
+        .order_by(Transaction.id)
+        .limit(settings.CURRENCY_CHANGE_CHUNK_SIZE)
+    ).all()
+    if not rows:
+        return False
+
+    last_id = rows[-1].id
+    snapshot = rates()
+    # One parameter set per (currency, rate period) present in the range;
+    # each converts every row of that currency dated inside the period.
+    groups = {(row.currency, snapshot.position(row.occurred_at)) for row in rows}
+    params = []
+    for currency, position in sorted(groups):
+        start, end = snapshot.span(position)
+        params.append({
+            "source": currency,
+            "start": datetime.combine(start or _EARLIEST, time.min),
+            "end": datetime.combine(end or _LATEST, time.min),
+            "factor": snapshot.factor(currency, job.new_currency, start or _EARLIEST),
+        })
+
+    table = Transaction.__table__
+    converted = func.round(
+        table.c.amount * bindparam("factor", type_=Numeric()), 2)
+    statement = table.update().where(
+        table.c.user_id == job.user_id,
+        table.c.id > job.last_transaction_id,
+        table.c.id <= last_id,
+        table.c.currency == bindparam("source"),
+        table.c.occurred_at >= bindparam("start", type_=table.c.occurred_at.type),
+        table.c.occurred_at < bindparam("end", type_=table.c.occurred_at.type),
+    )
+    if job.convert_values:
+        # MySQL applies SET assignments left to right, so amount_base must be
+        # computed before amount is overwritten.
+        statement = statement.ordered_values(
+            (table.c.amount_base, converted),
+            (table.c.amount, converted),
+            (table.c.currency, job.new_currency),
+        )
+    else:
+        statement = statement.values(amount_base=converted)
+    db.execute(statement, params)
+
+    job.last_transaction_id = last_id
+    job.processed_transactions += len(rows)
+    job.updated_at = _now()
+    db.commit()
+    return True
+
+
+def _finish(db: Session, job: CurrencyChangeJob) -> None:
+    user = db.get(User, job.user_id)
+    scopes = [data_version_service.TRANSACTIONS]
+    if job.convert_values:
+        # Budgets and monthly income are not dated: latest rates, see module docstring.
+        factor = conversion_factor(job.old_currency, job.new_currency)
+        job.budgets_converted = db.execute(
+            update(BudgetGoal)
+            .where(BudgetGoal.user_id == job.user_id)
+            .values(limit_amount=func.round(BudgetGoal.limit_amount * factor, 2))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if user.monthly_income:
+            user.monthly_income = convert_amount(
+                user.monthly_income, job.old_currency, job.new_currency)
+        scopes.append(data_version_service.BUDGETS)
+
+    # Per-row rounding means totals must be re-summed, not scaled.
+    rollup_service.rebuild(db, job.user_id)
+    user.currency = job.new_currency
+    user_service.invalidate_snapshot(db, job.user_id)
+    data_version_service.bump(db, job.user_id, *scopes)
+    job.status = CurrencyChangeStatus.COMPLETED
+    job.finished_at = _now()
+    db.commit()
+
+
+def run(db: Session, job: CurrencyChangeJob) -> CurrencyChangeJob:
+    """Run (or resume) ``job`` to completion in ``db``; failures are recorded on the job."""
+    if not _claim(db, job):
+        return job
+    try:
+        while _convert_chunk(db, job):
+            pass
+        _finish(db, job)
+    except Exception as exc:
+        db.rollback()
+        logger.exception("currency_change_failed", extra={
+                         "job_id": job.id, "user_id": job.user_id})
+        job.status = CurrencyChangeStatus.FAILED
+        job.error = str(exc)[:500]
+        db.commit()
+    return job
+
+
+def run_by_id(job_id: int) -> None:
+    """Background entry point: runs the job in its own session."""
+    db = SessionLocal()
+    try:
+        job = db.get(CurrencyChangeJob, job_id)
+        if job is not None:
+            run(db, job)
+    finally:
+        db.close()
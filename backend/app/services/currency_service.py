@@ -1,8 +1,41 @@
-"""Currency conversion utilities and rates."""
-from decimal import Decimal, ROUND_HALF_UP
+"""Currency conversion utilities and rates.
+
+Rates live in ``exchange_rates`` as units per EUR per day (loaded from ECB
+XML/CSV files) and are served from an immutable in-memory ``RateMatrix``:
+one rate vector per date plus the N x N cross-rate matrix of the latest
+rates, so a conversion is two dict lookups and one multiplication. Reloading builds a new snapshot and
+swaps the module reference, so readers never see a half-built one. Until
+rates are loaded, the built-in ``EXCHANGE_RATES`` are used.
+"""
+from __future__ import annotations
+
+import codecs
+import csv
+import logging
+import threading
+import time
+import xml.etree.ElementTree as ElementTree
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from itertools import groupby
+from typing import IO
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import ExchangeRate
+
+logger = logging.getLogger(__name__)
+
+BASE_CURRENCY = "EUR"
 
 # Exchange rates relative to EUR (base currency)
-# These are approximate rates - in production, you'd use a real API
+# Built-in fallback until real rates are loaded into exchange_rates.
 EXCHANGE_RATES = {
     "EUR": Decimal("1.0"),
     "USD": Decimal("1.08"),
@@ -31,28 +64,313 @@ EXCHANGE_RATES = {
     "INR": Decimal("90.0"),
 }
 
+STORE_BATCH_SIZE = 1000
+
+_ONE = Decimal("1")
+_CENT = Decimal("0.01")
+
+RateRow = tuple[date, str, Decimal]
+
+
+class RateMatrix:
+    """Immutable rate snapshot.
+
+    ``vectors[i]`` holds every currency's units per EUR in effect from
+    ``dates[i]`` (gaps carried forward, so each vector is complete).
+    ``latest`` is the N x N cross-rate matrix of the newest vector, which
+    most conversions use; an as-of conversion divides two entries of that
+    date's vector instead of building its matrix.
+    """
+
+    def __init__(
+        self,
+        currencies: Sequence[str],
+        dates: Sequence[date],
+        vectors: Sequence[tuple[Decimal, ...]],
+        fingerprint: tuple | None = None,
+    ) -> None:
+        self.currencies = tuple(currencies)
+        self.index = {code: position for position,
+                      code in enumerate(self.currencies)}
+        self.dates = list(dates)
+        self.vectors = list(vectors)
+        self.fingerprint = fingerprint
+        # latest[i][j]: multiplier from currencies[i] to currencies[j].
+        self.latest = tuple(
+            tuple(target / source for target in self.vectors[-1])
+            for source in self.vectors[-1]
+        )
+
+    @property
+    def latest_date(self) -> date | None:
+        """Date of the newest loaded rates; ``None`` for the built-in rates."""
+        return self.dates[-1] if self.dates[-1] != date.min else None
+
+    def position(self, as_of: date | datetime | None = None) -> int:
+        """Index of the rates in effect on ``as_of`` (the latest if ``None``)."""
+        if as_of is None:
+            return len(self.dates) - 1
+        if isinstance(as_of, datetime):
+            as_of = as_of.date()
+        return max(bisect_right(self.dates, as_of) - 1, 0)
+
+    def span(self, position: int) -> tuple[date | None, date | None]:
+        """``[start, end)`` dates served by ``position``; open-ended at either edge."""
+        start = self.dates[position] if position > 0 else None
+        end = self.dates[position + 1] if position + \
+            1 < len(self.dates) else None
+        return start, end
+
+    def _slot(self, currency: str) -> int:
+        # Unknown codes convert like EUR, as they always have.
+        return self.index.get(currency.upper(), self.index[BASE_CURRENCY])
+
+    def factor(
+        self, from_currency: str, to_currency: str, as_of: date | datetime | None = None
+    ) -> Decimal:
+        if from_currency.upper() == to_currency.upper():
+            return _ONE
+        source, target = self._slot(from_currency), self._slot(to_currency)
+        if as_of is None:
+            return self.latest[source][target]
+        vector = self.vectors[self.position(as_of)]
+        return vector[target] / vector[source]
+
+
+def _builtin() -> RateMatrix:
+    return RateMatrix(list(EXCHANGE_RATES), [date.min], [tuple(EXCHANGE_RATES.values())])
+
+
+_rates = _builtin()
+_checked_at = float("-inf")
+_reload_lock = threading.Lock()
+
+
+def _fingerprint(db: Session) -> tuple:
+    """Changes on every write: the sum catches rates corrected in place, the
+    usual ECB case, which move neither the row count nor the newest date."""
+    return tuple(db.execute(
+        select(func.count(), func.max(ExchangeRate.rate_date), func.sum(ExchangeRate.rate))).one())
+
+
+def build(db: Session) -> RateMatrix:
+    """Snapshot of every stored rate (the built-in rates if none are stored)."""
+    fingerprint = _fingerprint(db)
+    rows = db.execute(
+        select(ExchangeRate.rate_date, ExchangeRate.currency, ExchangeRate.rate)
+        .order_by(ExchangeRate.rate_date)
+    ).all()
+    if not rows:
+        snapshot = _builtin()
+        snapshot.fingerprint = fingerprint
+        return snapshot
+
+    first_seen: dict[str, Decimal] = {}
+    for _, currency, rate in rows:
+        first_seen.setdefault(currency, Decimal(rate))
+    currencies = list(EXCHANGE_RATES) + \
+        sorted(first_seen.keys() - EXCHANGE_RATES.keys())
+    index = {code: position for position, code in enumerate(currencies)}
+    # Before a currency's first stored rate, use that first rate (or the built-in one).
+    current = [first_seen.get(code, EXCHANGE_RATES.get(code))
+               for code in currencies]
+    current[index[BASE_CURRENCY]] = _ONE
+
+    dates: list[date] = []
+    vectors: list[tuple[Decimal, ...]] = []
+    for rate_date, day in groupby(rows, key=lambda row: row[0]):
+        for _, currency, rate in day:
+            if currency != BASE_CURRENCY:
+                current[index[currency]] = Decimal(rate)
+        dates.append(rate_date)
+        vectors.append(tuple(current))
+    return RateMatrix(currencies, dates, vectors, fingerprint)
 
-def convert_amount(amount: Decimal, from_currency: str, to_currency: str) -> Decimal:
-    """Convert an amount from one currency to another."""
-    if from_currency == to_currency:
-        return amount
 
-    from_currency = from_currency.upper()
-    to_currency = to_currency.upper()
+def reload(db: Session) -> RateMatrix:
+    """Rebuild the snapshot from ``db`` and publish it."""
+    global _rates, _checked_at
+    snapshot = build(db)
+    _rates = snapshot
+    _checked_at = time.monotonic()
+    return snapshot
 
-    # Get rates (default to EUR if unknown)
-    from_rate = EXCHANGE_RATES.get(from_currency, Decimal("1.0"))
-    to_rate = EXCHANGE_RATES.get(to_currency, Decimal("1.0"))
 
-    # Convert: amount in from_currency -> EUR -> to_currency
-    # First convert to EUR, then to target
-    amount_in_eur = amount / from_rate
-    amount_in_target = amount_in_eur * to_rate
+def rates() -> RateMatrix:
+    """Current snapshot, refreshed when another worker has loaded new rates."""
+    global _checked_at
+    snapshot = _rates
+    if time.monotonic() - _checked_at < settings.EXCHANGE_RATES_REFRESH_SECONDS:
+        return snapshot
+    if not _reload_lock.acquire(blocking=False):
+        return snapshot  # another thread is already checking
+    try:
+        db = SessionLocal()
+        try:
+            if _fingerprint(db) != snapshot.fingerprint:
+                return reload(db)
+        finally:
+            db.close()
+    except SQLAlchemyError:
+        logger.warning("exchange_rates_unavailable", exc_info=True)
+    finally:
+        _checked_at = time.monotonic()
+        _reload_lock.release()
+    return _rates
 
-    # Round to 2 decimal places
-    return amount_in_target.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+def conversion_factor(
+    from_currency: str, to_currency: str, as_of: date | datetime | None = None
+) -> Decimal:
+    """Multiplier taking an amount in ``from_currency`` to ``to_currency`` (unrounded)."""
+    return rates().factor(from_currency, to_currency, as_of)
+
+
+def convert_amount(
+    amount: Decimal, from_currency: str, to_currency: str, as_of: date | datetime | None = None
+) -> Decimal:
+    """Convert an amount from one currency to another."""
+    if from_currency.upper() == to_currency.upper():
+        return amount
+    factor = rates().factor(from_currency, to_currency, as_of)
+    return (amount * factor).quantize(_CENT, rounding=ROUND_HALF_UP)
+
+
+def convert_many(
+    amounts: Iterable[Decimal],
+    from_currency: str,
+    to_currency: str,
+    as_of: date | datetime | None = None,
+) -> list[Decimal]:
+    """Convert many amounts with one rate lookup, rounding each to cents."""
+    if from_currency.upper() == to_currency.upper():
+        return list(amounts)
+    factor = rates().factor(from_currency, to_currency, as_of)
+    quantize = Decimal.quantize
+    return [quantize(amount * factor, _CENT, ROUND_HALF_UP) for amount in amounts]
 
 
 def get_supported_currencies() -> list[str]:
     """Return list of supported currency codes."""
-    return list(EXCHANGE_RATES.keys())
+    return list(rates().currencies)
+
+
+def _parse_rate(value: str) -> Decimal | None:
+    try:
+        rate = Decimal(value.strip())
+    except InvalidOperation:
+        return None  # ECB files mark missing rates as "N/A"
+    return rate if rate > 0 else None
+
+
+def parse_ecb_xml(stream: IO[bytes]) -> Iterator[RateRow]:
+    """Rates from an ECB ``eurofxref`` XML file (daily, 90-day or full history).
+
+    Each ``<Cube time=...>`` day is cleared from the tree once parsed, so a
+    full-history file is read in constant memory.
+    """
+    root = days = None
+    rate_date = None
+    for event, element in ElementTree.iterparse(stream, events=("start", "end")):
+        if root is None:
+            root = element
+        if not element.tag.endswith("Cube"):
+            continue
+        if event == "end":
+            if "time" in element.attrib:
+                element.clear()
+                (days if days is not None else root).clear()
+            continue
+        if not element.attrib:
+            days = element  # the outer <Cube> holding one <Cube time=...> per day
+        elif "time" in element.attrib:
+            rate_date = date.fromisoformat(element.attrib["time"])
+        elif rate_date is not None and "currency" in element.attrib:
+            rate = _parse_rate(element.attrib.get("rate", ""))
+            if rate is not None:
+                yield rate_date, element.attrib["currency"].upper(), rate
+
+
+def parse_ecb_csv(stream: IO[str]) -> Iterator[RateRow]:
+    """Rates from an ECB ``eurofxref`` CSV (``Date,USD,JPY,...``) or a ``date,currency,rate`` CSV."""
+    reader = csv.reader(stream)
+    header = [column.strip() for column in next(reader, [])]
+    lowered = [column.lower() for column in header]
+    if {"date", "currency", "rate"} <= set(lowered):
+        columns = [lowered.index(name) for name in ("date", "currency", "rate")]
+        for record in reader:
+            if len(record) < len(header):
+                continue
+            rate = _parse_rate(record[columns[2]])
+            if rate is not None:
+                yield (date.fromisoformat(record[columns[0]].strip()),
+                       record[columns[1]].strip().upper(), rate)
+        return
+
+    for record in reader:
+        if not record or not record[0].strip():
+            continue
+        rate_date = date.fromisoformat(record[0].strip())
+        for currency, value in zip(header[1:], record[1:]):
+            if not currency:
+                continue  # ECB rows end with a trailing comma
+            rate = _parse_rate(value)
+            if rate is not None:
+                yield rate_date, currency.upper(), rate
+
+
+RATE_FORMATS = ("xml", "csv")
+
+
+def detect_format(filename: str | None, declared: str | None = None) -> str | None:
+    candidate = (declared or (filename or "").rsplit(".", 1)[-1]).lower()
+    return candidate if candidate in RATE_FORMATS else None
+
+
+def _upsert_statement(db: Session):
+    table = ExchangeRate.__table__
+    if db.get_bind().dialect.name == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+        statement = mysql_insert(table)
+        return statement.on_duplicate_key_update(rate=statement.inserted.rate)
+
+    from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+    statement = sqlite_insert(table)
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.rate_date, table.c.currency],
+        set_={"rate": statement.excluded.rate},
+    )
+
+
+def store_rates(db: Session, rows: Iterable[RateRow]) -> int:
+    """Insert or overwrite rates in batches; does not commit."""
+    statement = _upsert_statement(db)
+    stored = 0
+    batch: list[dict] = []
+    for rate_date, currency, rate in rows:
+        if currency == BASE_CURRENCY:
+            continue
+        batch.append({"rate_date": rate_date,
+                     "currency": currency, "rate": rate})
+        if len(batch) >= STORE_BATCH_SIZE:
+            db.execute(statement, batch)
+            stored += len(batch)
+            batch.clear()
+    if batch:
+        db.execute(statement, batch)
+        stored += len(batch)
+    return stored
+
+
+def load_file(db: Session, stream: IO[bytes], file_format: str) -> int:
+    """Store every rate in an ECB XML/CSV file, commit and publish the new snapshot."""
+    if file_format == "xml":
+        rows = parse_ecb_xml(stream)
+    else:
+        rows = parse_ecb_csv(codecs.getreader("utf-8-sig")(stream))
+    stored = store_rates(db, rows)
+    db.commit()
+    reload(db)
+    return stored
@@ -0,0 +1,30 @@
+"""Per-user data versions backing the ETags of the read endpoints.
+
+Write paths bump the version of the data they touch inside their own unit of
+work, so a version only moves when the write commits and an unchanged version
+means the cached representation is still valid.
+"""
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models import User
+
+TRANSACTIONS = "transactions_version"
+BUDGETS = "budgets_version"
+SAVINGS_GOALS = "savings_goals_version"
+ADVICE = "advice_version"
+
+
+def bump(db: Session, user_id: int, *scopes: str) -> None:
+    """Increment the given version counters for ``user_id`` (not committed)."""
+    columns = User.__table__.c
+    values = {scope: columns[scope] + 1 for scope in scopes}
+    # A data version bump is not a profile edit.
+    values["updated_at"] = columns.updated_at
+    db.execute(update(User.__table__).where(columns.id == user_id).values(values))
+
+
+def current(db: Session, user_id: int, scope: str) -> int:
+    """Committed value of one version counter (0 for an unknown user)."""
+    column = User.__table__.c[scope]
+    return db.scalar(select(column).where(User.__table__.c.id == user_id)) or 0
@@ -0,0 +1,112 @@
+"""Read-only views of amounts in another currency (``?display_currency=``).
+
+Nothing is written back: values are converted on the way out, in one pass
+over the result. Transactions convert from their own currency at the rate in
+effect on ``occurred_at``; the factor is looked up once per (currency, day)
+in the page. Totals (insights, series, budgets) are kept in the owner's
+currency and convert at the rate in effect on the first day of their month,
+bucket or budget period.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import date, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+
+from fastapi import HTTPException, status
+
+from app.models import BudgetGoal, Transaction
+from app.schemas import MonthlyInsight, TimeSeriesResponse
+from app.services.currency_service import get_supported_currencies, rates
+
+_CENT = Decimal("0.01")
+
+
+def resolve(display_currency: str | None) -> str | None:
+    """Normalised ``display_currency``; 400 if the currency is not supported."""
+    if not display_currency:
+        return None
+    display_currency = display_currency.upper()
+    if display_currency not in get_supported_currencies():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported display currency: {display_currency}",
+        )
+    return display_currency
+
+
+def etag_part(display_currency: str | None) -> tuple | None:
+    """What a converted representation depends on besides the user's data."""
+    if display_currency is None:
+        return None
+    return display_currency, rates().fingerprint
+
+
+def transactions(items: Iterable[Transaction], display_currency: str) -> None:
+    """Set ``display_amount``/``display_currency`` on each transaction."""
+    snapshot = rates()
+    factors: dict[tuple[str, date], Decimal] = {}
+    quantize = Decimal.quantize
+    for item in items:
+        key = (item.currency, item.occurred_at.date())
+        factor = factors.get(key)
+        if factor is None:
+            factor = factors[key] = snapshot.factor(
+                item.currency, display_currency, key[1])
+        item.display_amount = quantize(item.amount * factor, _CENT, ROUND_HALF_UP)
+        item.display_currency = display_currency
+
+
+def _convert_dated(
+    amounts: Iterable[tuple[Decimal, date]], base_currency: str, display_currency: str
+) -> list[Decimal]:
+    """Convert ``(amount, as_of)`` pairs, looking each day's factor up once."""
+    snapshot = rates()
+    factors: dict[date, Decimal] = {}
+    quantize = Decimal.quantize
+    converted = []
+    for amount, as_of in amounts:
+        factor = factors.get(as_of)
+        if factor is None:
+            factor = factors[as_of] = snapshot.factor(base_currency, display_currency, as_of)
+        converted.append(quantize(amount * factor, _CENT, ROUND_HALF_UP))
+    return converted
+
+
+def budgets(items: Iterable[BudgetGoal], base_currency: str, display_currency: str) -> None:
+    """Set ``display_limit_amount``/``display_currency`` on each budget."""
+    items = list(items)
+    converted = _convert_dated(
+        ((item.limit_amount, item.starts_on) for item in items), base_currency, display_currency)
+    for item, amount in zip(items, converted):
+        item.display_limit_amount = amount
+        item.display_currency = display_currency
+
+
+def insight(result: MonthlyInsight, base_currency: str, display_currency: str) -> MonthlyInsight:
+    month = date.fromisoformat(f"{result.month}-01")
+    previous = (month - timedelta(days=1)).replace(day=1)
+    fields = (("total_income", month), ("total_expense", month),
+              ("prev_total_income", previous), ("prev_total_expense", previous))
+    amounts = [(getattr(result, field), as_of) for field, as_of in fields] + \
+        [(row.amount, month) for row in result.top_expense_categories]
+    converted = iter(_convert_dated(amounts, base_currency, display_currency))
+    for field, _ in fields:
+        setattr(result, field, next(converted))
+    for row in result.top_expense_categories:
+        row.amount = next(converted)
+    # Derived from the converted totals so they still add up to the cent.
+    result.balance = result.total_income - result.total_expense
+    result.carryover = result.prev_total_income - result.prev_total_expense
+    result.display_currency = display_currency
+    return result
+
+
+def series(result: TimeSeriesResponse, base_currency: str, display_currency: str) -> TimeSeriesResponse:
+    points = [point for line in result.series for point in line.points]
+    converted = _convert_dated(
+        ((point.amount, point.period_start) for point in points), base_currency, display_currency)
+    for point, amount in zip(points, converted):
+        point.amount = amount
+    result.display_currency = display_currency
+    return result
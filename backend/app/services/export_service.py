@@ -0,0 +1,250 @@
+"""Serializers that turn streamed transaction rows into export chunks.
+
+Text formats (CSV, TSV, NDJSON, JSON) are written row by row. The columnar
+formats (Arrow IPC stream, Parquet) are built one record batch per database
+row batch, column-wise, so no ORM objects or Pydantic models are created.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models import TransactionType
+from app.services import transaction_service
+from app.services.transaction_service import EXPORT_COLUMNS
+
+CHUNK_ROWS = 500
+# Rows per Arrow record batch / Parquet row group.
+COLUMNAR_BATCH_ROWS = 10_000
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "tsv": "text/tab-separated-values",
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+COLUMNAR_FORMATS = frozenset({"arrow", "parquet"})
+FORMAT_PATTERN = f"^({'|'.join(MEDIA_TYPES)})$"
+
+_DICTIONARY = pa.dictionary(pa.int32(), pa.string())
+_ARROW_TYPES = {
+    "user_id": pa.int64(),
+    "id": pa.int64(),
+    "occurred_at": pa.timestamp("us", tz="UTC"),
+    "transaction_type": _DICTIONARY,
+    "category": _DICTIONARY,
+    "amount": pa.decimal128(14, 2),
+    "currency": _DICTIONARY,
+    "note": pa.string(),
+}
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if hasattr(value, "value"):  # enums
+        return value.value
+    return value
+
+
+def _delimited(rows: Iterable[Row], columns: Sequence[str], delimiter: str) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=delimiter, lineterminator="\n")
+    writer.writerow(columns)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow([_plain(value) for value in row])
+        if count % CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _json_lines(rows: Iterable[Row], columns: Sequence[str]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(
+            {column: _plain(value) for column, value in zip(columns, row)},
+            ensure_ascii=False,
+        )
+
+
+def _joined(lines: Iterator[str], separator: str) -> Iterator[str]:
+    """Group lines into chunks of ``CHUNK_ROWS``, each ending with ``separator``."""
+    chunk: list[str] = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= CHUNK_ROWS:
+            yield separator.join(chunk) + separator
+            chunk.clear()
+    if chunk:
+        yield separator.join(chunk) + separator
+
+
+def _ndjson(rows: Iterable[Row], columns: Sequence[str]) -> Iterator[str]:
+    yield from _joined(_json_lines(rows, columns), "\n")
+
+
+def _json_array(rows: Iterable[Row], columns: Sequence[str]) -> Iterator[str]:
+    yield "["
+    previous = None
+    for chunk in _joined(_json_lines(rows, columns), ","):
+        # Hold one chunk back so the final trailing comma can be dropped.
+        if previous is not None:
+            yield previous
+        previous = chunk
+    if previous is not None:
+        yield previous[:-1]
+    yield "]"
+
+
+def serialize(
+    rows: Iterable[Row], export_format: str, columns: Sequence[str] = EXPORT_COLUMNS
+) -> Iterator[str]:
+    if export_format == "csv":
+        return _delimited(rows, columns, ",")
+    if export_format == "tsv":
+        return _delimited(rows, columns, "\t")
+    if export_format == "ndjson":
+        return _ndjson(rows, columns)
+    if export_format == "json":
+        return _json_array(rows, columns)
+    raise ValueError(f"Unsupported export format: {export_format}")
+
+
+def arrow_schema(columns: Sequence[str]) -> pa.Schema:
+    return pa.schema(
+        pa.field(column, _ARROW_TYPES[column], nullable=column == "note")
+        for column in columns
+    )
+
+
+def _arrow_column(values: Sequence[Any], field: pa.Field) -> pa.Array:
+    if field.name == "transaction_type":
+        values = [TransactionType(value).value for value in values]
+    if pa.types.is_dictionary(field.type):
+        return pa.array(values, type=pa.string()).dictionary_encode()
+    return pa.array(values, type=field.type)
+
+
+def record_batch(rows: Sequence[Row], schema: pa.Schema) -> pa.RecordBatch:
+    """Transpose one batch of DB rows into an Arrow record batch."""
+    columns = list(zip(*rows)) or [() for _ in schema]
+    return pa.RecordBatch.from_arrays(
+        [_arrow_column(values, field) for values, field in zip(columns, schema)],
+        schema=schema,
+    )
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only file object whose contents can be taken piecemeal while streaming."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def encode_columnar(
+    batches: Iterable[Sequence[Row]], export_format: str, columns: Sequence[str] = EXPORT_COLUMNS
+) -> Iterator[bytes]:
+    """Encode row batches as an Arrow IPC stream or a Parquet file.
+
+    Each DB batch becomes one record batch (or row group) and is flushed to
+    the client before the next one is read.
+    """
+    schema = arrow_schema(columns)
+    sink = _DrainableSink()
+    if export_format == "arrow":
+        writer = pa.ipc.new_stream(sink, schema)
+    elif export_format == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        raise ValueError(f"Unsupported columnar format: {export_format}")
+
+    try:
+        for rows in batches:
+            if not rows:
+                continue
+            writer.write_batch(record_batch(rows, schema))
+            chunk = sink.take()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.take()
+
+
+def export_chunks(
+    db: Session,
+    user_id: int | None,
+    export_format: str,
+    *,
+    columns: Sequence[str] = EXPORT_COLUMNS,
+    **filters: Any,
+) -> Iterator[str | bytes]:
+    """Stream ``user_id``'s transactions (everyone's if ``None``) in ``export_format``."""
+    if export_format in COLUMNAR_FORMATS:
+        batches = transaction_service.stream_transaction_batches(
+            db, user_id, columns=columns, batch_size=COLUMNAR_BATCH_ROWS, **filters)
+        return encode_columnar(batches, export_format, columns)
+    rows = transaction_service.stream_transactions(
+        db, user_id, columns=columns, **filters)
+    return serialize(rows, export_format, columns)
+
+
+def streaming_response(
+    user_id: int | None,
+    export_format: str,
+    *,
+    filename: str = "transactions",
+    columns: Sequence[str] = EXPORT_COLUMNS,
+    **filters: Any,
+) -> StreamingResponse:
+    def _body() -> Iterator[str | bytes]:
+        # The request-scoped session is closed before streaming starts, so
+        # the generator owns its own.
+        db = SessionLocal()
+        try:
+            yield from export_chunks(db, user_id, export_format, columns=columns, **filters)
+        finally:
+            db.close()
+
+    attachment = f"{filename}-{date.today().isoformat()}.{export_format}"
+    return StreamingResponse(
+        _body(),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{attachment}"'},
+    )
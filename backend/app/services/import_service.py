@@ -0,0 +1,325 @@
+"""Streaming bulk import of bank exports (CSV, OFX, QIF).
+
+Each parser is a generator over a text stream that yields one raw row at a
+time, so memory stays flat regardless of file size. Rows are validated
+against ``TransactionCreate`` and inserted with executemany batches inside a
+single database transaction.
+"""
+from __future__ import annotations
+
+import csv
+import re
+from collections.abc import Callable, Iterator
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal, InvalidOperation
+from typing import IO, Any
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models import Transaction, TransactionType
+from app.schemas.transaction import TransactionCreate, TransactionImportError, TransactionImportResult
+from app.services import (
+    category_service,
+    currency_change_service,
+    data_version_service,
+    rollup_service,
+    transaction_service,
+)
+from app.services.currency_service import convert_amount
+
+DEFAULT_CATEGORY = "Uncategorized"
+MAX_REPORTED_ERRORS = 200
+
+RawRow = dict[str, Any]
+# Parsers yield the exception instead of raising so one bad row does not end the stream.
+ParsedRow = RawRow | ValueError
+
+_CSV_ALIASES = {
+    "type": "transaction_type",
+    "date": "occurred_at",
+    "description": "note",
+    "memo": "note",
+}
+
+
+class ImportFormatError(ValueError):
+    """A row whose fields cannot be mapped onto a transaction."""
+
+
+def _parse_amount(value: str) -> Decimal:
+    cleaned = value.strip().replace(",", "")
+    try:
+        return Decimal(cleaned)
+    except InvalidOperation as exc:
+        raise ImportFormatError(f"Invalid amount: {value!r}") from exc
+
+
+def _signed(row: RawRow, amount: Decimal) -> RawRow:
+    """Turn a signed bank amount into a positive amount plus a type."""
+    row.setdefault(
+        "transaction_type",
+        TransactionType.EXPENSE if amount < 0 else TransactionType.INCOME,
+    )
+    row["amount"] = abs(amount)
+    return row
+
+
+def _guarded(build: Callable[..., RawRow], *args: Any) -> ParsedRow:
+    try:
+        return build(*args)
+    except ValueError as exc:
+        return exc
+
+
+def _csv_row(record: dict[str | None, str | None]) -> RawRow:
+    row: RawRow = {}
+    for key, value in record.items():
+        if key is None or not value:
+            continue
+        name = key.strip().lower()
+        row[_CSV_ALIASES.get(name, name)] = value.strip()
+    row.setdefault("category", DEFAULT_CATEGORY)
+    if "transaction_type" in row:
+        row["transaction_type"] = row["transaction_type"].lower()
+    elif "amount" in row:
+        row = _signed(row, _parse_amount(row["amount"]))
+    return row
+
+
+def parse_csv(stream: IO[str]) -> Iterator[ParsedRow]:
+    """Yield rows from a CSV file with a header line.
+
+    Recognised columns: category, amount, currency, transaction_type (or
+    type), occurred_at (or date) and note (or description/memo). Without a
+    type column, negative amounts are expenses and positive ones income.
+    """
+    for record in csv.DictReader(stream):
+        yield _guarded(_csv_row, record)
+
+
+_OFX_TOKEN_RE = re.compile(r"<(/?[A-Za-z0-9.]+)>([^<]*)")
+
+
+def _ofx_tokens(stream: IO[str], chunk_size: int = 64 * 1024) -> Iterator[tuple[str, str]]:
+    buffer = ""
+    while True:
+        chunk = stream.read(chunk_size)
+        buffer += chunk
+        if chunk:
+            # Hold back the trailing, possibly incomplete, tag for the next chunk.
+            cut = buffer.rfind("<")
+            if cut <= 0:
+                continue
+            ready, buffer = buffer[:cut], buffer[cut:]
+        else:
+            ready, buffer = buffer, ""
+        for match in _OFX_TOKEN_RE.finditer(ready):
+            yield match.group(1).upper(), match.group(2).strip()
+        if not chunk:
+            return
+
+
+# YYYYMMDD[HHMMSS[.XXX]][[+-]H[.MM][:TZ]]; without a bracket the time is GMT.
+_OFX_DATE_RE = re.compile(
+    r"(\d{8})(\d{6})?(?:\.\d+)?\s*(?:\[\s*([+-]?\d{1,2})(?:\.(\d{1,2}))?(?::[^\]]*)?\])?")
+
+
+def _parse_ofx_date(value: str) -> datetime:
+    """Naive UTC time of an OFX date, with its ``[offset:TZ]`` suffix applied."""
+    match = _OFX_DATE_RE.match(value)
+    if not match:
+        raise ImportFormatError(f"Invalid OFX date: {value!r}")
+    day, clock, hours, minutes = match.groups()
+    parsed = datetime.strptime(day + (clock or "000000"), "%Y%m%d%H%M%S")
+    if hours is None:
+        return parsed
+    offset = timedelta(hours=abs(int(hours)), minutes=int(minutes or 0))
+    return parsed + offset if hours.startswith("-") else parsed - offset
+
+
+def _ofx_row(fields: dict[str, str], currency: str | None) -> RawRow:
+    row: RawRow = {"category": DEFAULT_CATEGORY}
+    if currency:
+        row["currency"] = currency
+    if fields.get("DTPOSTED"):
+        row["occurred_at"] = _parse_ofx_date(fields["DTPOSTED"])
+    note = " - ".join(part for part in (fields.get("NAME"), fields.get("MEMO")) if part)
+    if note:
+        row["note"] = note
+    if "TRNAMT" in fields:
+        row = _signed(row, _parse_amount(fields["TRNAMT"]))
+    return row
+
+
+def parse_ofx(stream: IO[str]) -> Iterator[ParsedRow]:
+    """Yield one row per ``<STMTTRN>`` block (SGML and XML flavours)."""
+    currency = None
+    fields: dict[str, str] | None = None
+    for tag, value in _ofx_tokens(stream):
+        if tag == "CURDEF":
+            currency = value
+        elif tag == "STMTTRN":
+            fields = {}
+        elif tag == "/STMTTRN" and fields is not None:
+            yield _guarded(_ofx_row, fields, currency)
+            fields = None
+        elif fields is not None and not tag.startswith("/"):
+            fields[tag] = value
+
+
+_QIF_DATE_FORMATS = ("%m/%d/%Y", "%m/%d/%y", "%Y-%m-%d", "%d.%m.%Y")
+
+
+def _parse_qif_date(value: str) -> datetime:
+    normalized = value.strip().replace("'", "/").replace(" ", "0")
+    for fmt in _QIF_DATE_FORMATS:
+        try:
+            return datetime.strptime(normalized, fmt)
+        except ValueError:
+            continue
+    raise ImportFormatError(f"Invalid QIF date: {value!r}")
+
+
+def _qif_row(fields: dict[str, str]) -> RawRow:
+    row: RawRow = {"category": fields.get("L") or DEFAULT_CATEGORY}
+    if fields.get("D"):
+        row["occurred_at"] = _parse_qif_date(fields["D"])
+    note = " - ".join(part for part in (fields.get("P"), fields.get("M")) if part)
+    if note:
+        row["note"] = note
+    amount = fields.get("T") or fields.get("U")
+    if amount:
+        row = _signed(row, _parse_amount(amount))
+    return row
+
+
+def parse_qif(stream: IO[str]) -> Iterator[ParsedRow]:
+    """Yield one row per ``^``-terminated QIF record."""
+    fields: dict[str, str] = {}
+    for line in stream:
+        line = line.rstrip("\r\n")
+        if not line or line.startswith("!"):
+            continue
+        if line.startswith("^"):
+            if fields:
+                yield _guarded(_qif_row, fields)
+            fields = {}
+            continue
+        fields.setdefault(line[0], line[1:].strip())
+    if fields:
+        yield _guarded(_qif_row, fields)
+
+
+PARSERS: dict[str, Callable[[IO[str]], Iterator[ParsedRow]]] = {
+    "csv": parse_csv,
+    "ofx": parse_ofx,
+    "qif": parse_qif,
+}
+
+
+def detect_format(filename: str | None, declared: str | None = None) -> str | None:
+    candidate = declared or (filename or "").rsplit(".", 1)[-1]
+    candidate = candidate.lower()
+    return candidate if candidate in PARSERS else None
+
+
+def _error_message(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+            for error in exc.errors()
+        )
+    return str(exc)
+
+
+def import_transactions(
+    db: Session,
+    user_id: int,
+    stream: IO[str],
+    file_format: str,
+    *,
+    batch_size: int = 1000,
+) -> TransactionImportResult:
+    """Validate and insert every row of ``stream`` in one transaction.
+
+    Invalid rows are skipped and reported; valid rows are written with one
+    executemany per ``batch_size`` rows, and the rollups receive one delta
+    per touched bucket at the end.
+    """
+    currency_change_service.ensure_no_unfinished_change(db, user_id)
+    parser = PARSERS[file_format]
+    imported = 0
+    failed = 0
+    errors: list[TransactionImportError] = []
+    batch: list[dict[str, Any]] = []
+    base_currency = transaction_service.user_currency(db, user_id)
+    # Bounded by months x categories x types, not by row count.
+    deltas: dict[rollup_service.RollupKey, tuple[Decimal, int]] = {}
+
+    def _flush() -> None:
+        if not batch:
+            return
+        category_ids = category_service.ids_by_name(
+            db, user_id, {values["category"] for values in batch}, create=True)
+        for values in batch:
+            values["category_id"] = category_ids[values.pop("category")]
+        db.execute(insert(Transaction.__table__), batch)
+        for values in batch:
+            key = (
+                user_id,
+                rollup_service.month_key(values["occurred_at"]),
+                values["transaction_type"],
+                values["category_id"],
+            )
+            amount, count = deltas.get(key, (Decimal("0"), 0))
+            deltas[key] = (amount + values["amount_base"], count + 1)
+        batch.clear()
+
+    for row_number, row in enumerate(parser(stream), start=1):
+        try:
+            if isinstance(row, Exception):
+                raise row
+            tx_in = TransactionCreate.model_validate(row)
+        except (ValidationError, ValueError) as exc:
+            failed += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append(TransactionImportError(
+                    row=row_number, error=_error_message(exc)))
+            continue
+
+        currency = tx_in.currency.upper()
+        occurred_at = tx_in.occurred_at.replace(tzinfo=timezone.utc)
+        batch.append({
+            "user_id": user_id,
+            "category": tx_in.category,
+            "amount": tx_in.amount,
+            "amount_base": convert_amount(tx_in.amount, currency, base_currency, occurred_at),
+            "currency": currency,
+            "transaction_type": tx_in.transaction_type,
+            "occurred_at": occurred_at,
+            "note": tx_in.note,
+            "is_deleted": False,
+        })
+        imported += 1
+        if len(batch) >= batch_size:
+            _flush()
+
+    try:
+        _flush()
+        rollup_service.apply_deltas(db, deltas)
+        if imported:
+            data_version_service.bump(
+                db, user_id, data_version_service.TRANSACTIONS)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return TransactionImportResult(
+        imported=imported,
+        failed=failed,
+        errors=errors,
+        errors_truncated=failed > len(errors),
+    )
@@ -0,0 +1,106 @@
+"""Write-behind buffer for ``users.last_login_at``.
+
+A successful login only records the timestamp in memory; a background thread
+writes everything buffered in one statement every
+``LAST_LOGIN_FLUSH_SECONDS``. During a login burst that turns one commit
+per login into one commit per interval. A crash loses at most one interval
+of last-login times, which are informational only.
+
+Without a running writer (scripts, ``LAST_LOGIN_FLUSH_SECONDS = 0``) the
+timestamp is written immediately.
+"""
+import logging
+import threading
+from datetime import datetime
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import User
+
+logger = logging.getLogger(__name__)
+
+_pending: dict[int, datetime] = {}
+_pending_lock = threading.Lock()
+_writer: threading.Thread | None = None
+_stop = threading.Event()
+
+_columns = User.__table__.c
+_update_last_login = (
+    update(User.__table__)
+    .where(_columns.id == bindparam("user_id"))
+    # A login is not a profile edit.
+    .values(last_login_at=bindparam("logged_in_at"), updated_at=_columns.updated_at)
+)
+
+
+def _merge(entries: dict[int, datetime]) -> None:
+    for user_id, logged_in_at in entries.items():
+        buffered = _pending.get(user_id)
+        if buffered is None or buffered < logged_in_at:
+            _pending[user_id] = logged_in_at
+
+
+def _write(entries: dict[int, datetime]) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(
+            _update_last_login,
+            [{"user_id": user_id, "logged_in_at": logged_in_at}
+             for user_id, logged_in_at in entries.items()],
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def record(user_id: int, logged_in_at: datetime) -> None:
+    """Set ``last_login_at`` of ``user_id`` with the next flush."""
+    if _writer is None:
+        _write({user_id: logged_in_at})
+        return
+    with _pending_lock:
+        _merge({user_id: logged_in_at})
+
+
+def flush() -> int:
+    """Write every buffered timestamp now; returns how many were written."""
+    with _pending_lock:
+        entries = dict(_pending)
+        _pending.clear()
+    if not entries:
+        return 0
+    try:
+        _write(entries)
+    except SQLAlchemyError:
+        logger.warning("last_login_flush_failed", exc_info=True)
+        with _pending_lock:
+            _merge(entries)  # retried with the next flush
+        return 0
+    return len(entries)
+
+
+def _run() -> None:
+    while not _stop.wait(settings.LAST_LOGIN_FLUSH_SECONDS):
+        flush()
+
+
+def start_writer() -> None:
+    global _writer
+    if settings.LAST_LOGIN_FLUSH_SECONDS <= 0 or _writer is not None:
+        return
+    _stop.clear()
+    _writer = threading.Thread(target=_run, name="last-login-writer", daemon=True)
+    _writer.start()
+
+
+def stop_writer() -> None:
+    """Stop the writer and write whatever is still buffered."""
+    global _writer
+    writer, _writer = _writer, None
+    if writer is not None:
+        _stop.set()
+        writer.join()
+    flush()
@@ -0,0 +1,193 @@
+"""Maintenance of the ``transaction_rollups`` table.
+
+Every transaction write applies a signed delta to the (user, month, type,
+category_id) bucket it touches, inside the caller's unit of work, so the
+insight and advice aggregates can read a handful of rollup rows instead of
+scanning the user's whole history. Totals are sums of ``amount_base``, i.e.
+in the user's currency.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.core.sql import month_bucket
+from app.models import Transaction, TransactionRollup, TransactionType
+
+RollupKey = tuple[int, date, TransactionType, int]
+
+REBUILD_BATCH_SIZE = 1000
+
+
+def month_key(occurred_at: datetime | date) -> date:
+    return date(occurred_at.year, occurred_at.month, 1)
+
+
+def rollup_key(transaction: Transaction) -> RollupKey:
+    return (
+        transaction.user_id,
+        month_key(transaction.occurred_at),
+        TransactionType(transaction.transaction_type),
+        transaction.category_id,
+    )
+
+
+def _upsert_statement(db: Session):
+    """INSERT ... that adds to an existing bucket instead of failing on it."""
+    table = TransactionRollup.__table__
+    if db.get_bind().dialect.name == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+        statement = mysql_insert(table)
+        return statement.on_duplicate_key_update(
+            total_amount=table.c.total_amount + statement.inserted.total_amount,
+            transaction_count=table.c.transaction_count +
+            statement.inserted.transaction_count,
+        )
+
+    from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+    statement = sqlite_insert(table)
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.month,
+                        table.c.transaction_type, table.c.category_id],
+        set_={
+            "total_amount": table.c.total_amount + statement.excluded.total_amount,
+            "transaction_count": table.c.transaction_count + statement.excluded.transaction_count,
+        },
+    )
+
+
+def apply_deltas(db: Session, deltas: dict[RollupKey, tuple[Decimal, int]]) -> None:
+    """Add each ``(amount, count)`` to its bucket, dropping buckets that empty out.
+
+    All deltas go out as a single executemany upsert.
+    """
+    if not deltas:
+        return
+    db.execute(
+        _upsert_statement(db),
+        [
+            {
+                "user_id": user_id,
+                "month": month,
+                "transaction_type": transaction_type,
+                "category_id": category_id,
+                "total_amount": amount,
+                "transaction_count": count,
+            }
+            for (user_id, month, transaction_type, category_id), (amount, count) in deltas.items()
+        ],
+    )
+    shrinking = [key for key, (_, count) in deltas.items() if count < 0]
+    for user_id, month, transaction_type, category_id in shrinking:
+        db.execute(
+            delete(TransactionRollup).where(
+                TransactionRollup.user_id == user_id,
+                TransactionRollup.month == month,
+                TransactionRollup.transaction_type == transaction_type,
+                TransactionRollup.category_id == category_id,
+                TransactionRollup.transaction_count <= 0,
+            )
+        )
+
+
+def apply_delta(db: Session, key: RollupKey, amount: Decimal, count: int) -> None:
+    apply_deltas(db, {key: (amount, count)})
+
+
+def add_transaction(db: Session, transaction: Transaction) -> None:
+    apply_delta(db, rollup_key(transaction), Decimal(transaction.amount_base), 1)
+
+
+def remove_transaction(db: Session, transaction: Transaction) -> None:
+    apply_delta(db, rollup_key(transaction), -Decimal(transaction.amount_base), -1)
+
+
+def move_transaction(
+    db: Session, old_key: RollupKey, old_amount: Decimal, transaction: Transaction
+) -> None:
+    """Re-bucket a transaction after an update (no-op if nothing relevant changed)."""
+    new_key = rollup_key(transaction)
+    new_amount = Decimal(transaction.amount_base)
+    if new_key == old_key:
+        if new_amount != old_amount:
+            apply_delta(db, new_key, new_amount - old_amount, 0)
+        return
+    apply_delta(db, old_key, -old_amount, -1)
+    apply_delta(db, new_key, new_amount, 1)
+
+
+def _grouped_transactions(user_id: int | None):
+    bucket = month_bucket(Transaction.occurred_at).label("bucket")
+    statement = select(
+        Transaction.user_id,
+        bucket,
+        Transaction.transaction_type,
+        Transaction.category_id,
+        func.sum(Transaction.amount_base),
+        func.count(Transaction.id),
+    ).group_by(Transaction.user_id, bucket, Transaction.transaction_type, Transaction.category_id)
+    if user_id is not None:
+        statement = statement.where(Transaction.user_id == user_id)
+    return statement
+
+
+def _expected_rows(db: Session, user_id: int | None):
+    for row_user_id, label, transaction_type, category_id, total, count in db.execute(
+        _grouped_transactions(user_id)
+    ):
+        year, month = (int(part) for part in label.split("-"))
+        yield {
+            "user_id": row_user_id,
+            "month": date(year, month, 1),
+            "transaction_type": transaction_type,
+            "category_id": category_id,
+            "total_amount": Decimal(total),
+            "transaction_count": count,
+        }
+
+
+def rebuild(db: Session, user_id: int | None = None) -> int:
+    """Recompute rollups from ``transactions`` (one user, or everyone).
+
+    Does not commit, so it can run inside a larger unit of work.
+    """
+    db.flush()
+    statement = delete(TransactionRollup)
+    if user_id is not None:
+        statement = statement.where(TransactionRollup.user_id == user_id)
+    db.execute(statement)
+
+    rows = list(_expected_rows(db, user_id))
+    for start in range(0, len(rows), REBUILD_BATCH_SIZE):
+        db.execute(TransactionRollup.__table__.insert(),
+                   rows[start:start + REBUILD_BATCH_SIZE])
+    return len(rows)
+
+
+def verify(db: Session, user_id: int | None = None) -> list[str]:
+    """Compare rollups against ``transactions`` and describe every mismatch."""
+    expected = {
+        (row["user_id"], row["month"], TransactionType(row["transaction_type"]), row["category_id"]):
+        (row["total_amount"], row["transaction_count"])
+        for row in _expected_rows(db, user_id)
+    }
+    statement = select(TransactionRollup)
+    if user_id is not None:
+        statement = statement.where(TransactionRollup.user_id == user_id)
+    actual = {
+        (rollup.user_id, rollup.month, TransactionType(rollup.transaction_type), rollup.category_id):
+        (Decimal(rollup.total_amount), rollup.transaction_count)
+        for rollup in db.scalars(statement)
+    }
+
+    problems = []
+    for key in sorted(expected.keys() | actual.keys(), key=str):
+        if expected.get(key) != actual.get(key):
+            problems.append(
+                f"{key}: expected {expected.get(key)}, found {actual.get(key)}")
+    return problems
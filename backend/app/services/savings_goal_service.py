@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 
 from app.models import SavingsGoal
 from app.schemas.savings_goal import SavingsGoalCreate, SavingsGoalUpdate
+from app.services import data_version_service
 
 
 def list_savings_goals(db: Session, user_id: int) -> list[SavingsGoal]:
@@ -21,6 +22,7 @@ def create_savings_goal(db: Session, user_id: int, goal_in: SavingsGoalCreate) -
         icon=goal_in.icon,
     )
     db.add(goal)
+    data_version_service.bump(db, user_id, data_version_service.SAVINGS_GOALS)
     db.commit()
     db.refresh(goal)
     return goal
@@ -39,6 +41,7 @@ def update_savings_goal(db: Session, user_id: int, goal_id: int, goal_in: Saving
     for field, value in goal_in.model_dump(exclude_unset=True).items():
         setattr(goal, field, value)
     db.add(goal)
+    data_version_service.bump(db, user_id, data_version_service.SAVINGS_GOALS)
     db.commit()
     db.refresh(goal)
     return goal
@@ -47,4 +50,5 @@ def update_savings_goal(db: Session, user_id: int, goal_id: int, goal_in: Saving
 def delete_savings_goal(db: Session, user_id: int, goal_id: int) -> None:
     goal = get_savings_goal(db, user_id, goal_id)
     db.delete(goal)
+    data_version_service.bump(db, user_id, data_version_service.SAVINGS_GOALS)
     db.commit()
@@ -0,0 +1,77 @@
+"""Full-text search over transaction categories and notes.
+
+SQLite matches against the FTS5 table from ``models.transaction_search`` and
+ranks by bm25. MySQL uses FULLTEXT indexes in boolean mode, one on
+``transactions.note`` and one on ``categories.name``; as with FTS5, a row
+matches when every word is found in its note or its category name. Both
+databases maintain the indexes themselves, so writes need no extra calls here.
+"""
+import re
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, column, inspect, literal_column, or_, select, table, text
+from sqlalchemy.orm import Session
+
+from app.models import Category, Transaction
+from app.models.transaction_search import FTS_TABLE, SQLITE_REBUILD, SQLITE_SEARCH_DDL
+
+MAX_TERMS = 8
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+_fts = table(FTS_TABLE, column("rowid"), column("rank"))
+
+
+def search_terms(query: str) -> list[str]:
+    """Words of ``query``; punctuation and search operators are dropped."""
+    return _TERM_RE.findall(query.lower())[:MAX_TERMS]
+
+
+def apply_search(statement: Select, query: str, dialect: str) -> Select:
+    """Restrict ``statement`` to rows matching every word (as a prefix), best match first."""
+    terms = search_terms(query)
+    if not terms:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query must contain at least one word",
+        )
+
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import match
+
+        # One condition per word, each satisfied by the note or the category.
+        for term in terms:
+            categories = select(Category.id).where(
+                match(Category.name, against=f"{term}*").in_boolean_mode() > 0)
+            statement = statement.where(or_(
+                match(Transaction.note, against=f"{term}*").in_boolean_mode() > 0,
+                Transaction.category_id.in_(categories),
+            ))
+        score = match(Transaction.note, against=" ".join(
+            f"{term}*" for term in terms)).in_boolean_mode()
+        return statement.order_by(score.desc())
+
+    expression = " ".join(f'"{term}"*' for term in terms)
+    return (
+        statement
+        .join(_fts, _fts.c.rowid == Transaction.id)
+        .where(literal_column(FTS_TABLE).op("MATCH")(expression))
+        .order_by(_fts.c.rank)
+    )
+
+
+def rebuild_index(db: Session) -> None:
+    """Create the search index if it is missing and (re)index every transaction."""
+    bind = db.get_bind()
+    if bind.dialect.name == "mysql":
+        inspector = inspect(bind)
+        for index, table_name, column_name in (
+            ("ix_transactions_search", "transactions", "note"),
+            ("ix_categories_search", "categories", "name"),
+        ):
+            if not any(found["name"] == index for found in inspector.get_indexes(table_name)):
+                db.execute(text(
+                    f"CREATE FULLTEXT INDEX {index} ON {table_name} ({column_name})"))
+        return
+
+    for statement in (*SQLITE_SEARCH_DDL, *SQLITE_REBUILD):
+        db.execute(text(statement))
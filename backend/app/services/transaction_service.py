@@ -1,34 +1,82 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import base64
+import binascii
+import json
+from collections.abc import Iterator, Sequence
+from contextlib import nullcontext
+from datetime import date, datetime, time, timedelta, timezone
 from decimal import Decimal
+from typing import Any
 
 from fastapi import HTTPException, status
-from sqlalchemy import and_, func, select
+from sqlalchemy import Row, Select, and_, case, func, literal, or_, select
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
-from app.models import Transaction, TransactionType
-from app.schemas.transaction import TransactionCreate, TransactionUpdate
+from app.models import Category, Transaction, TransactionRollup, TransactionType, User
+from app.core.sql import day_bucket, month_bucket, week_bucket, year_bucket
+from app.core.database import savepoint
+from app.schemas.insight import CategoryBreakdown, MonthlyInsight, Series, SeriesPoint, TimeSeriesResponse
+from app.schemas.transaction import (
+    TransactionBatchRequest,
+    TransactionBatchResponse,
+    TransactionBatchResult,
+    TransactionCreate,
+    TransactionRead,
+    TransactionUpdate,
+)
+from app.services import (
+    category_service,
+    currency_change_service,
+    data_version_service,
+    rollup_service,
+    search_service,
+)
+from app.services.currency_service import convert_amount
+
+
+def encode_cursor(transaction: Transaction) -> str:
+    """Build an opaque keyset cursor pointing just past ``transaction``."""
+    raw = json.dumps(
+        {"t": transaction.occurred_at.isoformat(), "id": transaction.id},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
 
 
-from datetime import timezone
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        occurred_at = datetime.fromisoformat(data["t"])
+        transaction_id = int(data["id"])
+    except (binascii.Error, ValueError, KeyError, TypeError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+    if occurred_at.tzinfo is None:
+        occurred_at = occurred_at.replace(tzinfo=timezone.utc)
+    return occurred_at, transaction_id
 
 
-def list_transactions(
-    db: Session,
-    user_id: int,
+def next_cursor(transactions: list[Transaction], limit: int) -> str | None:
+    """Return the cursor for the following page, or None on the last page."""
+    if not transactions or len(transactions) < min(limit, 500):
+        return None
+    return encode_cursor(transactions[-1])
+
+
+def _apply_filters(
+    statement: Select,
+    user_id: int | None,
     *,
     start_at: datetime | None = None,
     end_at: datetime | None = None,
     category: str | None = None,
     transaction_type: TransactionType | None = None,
-    limit: int = 100,
-    offset: int = 0,
-) -> list[Transaction]:
-    # Hard safety cap (finance apps must never allow unlimited scans)
-    limit = min(limit, 500)
-
-    statement = select(Transaction).where(Transaction.user_id == user_id)
+) -> Select:
+    if user_id is not None:
+        statement = statement.where(Transaction.user_id == user_id)
 
     if start_at:
         if start_at.tzinfo is None:
@@ -41,34 +89,190 @@ def list_transactions(
         statement = statement.where(Transaction.occurred_at <= end_at)
 
     if category:
-        statement = statement.where(Transaction.category == category)
+        category_ids = select(Category.id).where(Category.name == category)
+        if user_id is not None:
+            statement = statement.where(Transaction.category_id == category_ids.where(
+                Category.user_id == user_id).scalar_subquery())
+        else:
+            statement = statement.where(
+                Transaction.category_id.in_(category_ids))
 
     if transaction_type:
         statement = statement.where(
             Transaction.transaction_type == transaction_type
         )
+    return statement
+
+
+def list_transactions(
+    db: Session,
+    user_id: int,
+    *,
+    start_at: datetime | None = None,
+    end_at: datetime | None = None,
+    category: str | None = None,
+    transaction_type: TransactionType | None = None,
+    limit: int = 100,
+    offset: int = 0,
+    cursor: str | None = None,
+    q: str | None = None,
+) -> list[Transaction]:
+    """List a user's transactions, newest first.
+
+    Pass ``cursor`` (from ``next_cursor``) for keyset paging; it seeks on the
+    (user_id, occurred_at, id) index instead of skipping ``offset`` rows.
+    With ``q`` the rows are full-text matched on category and note and ranked
+    by relevance; search results page with ``offset`` only.
+    """
+    # Hard safety cap (finance apps must never allow unlimited scans)
+    limit = min(limit, 500)
+
+    statement = _apply_filters(
+        select(Transaction),
+        user_id,
+        start_at=start_at,
+        end_at=end_at,
+        category=category,
+        transaction_type=transaction_type,
+    )
+    if q:
+        if cursor:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Search results are paged with offset, not cursor",
+            )
+        statement = search_service.apply_search(
+            statement, q, db.get_bind().dialect.name)
+
+    if cursor:
+        cursor_at, cursor_id = decode_cursor(cursor)
+        statement = statement.where(
+            or_(
+                Transaction.occurred_at < cursor_at,
+                and_(
+                    Transaction.occurred_at == cursor_at,
+                    Transaction.id < cursor_id,
+                ),
+            )
+        )
+    elif offset:
+        statement = statement.offset(offset)
 
     statement = (
         statement
-        .order_by(Transaction.occurred_at.desc())
-        .offset(offset)
+        .order_by(Transaction.occurred_at.desc(), Transaction.id.desc())
         .limit(limit)
     )
 
     return list(db.scalars(statement).all())
 
 
-def create_transaction(db: Session, user_id: int, tx_in: TransactionCreate) -> Transaction:
+EXPORT_COLUMNS = ("id", "occurred_at", "transaction_type",
+                  "category", "amount", "currency", "note")
+
+
+def stream_transaction_batches(
+    db: Session,
+    user_id: int | None,
+    *,
+    columns: Sequence[str] = EXPORT_COLUMNS,
+    start_at: datetime | None = None,
+    end_at: datetime | None = None,
+    category: str | None = None,
+    transaction_type: TransactionType | None = None,
+    batch_size: int = 1000,
+) -> Iterator[Sequence[Row]]:
+    """Yield lists of plain rows (``columns``), without a row cap.
+
+    One user's rows come newest first; ``user_id=None`` exports everyone in
+    primary-key order. Uses a server-side cursor and ``yield_per`` so only one
+    batch is held in memory; no ORM objects are built.
+    """
+    statement = _apply_filters(
+        select(*(
+            Category.name.label(column) if column == "category" else getattr(Transaction, column)
+            for column in columns
+        )).join(Category, Category.id == Transaction.category_id),
+        user_id,
+        start_at=start_at,
+        end_at=end_at,
+        category=category,
+        transaction_type=transaction_type,
+    )
+    if user_id is None:
+        statement = statement.order_by(Transaction.id)
+    else:
+        statement = statement.order_by(
+            Transaction.occurred_at.desc(), Transaction.id.desc())
+    result = db.execute(statement.execution_options(
+        stream_results=True, yield_per=batch_size))
+    try:
+        yield from result.partitions()
+    finally:
+        result.close()
+
+
+def stream_transactions(db: Session, user_id: int | None, **options) -> Iterator[Row]:
+    """Row-at-a-time view of ``stream_transaction_batches``."""
+    for batch in stream_transaction_batches(db, user_id, **options):
+        yield from batch
+
+
+def user_currency(db: Session, user_id: int) -> str:
+    """Currency ``amount_base`` is kept in (the owner is usually already in the session)."""
+    user = db.get(User, user_id)
+    return user.currency.upper() if user else "EUR"
+
+
+def _add_transaction(db: Session, user_id: int, tx_in: TransactionCreate) -> Transaction:
+    currency = tx_in.currency.upper()
+    occurred_at = tx_in.occurred_at.replace(tzinfo=timezone.utc)
     transaction = Transaction(
         user_id=user_id,
-        category=tx_in.category,
+        category_id=category_service.id_for(db, user_id, tx_in.category),
         amount=tx_in.amount,
-        currency=tx_in.currency.upper(),
+        amount_base=convert_amount(
+            tx_in.amount, currency, user_currency(db, user_id), occurred_at),
+        currency=currency,
         transaction_type=tx_in.transaction_type,
-        occurred_at=tx_in.occurred_at.replace(tzinfo=timezone.utc),
+        occurred_at=occurred_at,
         note=tx_in.note,
     )
     db.add(transaction)
+    rollup_service.add_transaction(db, transaction)
+    return transaction
+
+
+def _apply_update(db: Session, transaction: Transaction, tx_in: TransactionUpdate) -> Transaction:
+    old_key = rollup_service.rollup_key(transaction)
+    old_amount = Decimal(transaction.amount_base)
+    update_data = tx_in.model_dump(exclude_unset=True)
+    if "currency" in update_data and update_data["currency"]:
+        update_data["currency"] = update_data["currency"].upper()
+    category = update_data.pop("category", None)
+    if category:
+        update_data["category_id"] = category_service.id_for(
+            db, transaction.user_id, category)
+    for field, value in update_data.items():
+        setattr(transaction, field, value)
+    if update_data.keys() & {"amount", "currency", "occurred_at"}:
+        transaction.amount_base = convert_amount(
+            Decimal(transaction.amount), transaction.currency,
+            user_currency(db, transaction.user_id), transaction.occurred_at)
+    db.add(transaction)
+    rollup_service.move_transaction(db, old_key, old_amount, transaction)
+    return transaction
+
+
+def _remove_transaction(db: Session, transaction: Transaction) -> None:
+    rollup_service.remove_transaction(db, transaction)
+    db.delete(transaction)
+
+
+def create_transaction(db: Session, user_id: int, tx_in: TransactionCreate) -> Transaction:
+    currency_change_service.ensure_no_unfinished_change(db, user_id)
+    transaction = _add_transaction(db, user_id, tx_in)
+    data_version_service.bump(db, user_id, data_version_service.TRANSACTIONS)
     db.commit()
     db.refresh(transaction)
     return transaction
@@ -85,22 +289,114 @@ def get_transaction(db: Session, user_id: int, transaction_id: int) -> Transacti
 def update_transaction(
     db: Session, user_id: int, transaction_id: int, tx_in: TransactionUpdate
 ) -> Transaction:
+    currency_change_service.ensure_no_unfinished_change(db, user_id)
     transaction = get_transaction(db, user_id, transaction_id)
-    update_data = tx_in.model_dump(exclude_unset=True)
-    if "currency" in update_data and update_data["currency"]:
-        update_data["currency"] = update_data["currency"].upper()
-    for field, value in update_data.items():
-        setattr(transaction, field, value)
-    db.add(transaction)
+    _apply_update(db, transaction, tx_in)
+    data_version_service.bump(db, user_id, data_version_service.TRANSACTIONS)
     db.commit()
     db.refresh(transaction)
     return transaction
 
 
 def delete_transaction(db: Session, user_id: int, transaction_id: int) -> None:
+    currency_change_service.ensure_no_unfinished_change(db, user_id)
     transaction = get_transaction(db, user_id, transaction_id)
-    db.delete(transaction)
+    _remove_transaction(db, transaction)
+    data_version_service.bump(db, user_id, data_version_service.TRANSACTIONS)
+    db.commit()
+
+
+def _batch_error(exc: Exception) -> tuple[int, str]:
+    if isinstance(exc, HTTPException):
+        return exc.status_code, str(exc.detail)
+    if isinstance(exc, SQLAlchemyError) and getattr(exc, "orig", None):
+        return status.HTTP_400_BAD_REQUEST, str(exc.orig)
+    return status.HTTP_400_BAD_REQUEST, str(exc)
+
+
+def apply_batch(
+    db: Session, user_id: int, batch_in: TransactionBatchRequest
+) -> TransactionBatchResponse:
+    """Apply create/update/delete operations in one session with one commit.
+
+    In ``atomic`` mode the first failing operation rolls everything back and
+    the remaining operations are reported as skipped. In ``best_effort``
+    mode each operation runs in its own savepoint, so a failing one (unknown
+    or foreign id, invalid value, database error) is reported and undone
+    while the rest still commit. Each operation is flushed before the next
+    one so a later operation sees earlier deletes.
+    """
+    currency_change_service.ensure_no_unfinished_change(db, user_id)
+    atomic = batch_in.mode == "atomic"
+    results: list[TransactionBatchResult] = []
+    touched: dict[int, Transaction] = {}
+    aborted = False
+
+    for index, operation in enumerate(batch_in.operations):
+        if aborted:
+            results.append(TransactionBatchResult(
+                index=index, op=operation.op, id=getattr(operation, "id", None),
+                ok=False, status_code=status.HTTP_424_FAILED_DEPENDENCY,
+                error="Skipped after an earlier failure",
+            ))
+            continue
+        try:
+            with nullcontext() if atomic else savepoint(db):
+                if operation.op == "create":
+                    transaction = _add_transaction(db, user_id, operation.data)
+                elif operation.op == "update":
+                    transaction = get_transaction(db, user_id, operation.id)
+                    _apply_update(db, transaction, operation.data)
+                else:
+                    transaction = get_transaction(db, user_id, operation.id)
+                    _remove_transaction(db, transaction)
+                db.flush()
+        except (HTTPException, SQLAlchemyError, ValueError) as exc:
+            status_code, error = _batch_error(exc)
+            results.append(TransactionBatchResult(
+                index=index, op=operation.op, id=getattr(operation, "id", None),
+                ok=False, status_code=status_code, error=error,
+            ))
+            aborted = atomic
+            continue
+
+        if operation.op != "delete":
+            touched[index] = transaction
+        results.append(TransactionBatchResult(
+            index=index, op=operation.op, id=transaction.id, ok=True,
+            status_code=status.HTTP_201_CREATED if operation.op == "create" else status.HTTP_200_OK,
+        ))
+
+    if aborted and atomic:
+        db.rollback()
+        for result in results:
+            if result.ok:
+                result.ok = False
+                result.status_code = status.HTTP_424_FAILED_DEPENDENCY
+                result.error = "Rolled back"
+                result.transaction = None
+        return TransactionBatchResponse(committed=False, results=results)
+
+    if any(result.ok for result in results):
+        data_version_service.bump(
+            db, user_id, data_version_service.TRANSACTIONS)
     db.commit()
+    if touched:
+        # Reload every created/updated row in one query instead of one refresh each.
+        ids = [transaction.id for transaction in touched.values()]
+        loaded = {
+            transaction.id: transaction
+            for transaction in db.scalars(
+                select(Transaction)
+                .where(Transaction.id.in_(ids))
+                .execution_options(populate_existing=True)
+            )
+        }
+        for result in results:
+            if result.ok and result.id in loaded:
+                result.transaction = TransactionRead.model_validate(
+                    loaded[result.id])
+    return TransactionBatchResponse(committed=True, results=results)
 
 
 def month_bounds(reference: datetime) -> tuple[datetime, datetime]:
@@ -115,18 +411,17 @@ def month_bounds(reference: datetime) -> tuple[datetime, datetime]:
 
 
 def monthly_summary(db: Session, user_id: int, reference: datetime) -> tuple[Decimal, Decimal]:
-    start, end = month_bounds(reference)
+    start, _ = month_bounds(reference)
     statement = (
-        select(Transaction.transaction_type, func.coalesce(
-            func.sum(Transaction.amount), 0))
+        select(TransactionRollup.transaction_type, func.coalesce(
+            func.sum(TransactionRollup.total_amount), 0))
         .where(
             and_(
-                Transaction.user_id == user_id,
-                Transaction.occurred_at >= start,
-                Transaction.occurred_at < end,
+                TransactionRollup.user_id == user_id,
+                TransactionRollup.month == start.date(),
             )
         )
-        .group_by(Transaction.transaction_type)
+        .group_by(TransactionRollup.transaction_type)
     )
     totals = {row[0]: Decimal(row[1]) for row in db.execute(statement)}
     total_income = totals.get(TransactionType.INCOME, Decimal("0"))
@@ -134,35 +429,135 @@ def monthly_summary(db: Session, user_id: int, reference: datetime) -> tuple[Dec
     return total_income, total_expense
 
 
+def _named(
+    db: Session, user_id: int, rows: Sequence[tuple[int, Any]]
+) -> list[tuple[str, Decimal]]:
+    """Swap the category ids of ``(category_id, amount)`` rows for names."""
+    names = category_service.names_by_id(db, user_id, (row[0] for row in rows))
+    return [(names[category_id], Decimal(amount)) for category_id, amount in rows]
+
+
 def top_expense_categories(
     db: Session, user_id: int, reference: datetime, limit: int = 5
 ) -> list[tuple[str, Decimal]]:
-    start, end = month_bounds(reference)
+    start, _ = month_bounds(reference)
     statement = (
-        select(Transaction.category, func.coalesce(
-            func.sum(Transaction.amount), 0))
+        select(TransactionRollup.category_id, func.coalesce(
+            func.sum(TransactionRollup.total_amount), 0))
         .where(
             and_(
-                Transaction.user_id == user_id,
-                Transaction.transaction_type == TransactionType.EXPENSE,
-                Transaction.occurred_at >= start,
-                Transaction.occurred_at < end,
+                TransactionRollup.user_id == user_id,
+                TransactionRollup.transaction_type == TransactionType.EXPENSE,
+                TransactionRollup.month == start.date(),
             )
         )
-        .group_by(Transaction.category)
-        .order_by(func.sum(Transaction.amount).desc())
+        .group_by(TransactionRollup.category_id)
+        .order_by(func.sum(TransactionRollup.total_amount).desc())
         .limit(limit)
     )
-    return [(row[0], Decimal(row[1])) for row in db.execute(statement).all()]
+    return _named(db, user_id, db.execute(statement).all())
+
+
+def _utc_midnight(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def monthly_insight(
+    db: Session,
+    user_id: int,
+    reference: date,
+    limit: int = 5,
+    *,
+    start_at: datetime | None = None,
+) -> MonthlyInsight:
+    """Current and previous month totals plus top expense categories.
+
+    One grouped query over both months' rollups: each category row carries
+    four conditional sums (income/expense x current/previous month), so the
+    totals and the category ranking come from the same round trip.
+
+    Nothing before ``start_at`` is counted: a previous month that starts
+    earlier reports zeros, and a current month that does is summed from
+    ``transactions`` from ``start_at`` on instead of from its rollup.
+    """
+    current = reference.replace(day=1)
+    previous = (current - timedelta(days=1)).replace(day=1)
+    following = (current + timedelta(days=31)).replace(day=1)
+
+    def _sum(source, amount, transaction_type: TransactionType, *conditions):
+        return func.coalesce(func.sum(case(
+            (and_(source.transaction_type == transaction_type, *conditions), amount),
+            else_=0,
+        )), 0)
+
+    if start_at is None or start_at <= _utc_midnight(current):
+        months = [current]
+        if start_at is None or start_at <= _utc_midnight(previous):
+            months.append(previous)
+        statement = (
+            select(TransactionRollup.category_id, *(
+                _sum(TransactionRollup, TransactionRollup.total_amount, transaction_type,
+                     TransactionRollup.month == month)
+                for month in (current, previous)
+                for transaction_type in (TransactionType.INCOME, TransactionType.EXPENSE)
+            ))
+            .where(
+                TransactionRollup.user_id == user_id,
+                TransactionRollup.month.in_(months),
+            )
+            .group_by(TransactionRollup.category_id)
+        )
+    else:
+        statement = (
+            select(
+                Transaction.category_id,
+                _sum(Transaction, Transaction.amount_base, TransactionType.INCOME),
+                _sum(Transaction, Transaction.amount_base, TransactionType.EXPENSE),
+                literal(0),
+                literal(0),
+            )
+            .where(
+                Transaction.user_id == user_id,
+                Transaction.occurred_at >= start_at,
+                Transaction.occurred_at < _utc_midnight(following),
+            )
+            .group_by(Transaction.category_id)
+        )
+
+    total_income = total_expense = prev_income = prev_expense = Decimal("0")
+    expenses: list[tuple[int, Decimal]] = []
+    for category_id, income, expense, old_income, old_expense in db.execute(statement):
+        total_income += Decimal(income)
+        total_expense += Decimal(expense)
+        prev_income += Decimal(old_income)
+        prev_expense += Decimal(old_expense)
+        if expense:
+            expenses.append((category_id, Decimal(expense)))
+    expenses.sort(key=lambda item: item[1], reverse=True)
+    top_expenses = _named(db, user_id, expenses[:limit])
+
+    return MonthlyInsight(
+        month=reference.strftime("%Y-%m"),
+        total_income=total_income,
+        total_expense=total_expense,
+        balance=total_income - total_expense,
+        top_expense_categories=[
+            CategoryBreakdown(category=category, amount=amount)
+            for category, amount in top_expenses
+        ],
+        prev_total_income=prev_income,
+        prev_total_expense=prev_expense,
+        carryover=prev_income - prev_expense,
+    )
 
 
 def all_time_summary(db: Session, user_id: int) -> tuple[Decimal, Decimal]:
     """Get total income and expenses for all time."""
     statement = (
-        select(Transaction.transaction_type, func.coalesce(
-            func.sum(Transaction.amount), 0))
-        .where(Transaction.user_id == user_id)
-        .group_by(Transaction.transaction_type)
+        select(TransactionRollup.transaction_type, func.coalesce(
+            func.sum(TransactionRollup.total_amount), 0))
+        .where(TransactionRollup.user_id == user_id)
+        .group_by(TransactionRollup.transaction_type)
     )
     totals = {row[0]: Decimal(row[1]) for row in db.execute(statement)}
     total_income = totals.get(TransactionType.INCOME, Decimal("0"))
@@ -175,58 +570,210 @@ def all_time_expense_categories(
 ) -> list[tuple[str, Decimal]]:
     """Get top expense categories for all time."""
     statement = (
-        select(Transaction.category, func.coalesce(
-            func.sum(Transaction.amount), 0))
+        select(TransactionRollup.category_id, func.coalesce(
+            func.sum(TransactionRollup.total_amount), 0))
         .where(
             and_(
-                Transaction.user_id == user_id,
-                Transaction.transaction_type == TransactionType.EXPENSE,
+                TransactionRollup.user_id == user_id,
+                TransactionRollup.transaction_type == TransactionType.EXPENSE,
             )
         )
-        .group_by(Transaction.category)
-        .order_by(func.sum(Transaction.amount).desc())
+        .group_by(TransactionRollup.category_id)
+        .order_by(func.sum(TransactionRollup.total_amount).desc())
         .limit(limit)
     )
-    return [(row[0], Decimal(row[1])) for row in db.execute(statement).all()]
+    return _named(db, user_id, db.execute(statement).all())
 
 
 def monthly_breakdown(db: Session, user_id: int, months: int = 6) -> list[dict]:
-    """Get income/expense summary for the last N months."""
-    from datetime import timedelta
-    from calendar import monthrange
+    """Get income/expense summary for the last N months, newest first.
 
-    results = []
+    One GROUP BY over the rollup rows covers the whole horizon; months
+    without activity are filled with zeros here.
+    """
+    months = max(months, 1)
     now = datetime.now(timezone.utc)
-
+    labels = []
     for i in range(months):
-        # Calculate month offset
-        year = now.year
-        month = now.month - i
-        while month <= 0:
-            month += 12
-            year -= 1
-
-        ref_date = now.replace(year=year, month=month, day=1)
-        start, end = month_bounds(ref_date)
+        year, month = divmod(now.year * 12 + now.month - 1 - i, 12)
+        labels.append(date(year, month + 1, 1))
 
-        statement = (
-            select(Transaction.transaction_type, func.coalesce(
-                func.sum(Transaction.amount), 0))
-            .where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.occurred_at >= start,
-                    Transaction.occurred_at < end,
-                )
+    statement = (
+        select(TransactionRollup.month, TransactionRollup.transaction_type, func.coalesce(
+            func.sum(TransactionRollup.total_amount), 0))
+        .where(
+            and_(
+                TransactionRollup.user_id == user_id,
+                TransactionRollup.month >= labels[-1],
+                TransactionRollup.month <= labels[0],
             )
-            .group_by(Transaction.transaction_type)
         )
-        totals = {row[0]: Decimal(row[1]) for row in db.execute(statement)}
+        .group_by(TransactionRollup.month, TransactionRollup.transaction_type)
+    )
+    totals: dict[date, dict[TransactionType, Decimal]] = {}
+    for month_start, transaction_type, amount in db.execute(statement):
+        totals.setdefault(month_start, {})[transaction_type] = Decimal(amount)
+
+    return [
+        {
+            "month": label.strftime("%Y-%m"),
+            "income": totals.get(label, {}).get(TransactionType.INCOME, Decimal("0")),
+            "expense": totals.get(label, {}).get(TransactionType.EXPENSE, Decimal("0")),
+        }
+        for label in labels
+    ]
+
+
+SERIES_BUCKETS = {
+    "day": day_bucket,
+    "week": week_bucket,
+    "month": month_bucket,
+    "year": year_bucket,
+}
+# Buckets covered when no start date is given.
+DEFAULT_SERIES_SPAN = {"day": 30, "week": 12, "month": 12, "year": 5}
+MAX_SERIES_POINTS = 1000
+
+
+def bucket_start(value: date, granularity: str) -> date:
+    if granularity == "day":
+        return value
+    if granularity == "week":
+        return value - timedelta(days=value.weekday())
+    if granularity == "month":
+        return value.replace(day=1)
+    return value.replace(month=1, day=1)
+
+
+def _shift_bucket(start: date, granularity: str, steps: int = 1) -> date:
+    if granularity == "day":
+        return start + timedelta(days=steps)
+    if granularity == "week":
+        return start + timedelta(weeks=steps)
+    if granularity == "month":
+        year, month = divmod(start.year * 12 + start.month - 1 + steps, 12)
+        return date(year, month + 1, 1)
+    return date(start.year + steps, 1, 1)
+
+
+def _bucket_from_label(label: str) -> date:
+    """Parse a ``day_bucket``/``week_bucket``/``month_bucket``/``year_bucket`` label."""
+    return date.fromisoformat(label + "-01" * (2 - label.count("-")))
+
+
+def default_series_start(end: date, granularity: str) -> date:
+    """First day of the default range: ``DEFAULT_SERIES_SPAN`` buckets up to ``end``."""
+    return _shift_bucket(bucket_start(end, granularity), granularity,
+                         1 - DEFAULT_SERIES_SPAN[granularity])
+
+
+def time_series(
+    db: Session,
+    user_id: int,
+    *,
+    granularity: str,
+    start: date | None = None,
+    end: date | None = None,
+    group_by: str = "type",
+    transaction_type: TransactionType | None = None,
+    start_at: datetime | None = None,
+) -> TimeSeriesResponse:
+    """Dense per-bucket totals between ``start`` and ``end`` (both inclusive).
+
+    The range is widened to whole buckets. Month and year series are summed
+    from the monthly rollups; day and week series group ``transactions``
+    directly. Either way it is one GROUP BY, and empty buckets are filled with
+    zeros here.
+
+    Nothing before ``start_at`` is counted, so the first bucket may be
+    partial; whatever part of a month it still covers is then grouped from
+    ``transactions`` in a second query, and ``start`` in the response is the
+    first day actually read.
+    """
+    end = end or date.today()
+    if start is None:
+        start = default_series_start(end, granularity)
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="start must not be after end")
+
+    buckets = [bucket_start(start, granularity)]
+    while (following := _shift_bucket(buckets[-1], granularity)) <= end:
+        buckets.append(following)
+        if len(buckets) > MAX_SERIES_POINTS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Range spans more than {MAX_SERIES_POINTS} {granularity} buckets",
+            )
+    since = _utc_midnight(buckets[0])
+    if start_at is not None and start_at > since:
+        since = start_at
 
-        results.append({
-            "month": ref_date.strftime("%Y-%m"),
-            "income": totals.get(TransactionType.INCOME, Decimal("0")),
-            "expense": totals.get(TransactionType.EXPENSE, Decimal("0")),
-        })
+    bucket_of = SERIES_BUCKETS[granularity]
+
+    def _grouped(source, amount, count, *in_range) -> Select:
+        group = source.category_id if group_by == "category" else source.transaction_type
+        bucket = bucket_of(source.month if source is TransactionRollup else source.occurred_at)
+        statement = (
+            select(bucket, group, amount, count)
+            .where(source.user_id == user_id, *in_range)
+            .group_by(bucket, group)
+        )
+        if transaction_type:
+            statement = statement.where(source.transaction_type == transaction_type)
+        return statement
+
+    def _from_transactions(until: datetime) -> Select:
+        return _grouped(
+            Transaction,
+            func.sum(Transaction.amount_base),
+            func.count(Transaction.id),
+            Transaction.occurred_at >= since,
+            Transaction.occurred_at < until,
+        )
 
-    return results
+    if granularity in ("month", "year"):
+        whole_months = bucket_start(since.date(), "month")
+        if _utc_midnight(whole_months) < since:
+            whole_months = _shift_bucket(whole_months, "month")
+        statements = [_grouped(
+            TransactionRollup,
+            func.sum(TransactionRollup.total_amount),
+            func.sum(TransactionRollup.transaction_count),
+            TransactionRollup.month >= whole_months,
+            TransactionRollup.month < following,
+        )]
+        if _utc_midnight(whole_months) > since:
+            statements.append(_from_transactions(_utc_midnight(whole_months)))
+    else:
+        statements = [_from_transactions(_utc_midnight(following))]
+
+    values: dict[Any, dict[date, tuple[Decimal, int]]] = {}
+    for statement in statements:
+        for label, key, total, rows in db.execute(statement):
+            if isinstance(key, TransactionType):
+                key = key.value
+            by_bucket = values.setdefault(key, {})
+            period = _bucket_from_label(label)
+            previous_total, previous_rows = by_bucket.get(period, (Decimal("0"), 0))
+            by_bucket[period] = (previous_total + Decimal(total), previous_rows + int(rows))
+    if group_by == "category":
+        names = category_service.names_by_id(db, user_id, values)
+        values = {names[category_id]: by_bucket for category_id, by_bucket in values.items()}
+
+    def _points(by_bucket: dict[date, tuple[Decimal, int]]) -> list[SeriesPoint]:
+        points = []
+        for period in buckets:
+            total, rows = by_bucket.get(period, (Decimal("0.00"), 0))
+            points.append(SeriesPoint(
+                period_start=period, amount=total, count=rows))
+        return points
+
+    return TimeSeriesResponse(
+        granularity=granularity,
+        group_by=group_by,
+        start=since.date(),
+        end=following - timedelta(days=1),
+        series=[Series(key=key, points=_points(by_bucket))
+                for key, by_bucket in sorted(values.items())],
+    )
@@ -1,12 +1,17 @@
-from datetime import datetime, timedelta, timezone
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
 
-from sqlalchemy import select
+from sqlalchemy import event, select
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.security import get_password_hash, verify_password
 from app.models import User
 from app.schemas.user import AdminUserUpdate, UserCreate, UserUpdate
+from app.services import last_login_service
 
 
 TIER_RANK: dict[str, int] = {
@@ -55,15 +60,124 @@ def user_has_min_tier(user: User, min_tier: str) -> bool:
     return user_rank >= required_rank
 
 
-def get_tier_limits_for_user(user: User) -> dict[str, int | None]:
+def get_tier_limits_for_user(user: "User | UserSnapshot") -> dict[str, int | None]:
     tier = normalize_subscription_tier(user.subscription_tier)
     return TIER_LIMITS[tier]
 
 
+def transaction_page_limit(user: "User | UserSnapshot", limit: int) -> int:
+    """``limit`` capped at the tier's page size."""
+    cap = get_tier_limits_for_user(user)["max_transaction_page_limit"]
+    return limit if cap is None else min(limit, cap)
+
+
+def transaction_history_start(user: "User | UserSnapshot", start_at: datetime | None) -> datetime | None:
+    """``start_at`` moved forward to the oldest day the tier may read.
+
+    The window starts at midnight UTC, so it only moves once a day.
+    """
+    days = get_tier_limits_for_user(user)["max_transaction_history_days"]
+    if days is None:
+        return start_at
+    first_day = datetime.now(timezone.utc).date() - timedelta(days=days)
+    earliest = datetime(first_day.year, first_day.month, first_day.day, tzinfo=timezone.utc)
+    if start_at is None:
+        return earliest
+    if start_at.tzinfo is None:
+        start_at = start_at.replace(tzinfo=timezone.utc)
+    return max(start_at, earliest)
+
+
+def transaction_history_first_day(user: "User | UserSnapshot", day: date) -> date:
+    """``day`` moved forward to the oldest day the tier may read."""
+    earliest = transaction_history_start(user, None)
+    return day if earliest is None else max(day, earliest.date())
+
+
 def get(db: Session, user_id: int) -> User | None:
     return db.get(User, user_id)
 
 
+@dataclass(frozen=True, slots=True)
+class UserSnapshot:
+    """The caller as most endpoints need it, served from a per-process cache.
+
+    Data versions are deliberately left out: ETags must see every committed
+    bump, so they are read with ``data_version_service.current``.
+    """
+
+    id: int
+    role: str
+    subscription_tier: str
+    currency: str
+    is_banned: bool
+
+
+# Session.info key: user ids whose snapshot goes stale when the session commits.
+_INVALIDATED = "invalidated_user_snapshots"
+
+_snapshots: OrderedDict[int, tuple[float, UserSnapshot]] = OrderedDict()
+_snapshots_lock = threading.Lock()
+# Bumped by every invalidation; a load that raced one is not cached.
+_snapshots_generation = 0
+
+
+def get_snapshot(db: Session, user_id: int) -> UserSnapshot | None:
+    """Snapshot of ``user_id``; cached for ``USER_SNAPSHOT_TTL_SECONDS``.
+
+    Changes made in this process are seen as soon as they commit; changes
+    made by other workers within the TTL.
+    """
+    now = time.monotonic()
+    with _snapshots_lock:
+        cached = _snapshots.get(user_id)
+        if cached is not None and cached[0] > now:
+            _snapshots.move_to_end(user_id)
+            return cached[1]
+        generation = _snapshots_generation
+
+    row = db.execute(
+        select(User.id, User.role, User.subscription_tier, User.currency, User.is_banned)
+        .where(User.id == user_id)
+    ).one_or_none()
+    if row is None:
+        return None
+    snapshot = UserSnapshot(*row)
+    with _snapshots_lock:
+        if generation == _snapshots_generation:
+            _snapshots[user_id] = (now + settings.USER_SNAPSHOT_TTL_SECONDS, snapshot)
+            _snapshots.move_to_end(user_id)
+            while len(_snapshots) > settings.USER_SNAPSHOT_CACHE_SIZE:
+                _snapshots.popitem(last=False)
+    return snapshot
+
+
+def invalidate_snapshot(db: Session, user_id: int) -> None:
+    """Drop the cached snapshot of ``user_id`` once ``db`` commits."""
+    db.info.setdefault(_INVALIDATED, set()).add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_invalidated(session: Session) -> None:
+    global _snapshots_generation
+    if session.in_nested_transaction():
+        return  # released savepoint; wait for the outer commit
+    user_ids = session.info.pop(_INVALIDATED, None)
+    if not user_ids:
+        return
+    with _snapshots_lock:
+        _snapshots_generation += 1
+        for user_id in user_ids:
+            _snapshots.pop(user_id, None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidated(session: Session) -> None:
+    if session.in_nested_transaction():
+        return
+    session.info.pop(_INVALIDATED, None)
+
+
 def get_by_email(db: Session, email: str) -> User | None:
     statement = select(User).where(User.email == email)
     return db.scalars(statement).first()
@@ -103,37 +217,43 @@ def is_user_locked(user: User) -> bool:
     return user.locked_until > datetime.now(timezone.utc)
 
 
-def register_failed_login(db: Session, user: User) -> User:
-    now = datetime.now(timezone.utc)
+def _register_failed_login(user: User, now: datetime) -> None:
     user.failed_login_attempts = (user.failed_login_attempts or 0) + 1
     user.last_failed_login_at = now
     if user.failed_login_attempts >= settings.AUTH_MAX_FAILED_ATTEMPTS:
         user.locked_until = now + \
             timedelta(minutes=settings.AUTH_LOCKOUT_MINUTES)
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
 
 
-def reset_login_failures(db: Session, user: User) -> User:
+def _reset_login_failures(user: User) -> bool:
     if not user.failed_login_attempts and user.locked_until is None:
-        return user
+        return False
     user.failed_login_attempts = 0
     user.last_failed_login_at = None
     user.locked_until = None
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
+    return True
 
 
-def register_successful_login(db: Session, user: User) -> User:
-    user.last_login_at = datetime.now(timezone.utc)
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
+def check_login(db: Session, user: User | None, password: str) -> bool:
+    """Verify ``password`` for an already loaded ``user`` and record the outcome.
+
+    Every outcome is applied in at most one commit. A success without earlier
+    failures commits nothing: ``last_login_at`` is handed to
+    ``last_login_service`` and written with the next batch.
+    """
+    if user is None:
+        return False
+    now = datetime.now(timezone.utc)
+    if not verify_password(password, user.hashed_password):
+        _register_failed_login(user, now)
+        db.commit()
+        return False
+    if _reset_login_failures(user):
+        user.last_login_at = now  # committing anyway
+        db.commit()
+    else:
+        last_login_service.record(user.id, now)
+    return True
 
 
 def update(db: Session, user: User, user_in: UserUpdate) -> User:
@@ -143,6 +263,7 @@ def update(db: Session, user: User, user_in: UserUpdate) -> User:
     for field, value in update_data.items():
         setattr(user, field, value)
     db.add(user)
+    invalidate_snapshot(db, user.id)
     db.commit()
     db.refresh(user)
     return user
@@ -164,6 +285,13 @@ def update_admin_fields(db: Session, user: User, user_in: AdminUserUpdate) -> Us
     for field, value in update_data.items():
         setattr(user, field, value)
     db.add(user)
+    invalidate_snapshot(db, user.id)
     db.commit()
     db.refresh(user)
     return user
+
+
+def delete(db: Session, user: User) -> None:
+    invalidate_snapshot(db, user.id)
+    db.delete(user)
+    db.commit()
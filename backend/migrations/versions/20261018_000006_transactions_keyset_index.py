@@ -0,0 +1,41 @@
+"""composite index for keyset pagination of transactions
+
+Revision ID: 20261018_000006
+Revises: 20260320_000005
+Create Date: 2026-10-18 09:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_000006"
+down_revision = "20260320_000005"
+branch_labels = None
+depends_on = None
+
+
+def _has_index(inspector, table_name: str, index_name: str) -> bool:
+    return any(index["name"] == index_name for index in inspector.get_indexes(table_name))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if not _has_index(inspector, "transactions", "ix_transactions_user_occurred_id"):
+        op.create_index(
+            "ix_transactions_user_occurred_id",
+            "transactions",
+            ["user_id", "occurred_at", "id"],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if _has_index(inspector, "transactions", "ix_transactions_user_occurred_id"):
+        op.drop_index("ix_transactions_user_occurred_id",
+                      table_name="transactions")
@@ -0,0 +1,45 @@
+"""covering indexes for transaction aggregates
+
+Revision ID: 20261018_000007
+Revises: 20261018_000006
+Create Date: 2026-10-18 10:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_000007"
+down_revision = "20261018_000006"
+branch_labels = None
+depends_on = None
+
+# (user_id, occurred_at) is already served by ix_transactions_user_occurred_id.
+_INDEXES: dict[str, list[str]] = {
+    "ix_transactions_user_occurred_type_amount": [
+        "user_id", "occurred_at", "transaction_type", "amount"],
+    "ix_transactions_user_type_occurred_category_amount": [
+        "user_id", "transaction_type", "occurred_at", "category", "amount"],
+}
+
+
+def _has_index(inspector, table_name: str, index_name: str) -> bool:
+    return any(index["name"] == index_name for index in inspector.get_indexes(table_name))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    for name, columns in _INDEXES.items():
+        if not _has_index(inspector, "transactions", name):
+            op.create_index(name, "transactions", columns, unique=False)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    for name in reversed(list(_INDEXES)):
+        if _has_index(inspector, "transactions", name):
+            op.drop_index(name, table_name="transactions")
@@ -0,0 +1,66 @@
+"""monthly transaction rollups
+
+Revision ID: 20261018_000008
+Revises: 20261018_000007
+Create Date: 2026-10-18 11:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_000008"
+down_revision = "20261018_000007"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(inspector, table_name: str) -> bool:
+    return table_name in inspector.get_table_names()
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if _has_table(inspector, "transaction_rollups"):
+        return
+
+    op.create_table(
+        "transaction_rollups",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("transaction_type", sa.Enum("INCOME", "EXPENSE", "TRANSFER",
+                  name="transactiontype", native_enum=False, length=16), nullable=False),
+        sa.Column("category", sa.String(length=64), nullable=False),
+        sa.Column("total_amount", sa.Numeric(precision=16, scale=2),
+                  nullable=False, server_default=sa.text("0")),
+        sa.Column("transaction_count", sa.Integer(),
+                  nullable=False, server_default=sa.text("0")),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint(
+            "user_id", "month", "transaction_type", "category"),
+    )
+
+    if bind.dialect.name == "mysql":
+        month_start = "DATE_FORMAT(occurred_at, '%Y-%m-01')"
+    else:
+        month_start = "date(occurred_at, 'start of month')"
+
+    op.execute(
+        f"""
+        INSERT INTO transaction_rollups
+            (user_id, month, transaction_type, category, total_amount, transaction_count)
+        SELECT user_id, {month_start}, transaction_type, category, SUM(amount), COUNT(id)
+        FROM transactions
+        GROUP BY user_id, {month_start}, transaction_type, category
+        """
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if _has_table(inspector, "transaction_rollups"):
+        op.drop_table("transaction_rollups")
@@ -0,0 +1,48 @@
+"""per-user data version counters for ETags
+
+Revision ID: 20261018_000009
+Revises: 20261018_000008
+Create Date: 2026-10-18 13:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_000009"
+down_revision = "20261018_000008"
+branch_labels = None
+depends_on = None
+
+_COLUMNS = (
+    "transactions_version",
+    "budgets_version",
+    "savings_goals_version",
+    "advice_version",
+)
+
+
+def _has_column(inspector, table_name: str, column_name: str) -> bool:
+    return any(column["name"] == column_name for column in inspector.get_columns(table_name))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    for column_name in _COLUMNS:
+        if not _has_column(inspector, "users", column_name):
+            op.add_column(
+                "users",
+                sa.Column(column_name, sa.Integer(),
+                          nullable=False, server_default=sa.text("0")),
+            )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    for column_name in reversed(_COLUMNS):
+        if _has_column(inspector, "users", column_name):
+            op.drop_column("users", column_name)
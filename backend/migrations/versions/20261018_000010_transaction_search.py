@@ -0,0 +1,71 @@
+"""full-text search index on transaction category and note
+
+Revision ID: 20261018_000010
+Revises: 20261018_000009
+Create Date: 2026-10-18 15:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_000010"
+down_revision = "20261018_000009"
+branch_labels = None
+depends_on = None
+
+_FTS_TABLE = "transactions_fts"
+
+_SQLITE_DDL = (
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {_FTS_TABLE} USING fts5(
+        category, note,
+        content='transactions', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE}_ai AFTER INSERT ON transactions BEGIN
+        INSERT INTO {_FTS_TABLE}(rowid, category, note) VALUES (new.id, new.category, new.note);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE}_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO {_FTS_TABLE}({_FTS_TABLE}, rowid, category, note)
+        VALUES ('delete', old.id, old.category, old.note);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE}_au AFTER UPDATE OF category, note ON transactions BEGIN
+        INSERT INTO {_FTS_TABLE}({_FTS_TABLE}, rowid, category, note)
+        VALUES ('delete', old.id, old.category, old.note);
+        INSERT INTO {_FTS_TABLE}(rowid, category, note) VALUES (new.id, new.category, new.note);
+    END""",
+)
+
+
+def _has_index(inspector, table_name: str, index_name: str) -> bool:
+    return any(index["name"] == index_name for index in inspector.get_indexes(table_name))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if bind.dialect.name == "mysql":
+        if not _has_index(inspector, "transactions", "ix_transactions_search"):
+            op.create_index("ix_transactions_search", "transactions",
+                            ["category", "note"], mysql_prefix="FULLTEXT")
+        return
+
+    for statement in _SQLITE_DDL:
+        op.execute(statement)
+    # Index the rows that already exist.
+    op.execute(f"INSERT INTO {_FTS_TABLE}({_FTS_TABLE}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if bind.dialect.name == "mysql":
+        if _has_index(inspector, "transactions", "ix_transactions_search"):
+            op.drop_index("ix_transactions_search", table_name="transactions")
+        return
+
+    for suffix in ("au", "ad", "ai"):
+        op.execute(f"DROP TRIGGER IF EXISTS {_FTS_TABLE}_{suffix}")
+    op.execute(f"DROP TABLE IF EXISTS {_FTS_TABLE}")
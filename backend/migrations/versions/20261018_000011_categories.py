@@ -0,0 +1,256 @@
+"""per-user categories table referenced by id
+
+Revision ID: 20261018_000011
+Revises: 20261018_000010
+Create Date: 2026-10-18 16:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_000011"
+down_revision = "20261018_000010"
+branch_labels = None
+depends_on = None
+
+_AGGREGATE_INDEX = "ix_transactions_user_type_occurred_category_amount"
+_CATEGORY_TABLES = ("transactions", "budget_goals")
+
+# Search DDL as of this revision, frozen here so later edits to the live
+# schema in app.models.transaction_search do not change this migration.
+_FTS_TABLE = "transactions_fts"
+_CATEGORY_NAME = "(SELECT name FROM categories WHERE id = {row}.category_id)"
+
+# Contentless: the indexed category text lives in ``categories``.
+_SQLITE_SEARCH_DDL = (
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {_FTS_TABLE} USING fts5(
+        category, note,
+        content='',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE}_ai AFTER INSERT ON transactions BEGIN
+        INSERT INTO {_FTS_TABLE}(rowid, category, note)
+        VALUES (new.id, {_CATEGORY_NAME.format(row="new")}, new.note);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE}_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO {_FTS_TABLE}({_FTS_TABLE}, rowid, category, note)
+        VALUES ('delete', old.id, {_CATEGORY_NAME.format(row="old")}, old.note);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE}_au AFTER UPDATE OF category_id, note ON transactions BEGIN
+        INSERT INTO {_FTS_TABLE}({_FTS_TABLE}, rowid, category, note)
+        VALUES ('delete', old.id, {_CATEGORY_NAME.format(row="old")}, old.note);
+        INSERT INTO {_FTS_TABLE}(rowid, category, note)
+        VALUES (new.id, {_CATEGORY_NAME.format(row="new")}, new.note);
+    END""",
+    f"""INSERT INTO {_FTS_TABLE}(rowid, category, note)
+        SELECT transactions.id, categories.name, transactions.note
+        FROM transactions JOIN categories ON categories.id = transactions.category_id""",
+)
+
+# Revision 000010's external-content table over ``transactions.category``.
+_LEGACY_SEARCH_DDL = (
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {_FTS_TABLE} USING fts5(
+        category, note,
+        content='transactions', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE}_ai AFTER INSERT ON transactions BEGIN
+        INSERT INTO {_FTS_TABLE}(rowid, category, note) VALUES (new.id, new.category, new.note);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE}_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO {_FTS_TABLE}({_FTS_TABLE}, rowid, category, note)
+        VALUES ('delete', old.id, old.category, old.note);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE}_au AFTER UPDATE OF category, note ON transactions BEGIN
+        INSERT INTO {_FTS_TABLE}({_FTS_TABLE}, rowid, category, note)
+        VALUES ('delete', old.id, old.category, old.note);
+        INSERT INTO {_FTS_TABLE}(rowid, category, note) VALUES (new.id, new.category, new.note);
+    END""",
+    f"INSERT INTO {_FTS_TABLE}({_FTS_TABLE}) VALUES ('rebuild')",
+)
+
+
+def _has_table(inspector, table_name: str) -> bool:
+    return table_name in inspector.get_table_names()
+
+
+def _has_column(inspector, table_name: str, column_name: str) -> bool:
+    return any(column["name"] == column_name for column in inspector.get_columns(table_name))
+
+
+def _has_index(inspector, table_name: str, index_name: str) -> bool:
+    return any(index["name"] == index_name for index in inspector.get_indexes(table_name))
+
+
+def _drop_sqlite_search() -> None:
+    for suffix in ("au", "ad", "ai"):
+        op.execute(f"DROP TRIGGER IF EXISTS {_FTS_TABLE}_{suffix}")
+    op.execute(f"DROP TABLE IF EXISTS {_FTS_TABLE}")
+
+
+def _month_start(dialect: str) -> str:
+    if dialect == "mysql":
+        return "DATE_FORMAT(occurred_at, '%Y-%m-01')"
+    return "date(occurred_at, 'start of month')"
+
+
+def _create_rollups(category_column: sa.Column, dialect: str) -> None:
+    """(Re)create transaction_rollups keyed by ``category_column`` and refill it."""
+    op.create_table(
+        "transaction_rollups",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("transaction_type", sa.Enum("INCOME", "EXPENSE", "TRANSFER",
+                  name="transactiontype", native_enum=False, length=16), nullable=False),
+        category_column,
+        sa.Column("total_amount", sa.Numeric(precision=16, scale=2),
+                  nullable=False, server_default=sa.text("0")),
+        sa.Column("transaction_count", sa.Integer(),
+                  nullable=False, server_default=sa.text("0")),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint(
+            "user_id", "month", "transaction_type", category_column.name),
+    )
+    month_start = _month_start(dialect)
+    category = category_column.name
+    op.execute(
+        f"""
+        INSERT INTO transaction_rollups
+            (user_id, month, transaction_type, {category}, total_amount, transaction_count)
+        SELECT user_id, {month_start}, transaction_type, {category}, SUM(amount), COUNT(id)
+        FROM transactions
+        GROUP BY user_id, {month_start}, transaction_type, {category}
+        """
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    dialect = bind.dialect.name
+    inspector = sa.inspect(bind)
+
+    if not _has_column(inspector, "transactions", "category"):
+        return
+
+    if not _has_table(inspector, "categories"):
+        op.create_table(
+            "categories",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("name", sa.String(length=64), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True),
+                      server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
+            sa.ForeignKeyConstraint(
+                ["user_id"], ["users.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("user_id", "name",
+                                name="uq_categories_user_name"),
+        )
+
+    op.execute(
+        """
+        INSERT INTO categories (user_id, name)
+        SELECT user_id, category FROM transactions
+        UNION
+        SELECT user_id, category FROM budget_goals
+        """
+    )
+
+    # Search first: both the SQLite triggers and the MySQL FULLTEXT index
+    # reference the column that is about to go.
+    if dialect == "mysql":
+        if _has_index(inspector, "transactions", "ix_transactions_search"):
+            op.drop_index("ix_transactions_search", table_name="transactions")
+    else:
+        _drop_sqlite_search()
+    if _has_index(inspector, "transactions", _AGGREGATE_INDEX):
+        op.drop_index(_AGGREGATE_INDEX, table_name="transactions")
+
+    for table_name in _CATEGORY_TABLES:
+        op.add_column(table_name, sa.Column(
+            "category_id", sa.Integer(), nullable=True))
+        op.execute(
+            f"""
+            UPDATE {table_name} SET category_id = (
+                SELECT categories.id FROM categories
+                WHERE categories.user_id = {table_name}.user_id
+                  AND categories.name = {table_name}.category
+            )
+            """
+        )
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column("category")
+            batch_op.alter_column(
+                "category_id", existing_type=sa.Integer(), nullable=False)
+            batch_op.create_foreign_key(
+                f"fk_{table_name}_category_id_categories", "categories", ["category_id"], ["id"])
+
+    op.create_index(_AGGREGATE_INDEX, "transactions", [
+                    "user_id", "transaction_type", "occurred_at", "category_id", "amount"])
+
+    if _has_table(inspector, "transaction_rollups"):
+        op.drop_table("transaction_rollups")
+    _create_rollups(sa.Column("category_id", sa.Integer(),
+                    nullable=False), dialect)
+
+    if dialect == "mysql":
+        op.create_index("ix_transactions_search", "transactions",
+                        ["note"], mysql_prefix="FULLTEXT")
+        op.create_index("ix_categories_search", "categories",
+                        ["name"], mysql_prefix="FULLTEXT")
+    else:
+        for statement in _SQLITE_SEARCH_DDL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    dialect = bind.dialect.name
+    inspector = sa.inspect(bind)
+
+    if not _has_column(inspector, "transactions", "category_id"):
+        return
+
+    if dialect == "mysql":
+        if _has_index(inspector, "transactions", "ix_transactions_search"):
+            op.drop_index("ix_transactions_search", table_name="transactions")
+    else:
+        _drop_sqlite_search()
+    if _has_index(inspector, "transactions", _AGGREGATE_INDEX):
+        op.drop_index(_AGGREGATE_INDEX, table_name="transactions")
+
+    for table_name in _CATEGORY_TABLES:
+        op.add_column(table_name, sa.Column(
+            "category", sa.String(length=64), nullable=True))
+        op.execute(
+            f"""
+            UPDATE {table_name} SET category = (
+                SELECT categories.name FROM categories
+                WHERE categories.id = {table_name}.category_id
+            )
+            """
+        )
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_constraint(
+                f"fk_{table_name}_category_id_categories", type_="foreignkey")
+            batch_op.drop_column("category_id")
+            batch_op.alter_column(
+                "category", existing_type=sa.String(length=64), nullable=False)
+
+    op.create_index(_AGGREGATE_INDEX, "transactions", [
+                    "user_id", "transaction_type", "occurred_at", "category", "amount"])
+
+    if _has_table(inspector, "transaction_rollups"):
+        op.drop_table("transaction_rollups")
+    _create_rollups(sa.Column("category", sa.String(
+        length=64), nullable=False), dialect)
+
+    if dialect == "mysql":
+        op.create_index("ix_transactions_search", "transactions",
+                        ["category", "note"], mysql_prefix="FULLTEXT")
+    else:
+        for statement in _LEGACY_SEARCH_DDL:
+            op.execute(statement)
+
+    op.drop_table("categories")
@@ -0,0 +1,180 @@
+"""amount in the owner's currency on every transaction
+
+Revision ID: 20261018_000012
+Revises: 20261018_000011
+Create Date: 2026-10-18 17:00:00
+"""
+
+from decimal import Decimal, ROUND_HALF_UP
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_000012"
+down_revision = "20261018_000011"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+# Rates relative to EUR as shipped in currency_service at this revision;
+# frozen here so the backfill does not change when the live rates do.
+_RATES = {
+    "EUR": Decimal("1.0"), "USD": Decimal("1.08"), "MKD": Decimal("61.5"),
+    "GBP": Decimal("0.86"), "CHF": Decimal("0.95"), "JPY": Decimal("160.0"),
+    "CAD": Decimal("1.45"), "AUD": Decimal("1.65"), "CNY": Decimal("7.8"),
+    "SEK": Decimal("11.5"), "NOK": Decimal("11.8"), "DKK": Decimal("7.45"),
+    "PLN": Decimal("4.3"), "CZK": Decimal("24.5"), "HUF": Decimal("380.0"),
+    "RON": Decimal("4.97"), "BGN": Decimal("1.9558"), "HRK": Decimal("7.5345"),
+    "TRY": Decimal("32.0"), "RUB": Decimal("90.0"), "BRL": Decimal("5.5"),
+    "MXN": Decimal("18.5"), "ARS": Decimal("950.0"), "ZAR": Decimal("20.0"),
+    "INR": Decimal("90.0"),
+}
+
+_FTS_TABLE = "transactions_fts"
+_CATEGORY_NAME = "(SELECT name FROM categories WHERE id = {row}.category_id)"
+
+# Recreating ``transactions`` (SQLite batch mode) drops its triggers, so the
+# search triggers from revision 000011 are put back afterwards.
+_SQLITE_SEARCH_TRIGGERS = (
+    f"""CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE}_ai AFTER INSERT ON transactions BEGIN
+        INSERT INTO {_FTS_TABLE}(rowid, category, note)
+        VALUES (new.id, {_CATEGORY_NAME.format(row="new")}, new.note);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE}_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO {_FTS_TABLE}({_FTS_TABLE}, rowid, category, note)
+        VALUES ('delete', old.id, {_CATEGORY_NAME.format(row="old")}, old.note);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE}_au AFTER UPDATE OF category_id, note ON transactions BEGIN
+        INSERT INTO {_FTS_TABLE}({_FTS_TABLE}, rowid, category, note)
+        VALUES ('delete', old.id, {_CATEGORY_NAME.format(row="old")}, old.note);
+        INSERT INTO {_FTS_TABLE}(rowid, category, note)
+        VALUES (new.id, {_CATEGORY_NAME.format(row="new")}, new.note);
+    END""",
+)
+
+_INDEXES = {
+    "ix_transactions_user_occurred_type_amount": [
+        "user_id", "occurred_at", "transaction_type", "{amount}"],
+    "ix_transactions_user_type_occurred_category_amount": [
+        "user_id", "transaction_type", "occurred_at", "category_id", "{amount}"],
+}
+
+
+def _has_column(inspector, table_name: str, column_name: str) -> bool:
+    return any(column["name"] == column_name for column in inspector.get_columns(table_name))
+
+
+def _has_index(inspector, table_name: str, index_name: str) -> bool:
+    return any(index["name"] == index_name for index in inspector.get_indexes(table_name))
+
+
+def _replace_indexes(inspector, amount_column: str) -> None:
+    for name, columns in _INDEXES.items():
+        if _has_index(inspector, "transactions", name):
+            op.drop_index(name, table_name="transactions")
+        op.create_index(name, "transactions", [
+                        column.format(amount=amount_column) for column in columns])
+
+
+def _restore_search_triggers(dialect: str) -> None:
+    if dialect == "sqlite":
+        for statement in _SQLITE_SEARCH_TRIGGERS:
+            op.execute(statement)
+
+
+def _month_start(dialect: str) -> str:
+    if dialect == "mysql":
+        return "DATE_FORMAT(occurred_at, '%Y-%m-01')"
+    return "date(occurred_at, 'start of month')"
+
+
+def _rebuild_rollups(dialect: str, amount_column: str) -> None:
+    month_start = _month_start(dialect)
+    op.execute("DELETE FROM transaction_rollups")
+    op.execute(
+        f"""
+        INSERT INTO transaction_rollups
+            (user_id, month, transaction_type, category_id, total_amount, transaction_count)
+        SELECT user_id, {month_start}, transaction_type, category_id, SUM({amount_column}), COUNT(id)
+        FROM transactions
+        GROUP BY user_id, {month_start}, transaction_type, category_id
+        """
+    )
+
+
+def _backfill(bind) -> None:
+    """Fill ``amount_base`` in primary-key ranges of ``BATCH_SIZE`` rows."""
+    pairs = bind.execute(sa.text(
+        """
+        SELECT DISTINCT transactions.currency, users.currency
+        FROM transactions JOIN users ON users.id = transactions.user_id
+        """
+    )).all()
+    low, high = bind.execute(sa.text(
+        "SELECT MIN(id), MAX(id) FROM transactions")).one()
+    if low is None:
+        return
+
+    same_currency = sa.text(
+        """
+        UPDATE transactions SET amount_base = amount
+        WHERE id BETWEEN :low AND :high
+          AND currency = (SELECT currency FROM users WHERE users.id = transactions.user_id)
+        """
+    )
+    converted = sa.text(
+        """
+        UPDATE transactions SET amount_base = ROUND(amount * :factor, 2)
+        WHERE id BETWEEN :low AND :high AND currency = :source
+          AND user_id IN (SELECT id FROM users WHERE currency = :target)
+        """
+    )
+    for start in range(low, high + 1, BATCH_SIZE):
+        bounds = {"low": start, "high": start + BATCH_SIZE - 1}
+        bind.execute(same_currency, bounds)
+        for source, target in pairs:
+            if source.upper() == target.upper():
+                continue
+            factor = (_RATES.get(target.upper(), Decimal("1.0")) /
+                      _RATES.get(source.upper(), Decimal("1.0")))
+            bind.execute(converted, {
+                **bounds,
+                "factor": str(factor.quantize(Decimal("0.0000000001"), rounding=ROUND_HALF_UP)),
+                "source": source,
+                "target": target,
+            })
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if _has_column(inspector, "transactions", "amount_base"):
+        return
+
+    op.add_column("transactions", sa.Column(
+        "amount_base", sa.Numeric(precision=14, scale=2), nullable=True))
+    _backfill(bind)
+    with op.batch_alter_table("transactions") as batch_op:
+        batch_op.alter_column(
+            "amount_base", existing_type=sa.Numeric(precision=14, scale=2), nullable=False)
+    _restore_search_triggers(bind.dialect.name)
+
+    _replace_indexes(sa.inspect(bind), "amount_base")
+    _rebuild_rollups(bind.dialect.name, "amount_base")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if not _has_column(inspector, "transactions", "amount_base"):
+        return
+
+    _replace_indexes(inspector, "amount")
+    with op.batch_alter_table("transactions") as batch_op:
+        batch_op.drop_column("amount_base")
+    _restore_search_triggers(bind.dialect.name)
+    _rebuild_rollups(bind.dialect.name, "amount")
@@ -0,0 +1,62 @@
+"""resumable currency change jobs
+
+Revision ID: 20261018_000013
+Revises: 20261018_000012
+Create Date: 2026-10-18 18:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_000013"
+down_revision = "20261018_000012"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(inspector, table_name: str) -> bool:
+    return table_name in inspector.get_table_names()
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if _has_table(inspector, "currency_change_jobs"):
+        return
+
+    op.create_table(
+        "currency_change_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("old_currency", sa.String(length=3), nullable=False),
+        sa.Column("new_currency", sa.String(length=3), nullable=False),
+        sa.Column("convert_values", sa.Boolean(), nullable=False),
+        sa.Column("status", sa.Enum("PENDING", "RUNNING", "COMPLETED", "FAILED",
+                  name="currencychangestatus", native_enum=False, length=16), nullable=False),
+        sa.Column("total_transactions", sa.Integer(), nullable=False),
+        sa.Column("processed_transactions", sa.Integer(), nullable=False),
+        sa.Column("last_transaction_id", sa.Integer(), nullable=False),
+        sa.Column("budgets_converted", sa.Integer(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True),
+                  server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True),
+                  server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_currency_change_jobs_user_id",
+                    "currency_change_jobs", ["user_id"], unique=False)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if _has_table(inspector, "currency_change_jobs"):
+        op.drop_index("ix_currency_change_jobs_user_id",
+                      table_name="currency_change_jobs")
+        op.drop_table("currency_change_jobs")
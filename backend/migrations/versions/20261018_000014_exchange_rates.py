@@ -0,0 +1,43 @@
+"""dated exchange rates
+
+Revision ID: 20261018_000014
+Revises: 20261018_000013
+Create Date: 2026-10-18 19:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_000014"
+down_revision = "20261018_000013"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(inspector, table_name: str) -> bool:
+    return table_name in inspector.get_table_names()
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if _has_table(inspector, "exchange_rates"):
+        return
+
+    op.create_table(
+        "exchange_rates",
+        sa.Column("rate_date", sa.Date(), nullable=False),
+        sa.Column("currency", sa.String(length=3), nullable=False),
+        sa.Column("rate", sa.Numeric(precision=18, scale=8), nullable=False),
+        sa.PrimaryKeyConstraint("rate_date", "currency"),
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if _has_table(inspector, "exchange_rates"):
+        op.drop_table("exchange_rates")
@@ -0,0 +1,175 @@
+"""Benchmark: LLM provider calls, per-call sync clients vs the pooled async client.
+
+Starts a stub chat-completions server on localhost that answers after
+``--delay`` seconds and counts the TCP connections it accepts. Then it fires
+``--requests`` concurrent provider calls twice:
+
+- sync: the former code path, a fresh ``httpx.Client`` per call, run in
+  the threadpool as the old sync endpoint was;
+- async: ``advice_service._groq_response`` on the pooled keep-alive
+  clients opened by the app lifespan.
+
+Meanwhile a probe times a no-op threadpool task every 10 ms. Its latency is
+what every other sync endpoint waits for a thread. The stub speaks plain
+HTTP, so TLS handshakes are not part of the numbers.
+
+Execute from backend directory:
+    python scripts/bench/bench_advice_providers.py
+    python scripts/bench/bench_advice_providers.py --requests 400 --delay 0.5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+from decimal import Decimal
+from statistics import quantiles
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))))
+
+import httpx  # noqa: E402
+from fastapi.concurrency import run_in_threadpool  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.models import User  # noqa: E402
+from app.schemas import MonthlyInsight  # noqa: E402
+from app.services import advice_service  # noqa: E402
+
+_REPLY = json.dumps({"choices": [{"message": {"content": "Spend less."}}]}).encode()
+
+
+class StubServer:
+    """Keep-alive HTTP/1.1 server answering every POST after a fixed delay."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.connections = 0
+        self.port = 0
+        self._ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    name, _, value = line.partition(b":")
+                    if name.lower() == b"content-length":
+                        length = int(value)
+                await reader.readexactly(length)
+                await asyncio.sleep(self.delay)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: %d\r\n\r\n%s" % (len(_REPLY), _REPLY))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, "127.0.0.1", 0, backlog=1024))
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+
+    def start(self) -> str:
+        threading.Thread(target=self._run, daemon=True).start()
+        self._ready.wait()
+        return f"http://127.0.0.1:{self.port}"
+
+
+def _legacy_call(url: str, payload: dict) -> str | None:
+    with httpx.Client(timeout=30.0) as client:
+        response = client.post(
+            url, headers={"Authorization": f"Bearer {settings.GROQ_API_KEY}"}, json=payload)
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"]
+
+
+def _percentile(samples: list[float], percent: int) -> float:
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return quantiles(samples, n=100, method="inclusive")[percent - 1]
+
+
+async def _measure(call, requests: int) -> dict:
+    probes: list[float] = []
+    done = asyncio.Event()
+
+    async def _probe() -> None:
+        while not done.is_set():
+            start = perf_counter()
+            await run_in_threadpool(lambda: None)
+            probes.append((perf_counter() - start) * 1000)
+            await asyncio.sleep(0.01)
+
+    prober = asyncio.create_task(_probe())
+    start = perf_counter()
+    answers = await asyncio.gather(*(call() for _ in range(requests)))
+    elapsed = perf_counter() - start
+    done.set()
+    await prober
+    return {
+        "elapsed": elapsed,
+        "ok": sum(1 for answer in answers if answer),
+        "probe_p50": _percentile(probes, 50),
+        "probe_p99": _percentile(probes, 99),
+    }
+
+
+async def _run(args, stub: StubServer) -> None:
+    summary = MonthlyInsight(month="2026-01", total_income=Decimal("1000"),
+                             total_expense=Decimal("400"), balance=Decimal("600"),
+                             top_expense_categories=[])
+    user = User(email="bench@example.com", full_name="Bench")
+    system_prompt, user_prompt = advice_service._build_ai_prompt(summary, "How am I doing?", user)
+    payload = {"model": "stub", "messages": [
+        {"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}]}
+    url = f"{settings.GROQ_API_BASE_URL}/chat/completions"
+
+    print(f"{'mode':<6} {'calls/s':>8} {'ok':>5} {'connections':>12} "
+          f"{'probe p50 ms':>13} {'probe p99 ms':>13}")
+    stub.connections = 0
+    result = await _measure(lambda: run_in_threadpool(_legacy_call, url, payload), args.requests)
+    print(f"{'sync':<6} {args.requests / result['elapsed']:>8.1f} {result['ok']:>5} "
+          f"{stub.connections:>12} {result['probe_p50']:>13.1f} {result['probe_p99']:>13.1f}")
+
+    stub.connections = 0
+    advice_service.open_http_clients()
+    try:
+        result = await _measure(
+            lambda: advice_service._groq_response(summary, "How am I doing?", user), args.requests)
+    finally:
+        await advice_service.close_http_clients()
+    print(f"{'async':<6} {args.requests / result['elapsed']:>8.1f} {result['ok']:>5} "
+          f"{stub.connections:>12} {result['probe_p50']:>13.1f} {result['probe_p99']:>13.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.2)
+    parser.add_argument("--connections", type=int,
+                        default=settings.AI_HTTP_MAX_CONNECTIONS_PER_PROVIDER)
+    args = parser.parse_args()
+
+    stub = StubServer(args.delay)
+    settings.GROQ_API_BASE_URL = stub.start()
+    settings.GROQ_API_KEY = "stub"
+    settings.AI_HTTP_MAX_CONNECTIONS_PER_PROVIDER = args.connections
+    print(f"{args.requests} concurrent calls, stub delay {args.delay:.2f}s, "
+          f"{args.connections} pooled connections per provider")
+    asyncio.run(_run(args, stub))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark: the bearer-token part of the auth dependency chain, old vs. new.
+
+``legacy`` decodes and validates the token in get_current_user and again in
+get_token_payload, as get_current_full_access_user used to. ``cold``
+verifies it once per request with an empty verified-token cache; ``warm``
+is a repeat request with the same token. The ``step-up`` rows add the
+admin step-up token.
+
+Execute from backend directory:
+    python scripts/bench/bench_auth_dependencies.py
+    python scripts/bench/bench_auth_dependencies.py --repeat 50000
+"""
+
+import argparse
+import os
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))))
+
+from app.api import deps  # noqa: E402
+from app.core.security import SCOPE_FULL_ACCESS, create_access_token, decode_access_token  # noqa: E402
+from app.schemas import TokenPayload  # noqa: E402
+
+
+def legacy_full_access(token: str) -> TokenPayload:
+    """The previous chain: two independent decodes of the same token."""
+    user_claims = TokenPayload(**decode_access_token(token))
+    int(user_claims.sub)
+    return TokenPayload(**decode_access_token(token))
+
+
+def legacy_step_up(token: str, step_up_token: str) -> TokenPayload:
+    legacy_full_access(token)
+    return TokenPayload(**decode_access_token(step_up_token))
+
+
+def cold_full_access(token: str) -> TokenPayload:
+    deps._verified_tokens.clear()
+    return deps.get_token_payload(token)
+
+
+def cold_step_up(token: str, step_up_token: str) -> TokenPayload:
+    deps._verified_tokens.clear()
+    deps.get_token_payload(token)
+    return deps.verify_token(step_up_token)
+
+
+def warm_step_up(token: str, step_up_token: str) -> TokenPayload:
+    deps.get_token_payload(token)
+    return deps.verify_token(step_up_token)
+
+
+def _time(call, repeat: int) -> float:
+    start = perf_counter()
+    for _ in range(repeat):
+        call()
+    return (perf_counter() - start) / repeat * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    token = create_access_token(1, scopes=[SCOPE_FULL_ACCESS], email_verified=True)
+    step_up_token = create_access_token(
+        1, scopes=["admin_step_up"], email_verified=True, token_kind="admin_step_up")
+    cases = (
+        ("full access, legacy", lambda: legacy_full_access(token)),
+        ("full access, cold", lambda: cold_full_access(token)),
+        ("full access, warm", lambda: deps.get_token_payload(token)),
+        ("step-up, legacy", lambda: legacy_step_up(token, step_up_token)),
+        ("step-up, cold", lambda: cold_step_up(token, step_up_token)),
+        ("step-up, warm", lambda: warm_step_up(token, step_up_token)),
+    )
+    print(f"mean of {args.repeat} calls")
+    print(f"{'chain':<22} {'µs/request':>11}")
+    for name, call in cases:
+        print(f"{name:<22} {_time(call, args.repeat):>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Benchmark: per-amount conversion (the old dict-lookup convert_amount) vs. convert_many.
+
+Loads synthetic daily rates into an in-memory database, then converts the
+same amounts at the latest rates and at historical ``as_of`` dates.
+
+Execute from backend directory:
+    python scripts/bench/bench_convert_many.py
+    python scripts/bench/bench_convert_many.py --amounts 100000 --days 2000
+"""
+
+import argparse
+import os
+import sys
+from datetime import date, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.core.database import Base  # noqa: E402
+from app.models import ExchangeRate  # noqa: E402
+from app.services import currency_service  # noqa: E402
+from app.services.currency_service import EXCHANGE_RATES  # noqa: E402
+
+
+def legacy_convert_amount(amount: Decimal, from_currency: str, to_currency: str) -> Decimal:
+    """The previous implementation, kept here as the baseline."""
+    if from_currency == to_currency:
+        return amount
+    from_currency = from_currency.upper()
+    to_currency = to_currency.upper()
+    from_rate = EXCHANGE_RATES.get(from_currency, Decimal("1.0"))
+    to_rate = EXCHANGE_RATES.get(to_currency, Decimal("1.0"))
+    amount_in_eur = amount / from_rate
+    amount_in_target = amount_in_eur * to_rate
+    return amount_in_target.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+def _seed(db: Session, days: int) -> date:
+    latest = date.today()
+    rows = (
+        (latest - timedelta(days=offset), currency,
+         rate * (1 + Decimal(offset % 50) / 1000))
+        for offset in range(days)
+        for currency, rate in EXCHANGE_RATES.items()
+    )
+    currency_service.store_rates(db, rows)
+    db.commit()
+    currency_service.reload(db)
+    return latest
+
+
+def _time(call, repeat: int) -> float:
+    start = perf_counter()
+    for _ in range(repeat):
+        call()
+    return (perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--amounts", type=int, default=10000)
+    parser.add_argument("--days", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[ExchangeRate.__table__])
+    amounts = [Decimal(index % 5000) + Decimal("0.37") for index in range(args.amounts)]
+    try:
+        with Session(engine) as db:
+            latest = _seed(db, args.days)
+        as_of = latest - timedelta(days=args.days // 2)
+        print(f"{args.amounts} amounts, {args.days} days of rates, mean of {args.repeat} runs")
+        print(f"{'case':<22} {'ms':>9} {'per amount µs':>14}")
+        cases = (
+            ("legacy convert_amount", lambda: [
+                legacy_convert_amount(amount, "usd", "MKD") for amount in amounts]),
+            ("convert_amount", lambda: [
+                currency_service.convert_amount(amount, "usd", "MKD") for amount in amounts]),
+            ("convert_amount as_of", lambda: [
+                currency_service.convert_amount(amount, "usd", "MKD", as_of) for amount in amounts]),
+            ("convert_many", lambda: currency_service.convert_many(amounts, "usd", "MKD")),
+            ("convert_many as_of", lambda: currency_service.convert_many(
+                amounts, "usd", "MKD", as_of)),
+        )
+        for name, call in cases:
+            elapsed = _time(call, args.repeat)
+            print(f"{name:<22} {elapsed:>9.2f} {elapsed * 1000 / args.amounts:>14.3f}")
+    finally:
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Benchmark: per-object convert_amount vs. display_service.transactions on large pages.
+
+Builds pages of in-memory transactions in mixed currencies spread over a
+year of synthetic daily rates, then converts them for display both ways.
+
+Execute from backend directory:
+    python scripts/bench/bench_display_currency.py
+    python scripts/bench/bench_display_currency.py --rows 50000 --repeat 10
+"""
+
+import argparse
+import os
+import sys
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.core.database import Base  # noqa: E402
+from app.models import ExchangeRate, Transaction, TransactionType  # noqa: E402
+from app.services import currency_service, display_service  # noqa: E402
+from app.services.currency_service import EXCHANGE_RATES  # noqa: E402
+
+CURRENCIES = ("EUR", "USD", "MKD", "GBP", "CHF")
+
+
+def per_object(transactions: list[Transaction], display_currency: str) -> None:
+    """Baseline: one convert_amount call (and rate lookup) per transaction."""
+    for transaction in transactions:
+        transaction.display_amount = currency_service.convert_amount(
+            transaction.amount, transaction.currency, display_currency, transaction.occurred_at)
+        transaction.display_currency = display_currency
+
+
+def _seed_rates(db: Session, days: int) -> None:
+    latest = date.today()
+    currency_service.store_rates(db, (
+        (latest - timedelta(days=offset), currency,
+         rate * (1 + Decimal(offset % 50) / 1000))
+        for offset in range(days)
+        for currency, rate in EXCHANGE_RATES.items()
+    ))
+    db.commit()
+    currency_service.reload(db)
+
+
+def _page(rows: int, days: int) -> list[Transaction]:
+    now = datetime.now(timezone.utc)
+    step = timedelta(days=days) / rows
+    return [
+        Transaction(
+            id=index,
+            user_id=1,
+            category_id=1,
+            amount=Decimal(index % 500) + Decimal("0.25"),
+            currency=CURRENCIES[index % len(CURRENCIES)],
+            transaction_type=TransactionType.EXPENSE,
+            occurred_at=now - step * index,
+        )
+        for index in range(rows)
+    ]
+
+
+def _time(call, repeat: int) -> float:
+    start = perf_counter()
+    for _ in range(repeat):
+        call()
+    return (perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[ExchangeRate.__table__])
+    try:
+        with Session(engine) as db:
+            _seed_rates(db, args.days)
+        page = _page(args.rows, args.days)
+        expected = [(t.amount, t.currency, t.occurred_at) for t in page]
+
+        per_object(page, "USD")
+        baseline = [t.display_amount for t in page]
+        display_service.transactions(page, "USD")
+        assert [t.display_amount for t in page] == baseline
+        assert [(t.amount, t.currency, t.occurred_at) for t in page] == expected
+
+        print(f"{args.rows} rows, {len(CURRENCIES)} currencies over {args.days} days, "
+              f"mean of {args.repeat} runs")
+        old_ms = _time(lambda: per_object(page, "USD"), args.repeat)
+        new_ms = _time(lambda: display_service.transactions(page, "USD"), args.repeat)
+        print(f"{'per-object ms':>14} {'batched ms':>11} {'speedup':>8}")
+        print(f"{old_ms:>14.2f} {new_ms:>11.2f} {old_ms / new_ms:>7.1f}x")
+    finally:
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark: streaming CSV import throughput and peak memory.
+
+Execute from backend directory:
+    python scripts/bench/bench_import.py
+    python scripts/bench/bench_import.py --rows 100000 --batch-size 2000 --trace-memory
+
+--trace-memory reports the peak Python allocation but slows the run down.
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app import models  # noqa: E402
+from app.core.database import Base  # noqa: E402
+from app.services import import_service  # noqa: E402
+
+
+def _write_csv(path: str, rows: int) -> None:
+    start = datetime(2020, 1, 1)
+    with open(path, "w", encoding="utf-8", newline="") as handle:
+        handle.write("date,amount,category,note\n")
+        for index in range(rows):
+            amount = f"{(index % 400) + 0.99:.2f}"
+            if index % 7:
+                amount = f"-{amount}"
+            occurred = (start + timedelta(minutes=37 * index)).isoformat()
+            handle.write(f"{occurred},{amount},cat{index % 15},row {index}\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=None,
+                        help="database URL (default: temporary SQLite file)")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--trace-memory", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_path = os.path.join(workdir, "export.csv")
+        _write_csv(csv_path, args.rows)
+        engine = create_engine(
+            args.url or f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        try:
+            with Session(engine) as db:
+                user = models.User(email="bench@example.com", hashed_password="x")
+                db.add(user)
+                db.commit()
+
+                if args.trace_memory:
+                    tracemalloc.start()
+                started = perf_counter()
+                with io.open(csv_path, encoding="utf-8") as stream:
+                    result = import_service.import_transactions(
+                        db, user.id, stream, "csv", batch_size=args.batch_size)
+                elapsed = perf_counter() - started
+                peak = None
+                if args.trace_memory:
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+        finally:
+            Base.metadata.drop_all(engine)
+            engine.dispose()
+
+    print(f"{result.imported} rows imported ({result.failed} failed) in {elapsed:.2f}s "
+          f"-> {result.imported / elapsed:,.0f} rows/s, batch {args.batch_size}")
+    if peak is not None:
+        print(f"peak traced memory {peak / 1024 / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
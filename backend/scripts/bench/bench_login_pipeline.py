@@ -0,0 +1,105 @@
+"""Benchmark: statements, commits and throughput of successful logins.
+
+Runs the app in-process against a temporary SQLite database whose users
+have cheap (4-round) bcrypt hashes, so the database work is what gets
+measured. ``last_login_at`` is written on every login first, then through
+the write-behind buffer.
+
+Execute from backend directory:
+    python scripts/bench/bench_login_pipeline.py
+    python scripts/bench/bench_login_pipeline.py --logins 2000 --concurrency 32
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))))
+
+_DB_DIR = tempfile.mkdtemp(prefix="bench-login-pipeline-")
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{_DB_DIR}/bench.db"
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app import models  # noqa: E402
+from app.core import security  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+PASSWORD = "password123"
+
+
+def _seed(users: int) -> None:
+    Base.metadata.create_all(engine)
+    hashed = security.pwd_context.hash(PASSWORD, rounds=4)
+    db = SessionLocal()
+    try:
+        db.add_all([
+            models.User(email=f"user{index}@example.com", hashed_password=hashed,
+                        is_email_verified=True)
+            for index in range(users)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def _run(args) -> tuple[float, int, int]:
+    counts = {"statements": 0, "commits": 0}
+
+    def _statement(*_) -> None:
+        counts["statements"] += 1
+
+    def _commit(*_) -> None:
+        counts["commits"] += 1
+
+    def _login(index: int) -> int:
+        return client.post("/api/v1/auth/login", json={
+            "email": f"user{index % args.users}@example.com", "password": PASSWORD}).status_code
+
+    event.listen(engine, "before_cursor_execute", _statement)
+    event.listen(engine, "commit", _commit)
+    try:
+        with TestClient(app) as client:
+            start = perf_counter()
+            with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+                statuses = list(pool.map(_login, range(args.logins)))
+            elapsed = perf_counter() - start
+        # Leaving the client stopped the writer, which flushed what was left.
+    finally:
+        event.remove(engine, "before_cursor_execute", _statement)
+        event.remove(engine, "commit", _commit)
+    assert statuses.count(200) == args.logins, "unexpected login failures"
+    return args.logins / elapsed, counts["statements"], counts["commits"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--flush-seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    _seed(args.users)
+    print(f"{args.logins} logins, {args.concurrency} concurrent, {args.users} users")
+    print(f"{'last_login_at':<14} {'logins/s':>9} {'stmts/login':>12} {'commits':>8}")
+    try:
+        for mode, flush_seconds in (("per login", 0.0), ("batched", args.flush_seconds)):
+            settings.LAST_LOGIN_FLUSH_SECONDS = flush_seconds
+            rate, statements, commits = _run(args)
+            print(f"{mode:<14} {rate:>9.1f} {statements / args.logins:>12.2f} {commits:>8}")
+    finally:
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
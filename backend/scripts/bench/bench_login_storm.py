@@ -0,0 +1,125 @@
+"""Benchmark: login throughput and latency of other endpoints during a login storm.
+
+Runs the app in-process against a temporary SQLite database, fires
+``--logins`` concurrent logins, and meanwhile times a cheap authenticated
+GET (``/api/v1/users/me``) once every ``--probe-interval`` seconds. Each
+mode is measured separately: bcrypt inline on the request threads, then
+in the process pool.
+
+Execute from backend directory:
+    python scripts/bench/bench_login_storm.py
+    python scripts/bench/bench_login_storm.py --logins 200 --concurrency 64 --workers 4
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from statistics import quantiles
+from time import perf_counter, sleep
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))))
+
+_DB_DIR = tempfile.mkdtemp(prefix="bench-login-")
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{_DB_DIR}/bench.db"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import models  # noqa: E402
+from app.core import security  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+PASSWORD = "password123"
+
+
+def _seed(users: int) -> str:
+    Base.metadata.create_all(engine)
+    hashed = security.pwd_context.hash(PASSWORD)
+    db = SessionLocal()
+    try:
+        db.add_all([
+            models.User(email=f"user{index}@example.com", hashed_password=hashed,
+                        is_email_verified=True)
+            for index in range(users)
+        ])
+        db.commit()
+        user_id = db.query(models.User.id).first()[0]
+    finally:
+        db.close()
+    return security.create_access_token(
+        user_id, scopes=[security.SCOPE_FULL_ACCESS], email_verified=True)
+
+
+def _percentile(samples: list[float], percent: int) -> float:
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return quantiles(samples, n=100, method="inclusive")[percent - 1]
+
+
+def _storm(client: TestClient, token: str, args) -> dict:
+    statuses: dict[int, int] = {}
+    probes: list[float] = []
+    done = threading.Event()
+
+    def _login(index: int) -> None:
+        response = client.post("/api/v1/auth/login", json={
+            "email": f"user{index % args.users}@example.com", "password": PASSWORD})
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    def _probe() -> None:
+        headers = {"Authorization": f"Bearer {token}"}
+        while not done.is_set():
+            start = perf_counter()
+            client.get("/api/v1/users/me", headers=headers)
+            probes.append((perf_counter() - start) * 1000)
+            sleep(args.probe_interval)
+
+    prober = threading.Thread(target=_probe)
+    prober.start()
+    start = perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(_login, range(args.logins)))
+    elapsed = perf_counter() - start
+    done.set()
+    prober.join()
+    return {
+        "elapsed": elapsed,
+        "ok": statuses.get(200, 0),
+        "busy": statuses.get(503, 0),
+        "probe_p50": _percentile(probes, 50),
+        "probe_p99": _percentile(probes, 99),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=40)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=max(os.cpu_count() or 1, 2))
+    parser.add_argument("--probe-interval", type=float, default=0.02)
+    args = parser.parse_args()
+
+    token = _seed(args.users)
+    print(f"{args.logins} logins, {args.concurrency} concurrent, "
+          f"pool of {args.workers}, queue limit {settings.PASSWORD_HASH_MAX_PENDING}")
+    print(f"{'mode':<8} {'logins/s':>9} {'ok':>5} {'503':>5} {'probe p50 ms':>13} {'probe p99 ms':>13}")
+    try:
+        for mode, workers in (("inline", 0), ("pool", args.workers)):
+            settings.PASSWORD_HASH_WORKERS = workers
+            with TestClient(app) as client:
+                result = _storm(client, token, args)
+            print(f"{mode:<8} {result['ok'] / result['elapsed']:>9.1f} {result['ok']:>5} "
+                  f"{result['busy']:>5} {result['probe_p50']:>13.1f} {result['probe_p99']:>13.1f}")
+    finally:
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
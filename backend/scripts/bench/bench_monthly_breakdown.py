@@ -0,0 +1,130 @@
+"""Benchmark: monthly_breakdown vs. the old one-query-per-month loop over transactions.
+
+Execute from backend directory:
+    python scripts/bench/bench_monthly_breakdown.py
+    python scripts/bench/bench_monthly_breakdown.py --rows 50000 --repeat 50
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import and_, create_engine, event, func, insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app import models  # noqa: E402
+from app.core.database import Base  # noqa: E402
+from app.models import Transaction, TransactionType  # noqa: E402
+from app.services import category_service, rollup_service, transaction_service  # noqa: E402
+
+
+def legacy_monthly_breakdown(db: Session, user_id: int, months: int = 6) -> list[dict]:
+    """The previous implementation, kept here as the baseline."""
+    results = []
+    now = datetime.now(timezone.utc)
+    for i in range(months):
+        year = now.year
+        month = now.month - i
+        while month <= 0:
+            month += 12
+            year -= 1
+        ref_date = now.replace(year=year, month=month, day=1)
+        start, end = transaction_service.month_bounds(ref_date)
+        statement = (
+            select(Transaction.transaction_type, func.coalesce(
+                func.sum(Transaction.amount_base), 0))
+            .where(
+                and_(
+                    Transaction.user_id == user_id,
+                    Transaction.occurred_at >= start,
+                    Transaction.occurred_at < end,
+                )
+            )
+            .group_by(Transaction.transaction_type)
+        )
+        totals = {row[0]: Decimal(row[1]) for row in db.execute(statement)}
+        results.append({
+            "month": ref_date.strftime("%Y-%m"),
+            "income": totals.get(TransactionType.INCOME, Decimal("0")),
+            "expense": totals.get(TransactionType.EXPENSE, Decimal("0")),
+        })
+    return results
+
+
+def _seed(db: Session, rows: int) -> int:
+    user = models.User(email="bench@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    now = datetime.now(timezone.utc)
+    step = timedelta(days=5 * 365) / rows
+    category_ids = category_service.ids_by_name(
+        db, user.id, [f"cat{index}" for index in range(12)], create=True)
+    db.execute(insert(Transaction), [
+        {
+            "user_id": user.id,
+            "category_id": category_ids[f"cat{index % 12}"],
+            "amount": Decimal(index % 500) + Decimal("0.25"),
+            "amount_base": Decimal(index % 500) + Decimal("0.25"),
+            "currency": "EUR",
+            "transaction_type": TransactionType.INCOME if index % 4 == 0 else TransactionType.EXPENSE,
+            "occurred_at": now - step * index,
+            "is_deleted": False,
+        }
+        for index in range(rows)
+    ])
+    rollup_service.rebuild(db)
+    db.commit()
+    return user.id
+
+
+def _time(engine, call, repeat: int) -> tuple[float, int]:
+    queries = 0
+
+    def _count(*_args):
+        nonlocal queries
+        queries += 1
+
+    event.listen(engine, "before_cursor_execute", _count)
+    start = perf_counter()
+    for _ in range(repeat):
+        call()
+    elapsed = (perf_counter() - start) / repeat
+    event.remove(engine, "before_cursor_execute", _count)
+    return elapsed * 1000, queries // repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="sqlite://")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    Base.metadata.create_all(engine)
+    try:
+        with Session(engine) as db:
+            user_id = _seed(db, args.rows)
+            print(f"{args.rows} rows, {engine.dialect.name}, mean of {args.repeat} runs")
+            print(f"{'months':>6} {'legacy ms':>10} {'queries':>8} {'single ms':>10} {'queries':>8} {'speedup':>8}")
+            for months in (6, 24, 60):
+                assert legacy_monthly_breakdown(db, user_id, months) == \
+                    transaction_service.monthly_breakdown(db, user_id, months)
+                old_ms, old_q = _time(engine, lambda: legacy_monthly_breakdown(
+                    db, user_id, months), args.repeat)
+                new_ms, new_q = _time(engine, lambda: transaction_service.monthly_breakdown(
+                    db, user_id, months), args.repeat)
+                print(f"{months:>6} {old_ms:>10.2f} {old_q:>8} {new_ms:>10.2f} {new_q:>8} {old_ms / new_ms:>7.1f}x")
+    finally:
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
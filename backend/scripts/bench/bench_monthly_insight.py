@@ -0,0 +1,127 @@
+"""Benchmark: monthly_insight (one query) vs. the old three-call endpoint body.
+
+Execute from backend directory:
+    python scripts/bench/bench_monthly_insight.py
+    python scripts/bench/bench_monthly_insight.py --rows 50000 --repeat 200
+"""
+
+import argparse
+import os
+import sys
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import create_engine, event, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app import models  # noqa: E402
+from app.core.database import Base  # noqa: E402
+from app.models import Transaction, TransactionType  # noqa: E402
+from app.schemas import CategoryBreakdown, MonthlyInsight  # noqa: E402
+from app.services import category_service, rollup_service, transaction_service  # noqa: E402
+
+
+def legacy_monthly_insight(db: Session, user_id: int, reference: date) -> MonthlyInsight:
+    """The previous endpoint body, kept here as the baseline."""
+    reference_dt = datetime.combine(reference, time.min, tzinfo=timezone.utc)
+    total_income, total_expense = transaction_service.monthly_summary(
+        db, user_id, reference_dt)
+    categories = transaction_service.top_expense_categories(
+        db, user_id, reference_dt)
+    prev_month_dt = datetime.combine(
+        (reference.replace(day=1) - timedelta(days=1)).replace(day=1), time.min, tzinfo=timezone.utc)
+    prev_total_income, prev_total_expense = transaction_service.monthly_summary(
+        db, user_id, prev_month_dt)
+    return MonthlyInsight(
+        month=reference.strftime("%Y-%m"),
+        total_income=total_income,
+        total_expense=total_expense,
+        balance=total_income - total_expense,
+        top_expense_categories=[
+            CategoryBreakdown(category=category, amount=amount) for category, amount in categories
+        ],
+        prev_total_income=prev_total_income,
+        prev_total_expense=prev_total_expense,
+        carryover=prev_total_income - prev_total_expense,
+    )
+
+
+def _seed(db: Session, rows: int, categories: int) -> int:
+    user = models.User(email="bench@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    now = datetime.now(timezone.utc)
+    step = timedelta(days=3 * 365) / rows
+    category_ids = category_service.ids_by_name(
+        db, user.id, [f"cat{index}" for index in range(categories)], create=True)
+    db.execute(insert(Transaction), [
+        {
+            "user_id": user.id,
+            "category_id": category_ids[f"cat{index % categories}"],
+            "amount": Decimal(index % 500) + Decimal("0.25"),
+            "amount_base": Decimal(index % 500) + Decimal("0.25"),
+            "currency": "EUR",
+            "transaction_type": TransactionType.INCOME if index % 4 == 0 else TransactionType.EXPENSE,
+            "occurred_at": now - step * index,
+            "is_deleted": False,
+        }
+        for index in range(rows)
+    ])
+    rollup_service.rebuild(db)
+    db.commit()
+    return user.id
+
+
+def _time(engine, call, repeat: int) -> tuple[float, int]:
+    queries = 0
+
+    def _count(*_args):
+        nonlocal queries
+        queries += 1
+
+    event.listen(engine, "before_cursor_execute", _count)
+    start = perf_counter()
+    for _ in range(repeat):
+        call()
+    elapsed = (perf_counter() - start) / repeat
+    event.remove(engine, "before_cursor_execute", _count)
+    return elapsed * 1000, queries // repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="sqlite://")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--categories", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    Base.metadata.create_all(engine)
+    try:
+        with Session(engine) as db:
+            user_id = _seed(db, args.rows, args.categories)
+            reference = date.today()
+            assert legacy_monthly_insight(db, user_id, reference) == \
+                transaction_service.monthly_insight(db, user_id, reference)
+            old_ms, old_q = _time(engine, lambda: legacy_monthly_insight(
+                db, user_id, reference), args.repeat)
+            new_ms, new_q = _time(engine, lambda: transaction_service.monthly_insight(
+                db, user_id, reference), args.repeat)
+            print(f"{args.rows} rows, {args.categories} categories, {engine.dialect.name}, "
+                  f"mean of {args.repeat} runs")
+            print(f"{'':>8} {'ms':>8} {'queries':>8}")
+            print(f"{'legacy':>8} {old_ms:>8.3f} {old_q:>8}")
+            print(f"{'single':>8} {new_ms:>8.3f} {new_q:>8}")
+            print(f"speedup {old_ms / new_ms:.1f}x")
+    finally:
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Benchmark: advice latency under the sequential, hedged and race strategies.
+
+Starts one stub chat-completions server per provider on localhost:
+
+- groq:   fast (``--fast``), but ``--tail-rate`` of calls take ``--tail``;
+- gemini: steady (``--steady``);
+- openai: fast, but ``--error-rate`` of calls answer 500.
+
+Each strategy answers ``--requests`` questions, ``--concurrency`` at a time,
+through ``advice_service._provider_answer`` on the pooled clients, with the
+provider statistics reset in between. Reports answer latency percentiles
+and how many provider calls were started per answer.
+
+Execute from backend directory:
+    python scripts/bench/bench_provider_strategies.py
+    python scripts/bench/bench_provider_strategies.py --requests 1000 --tail 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+from decimal import Decimal
+from statistics import quantiles
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))))
+
+from app.core.config import settings  # noqa: E402
+from app.models import User  # noqa: E402
+from app.schemas import MonthlyInsight  # noqa: E402
+from app.services import advice_service  # noqa: E402
+
+_CHAT = json.dumps({"choices": [{"message": {"content": "Spend less."}}]}).encode()
+_GEMINI = json.dumps({"candidates": [{"content": {"parts": [{"text": "Spend less."}]}}]}).encode()
+
+
+class StubProvider:
+    """Keep-alive HTTP/1.1 server with a configurable latency and error mix."""
+
+    def __init__(self, reply: bytes, delay: float, *, tail: float = 0.0,
+                 tail_rate: float = 0.0, error_rate: float = 0.0) -> None:
+        self.reply = reply
+        self.delay = delay
+        self.tail = tail
+        self.tail_rate = tail_rate
+        self.error_rate = error_rate
+        self.calls = 0
+        self._random = random.Random(7)
+        self._ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+        self.url = ""
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    name, _, value = line.partition(b":")
+                    if name.lower() == b"content-length":
+                        length = int(value)
+                await reader.readexactly(length)
+                self.calls += 1
+                slow = self._random.random() < self.tail_rate
+                await asyncio.sleep(self.tail if slow else self.delay)
+                if self._random.random() < self.error_rate:
+                    status, body = b"500 Internal Server Error", b"{}"
+                else:
+                    status, body = b"200 OK", self.reply
+                writer.write(
+                    b"HTTP/1.1 %s\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: %d\r\n\r\n%s" % (status, len(body), body))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, "127.0.0.1", 0, backlog=1024))
+        self.url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+        self._ready.set()
+        self._loop.run_forever()
+
+    def start(self) -> str:
+        threading.Thread(target=self._run, daemon=True).start()
+        self._ready.wait()
+        return self.url
+
+
+def _percentile(samples: list[float], percent: int) -> float:
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return quantiles(samples, n=100, method="inclusive")[percent - 1]
+
+
+async def _measure(args, stubs: list[StubProvider]) -> dict:
+    summary = MonthlyInsight(month="2026-01", total_income=Decimal("1000"),
+                             total_expense=Decimal("400"), balance=Decimal("600"),
+                             top_expense_categories=[])
+    user = User(email="bench@example.com", full_name="Bench")
+    gate = asyncio.Semaphore(args.concurrency)
+    latencies: list[float] = []
+    failures = 0
+
+    async def _ask() -> None:
+        nonlocal failures
+        async with gate:
+            start = perf_counter()
+            answer = await advice_service._provider_answer(summary, "How am I doing?", user)
+            latencies.append((perf_counter() - start) * 1000)
+            failures += answer is None
+
+    for stub in stubs:
+        stub.calls = 0
+    await asyncio.gather(*(_ask() for _ in range(args.requests)))
+    return {
+        "p50": _percentile(latencies, 50),
+        "p95": _percentile(latencies, 95),
+        "p99": _percentile(latencies, 99),
+        "calls": sum(stub.calls for stub in stubs) / args.requests,
+        "failures": failures,
+    }
+
+
+async def _run(args, stubs: list[StubProvider]) -> None:
+    print(f"{'strategy':<11} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'calls/answer':>13} {'no answer':>10}")
+    for strategy in ("sequential", "hedged", "race"):
+        settings.AI_PROVIDER_STRATEGY = strategy
+        advice_service.provider_stats.update(
+            (provider, advice_service.ProviderStats()) for provider in advice_service.PROVIDERS)
+        advice_service.open_http_clients()
+        try:
+            result = await _measure(args, stubs)
+        finally:
+            await advice_service.close_http_clients()
+        print(f"{strategy:<11} {result['p50']:>8.0f} {result['p95']:>8.0f} {result['p99']:>8.0f} "
+              f"{result['calls']:>13.2f} {result['failures']:>10}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--fast", type=float, default=0.1)
+    parser.add_argument("--steady", type=float, default=0.3)
+    parser.add_argument("--tail", type=float, default=3.0)
+    parser.add_argument("--tail-rate", type=float, default=0.1)
+    parser.add_argument("--error-rate", type=float, default=0.2)
+    args = parser.parse_args()
+
+    groq = StubProvider(_CHAT, args.fast, tail=args.tail, tail_rate=args.tail_rate)
+    gemini = StubProvider(_GEMINI, args.steady)
+    openai = StubProvider(_CHAT, args.fast, error_rate=args.error_rate)
+    settings.GROQ_API_BASE_URL = groq.start()
+    settings.GOOGLE_GEMINI_API_BASE_URL = gemini.start()
+    settings.OPENAI_API_BASE_URL = openai.start()
+    settings.GROQ_API_KEY = settings.GOOGLE_GEMINI_API_KEY = settings.OPENAI_API_KEY = "stub"
+    print(f"{args.requests} answers, {args.concurrency} at a time; groq {args.fast:.2f}s "
+          f"({args.tail_rate:.0%} at {args.tail:.1f}s), gemini {args.steady:.2f}s, "
+          f"openai {args.fast:.2f}s ({args.error_rate:.0%} errors)")
+    asyncio.run(_run(args, [groq, gemini, openai]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Benchmark: rate-limit checks against the old per-IP list of datetimes.
+
+Simulates failed logins from ``--ips`` distinct addresses: each attempt
+checks the limit and records a failure. The legacy variant reproduces the
+former ``auth._ip_attempts`` dict (filter a list of datetimes per check, no
+eviction); the others use ``RateLimiter`` on each backend.
+
+Execute from backend directory:
+    python scripts/bench/bench_rate_limiter.py
+    python scripts/bench/bench_rate_limiter.py --ips 200000 --attempts 500000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))))
+
+from app.core.rate_limit import MemoryBackend, RateLimiter, SQLiteBackend  # noqa: E402
+
+LIMIT = 5
+WINDOW_MINUTES = 15
+
+
+def _legacy(addresses: list[str]) -> tuple[float, int]:
+    attempts_by_ip: dict[str, list[datetime]] = {}
+    start = perf_counter()
+    for ip in addresses:
+        now = datetime.now(timezone.utc)
+        window_start = now - timedelta(minutes=WINDOW_MINUTES)
+        attempts = [ts for ts in attempts_by_ip.get(ip, []) if ts >= window_start]
+        attempts_by_ip[ip] = attempts
+        if len(attempts) < LIMIT:
+            attempts.append(now)
+            attempts_by_ip[ip] = [ts for ts in attempts if ts >= window_start]
+    return perf_counter() - start, len(attempts_by_ip)
+
+
+def _limiter(addresses: list[str], limiter: RateLimiter) -> tuple[float, int]:
+    start = perf_counter()
+    for ip in addresses:
+        if not limiter.is_limited(ip):
+            limiter.hit(ip)
+    backend = limiter.backend
+    return perf_counter() - start, len(backend) if isinstance(backend, MemoryBackend) else 0
+
+
+def _measure(label: str, run, addresses: list[str]) -> None:
+    tracemalloc.start()
+    elapsed, keys = run(addresses)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22} {len(addresses) / elapsed:>12.0f} {keys:>9} {peak / 2**20:>10.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ips", type=int, default=50000)
+    parser.add_argument("--attempts", type=int, default=200000)
+    parser.add_argument("--max-keys", type=int, default=10000)
+    parser.add_argument("--sqlite-attempts", type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    addresses = [f"10.{n >> 16 & 255}.{n >> 8 & 255}.{n & 255}"
+                 for n in (rng.randrange(args.ips) for _ in range(args.attempts))]
+    window = WINDOW_MINUTES * 60
+    print(f"{args.attempts} attempts from {args.ips} addresses, limit {LIMIT}/{WINDOW_MINUTES}min")
+    print(f"{'variant':<22} {'checks/s':>12} {'keys':>9} {'peak MiB':>10}")
+    _measure("legacy list", _legacy, addresses)
+    _measure("memory ring", lambda a: _limiter(a, RateLimiter(
+        "bench", LIMIT, window, buckets=WINDOW_MINUTES, backend=MemoryBackend(args.ips))), addresses)
+    _measure(f"memory ring (cap {args.max_keys})", lambda a: _limiter(a, RateLimiter(
+        "bench", LIMIT, window, buckets=WINDOW_MINUTES, backend=MemoryBackend(args.max_keys))), addresses)
+    with tempfile.TemporaryDirectory() as directory:
+        backend = SQLiteBackend(os.path.join(directory, "rate_limits.db"))
+        _measure("sqlite file", lambda a: _limiter(a, RateLimiter(
+            "bench", LIMIT, window, buckets=WINDOW_MINUTES, backend=backend)), addresses[:args.sqlite_attempts])
+
+
+if __name__ == "__main__":
+    main()
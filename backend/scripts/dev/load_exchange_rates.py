@@ -0,0 +1,48 @@
+"""Load ECB reference exchange rates from a local XML or CSV file.
+
+Accepts the ECB ``eurofxref`` downloads (daily, 90-day or full-history XML,
+or the wide ``Date,USD,JPY,...`` CSV) as well as a long
+``date,currency,rate`` CSV. Rates are units per EUR; existing dates are
+overwritten. Running workers pick the new rates up within
+``EXCHANGE_RATES_REFRESH_SECONDS``.
+
+Execute from backend directory:
+    python scripts/dev/load_exchange_rates.py eurofxref-hist.xml
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))))
+
+from app.core.database import SessionLocal  # noqa: E402
+from app.services import currency_service  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="ECB XML or CSV file")
+    parser.add_argument("--format", choices=currency_service.RATE_FORMATS,
+                        help="file format (default: from the file extension)")
+    args = parser.parse_args()
+
+    file_format = currency_service.detect_format(args.path, args.format)
+    if file_format is None:
+        parser.error("cannot tell the format from the extension; pass --format")
+
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as stream:
+            stored = currency_service.load_file(db, stream, file_format)
+        snapshot = currency_service.rates()
+        print(f"Stored {stored} rates for {len(snapshot.currencies)} currencies "
+              f"(latest {snapshot.latest_date})")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
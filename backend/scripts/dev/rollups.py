@@ -0,0 +1,45 @@
+"""Rebuild or verify the transaction_rollups table.
+
+Execute from backend directory:
+    python scripts/dev/rollups.py verify
+    python scripts/dev/rollups.py rebuild
+    python scripts/dev/rollups.py rebuild --user-id 42
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))))
+
+from app.core.database import SessionLocal  # noqa: E402
+from app.services import rollup_service  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["rebuild", "verify"])
+    parser.add_argument("--user-id", type=int, default=None,
+                        help="limit to one user (default: everyone)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.command == "rebuild":
+            count = rollup_service.rebuild(db, args.user_id)
+            db.commit()
+            print(f"Rebuilt {count} rollup rows")
+            return 0
+
+        problems = rollup_service.verify(db, args.user_id)
+        for problem in problems:
+            print(problem)
+        print(f"{len(problems)} mismatched rollup rows")
+        return 1 if problems else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,36 @@
+"""Build (or rebuild) the transaction full-text search index.
+
+Creates the SQLite FTS5 table and triggers, or the MySQL FULLTEXT index, if
+missing, then indexes every existing transaction.
+
+Execute from backend directory:
+    python scripts/dev/search_index.py
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))))
+
+from app.core.database import SessionLocal  # noqa: E402
+from app.services import search_service  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        search_service.rebuild_index(db)
+        db.commit()
+        print(f"Search index rebuilt ({db.get_bind().dialect.name})")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+"""Shared fixtures: a scratch SQLite database and an in-process app client.
+
+The environment is set before ``app`` is imported, because the engine and
+settings are created at import time.
+"""
+import os
+import tempfile
+
+_DB_DIR = tempfile.mkdtemp(prefix="finance-tests-")
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{_DB_DIR}/test.db"
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+os.environ["LAST_LOGIN_FLUSH_SECONDS"] = "0"
+os.environ["RATE_LIMIT_BACKEND"] = "memory"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import models  # noqa: E402
+from app.api import deps  # noqa: E402
+from app.core import rate_limit, security  # noqa: E402
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services import category_service, currency_service, user_service  # noqa: E402
+
+PASSWORD = "password123"
+# Cheap hash: bcrypt's default cost would dominate the run time.
+_HASHED_PASSWORD = security.pwd_context.hash(PASSWORD, rounds=4)
+
+
+def _reset_process_caches() -> None:
+    # Every test starts from an empty database, so ids are reused.
+    user_service._snapshots.clear()
+    deps._verified_tokens.clear()
+    category_service._cache.clear()
+    currency_service._rates = currency_service._builtin()
+    currency_service._checked_at = float("-inf")
+    rate_limit._backend = None
+
+
+@pytest.fixture(autouse=True)
+def _database():
+    Base.metadata.create_all(engine)
+    _reset_process_caches()
+    yield
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def db():
+    """A session of its own. Reads share one snapshot per transaction, so call
+    ``db.rollback()`` before checking writes made through the API since."""
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client() -> TestClient:
+    return TestClient(app)
+
+
+@pytest.fixture
+def make_user(db):
+    """Create a verified user; returns ``(user_id, auth_headers)``."""
+
+    def _make_user(email: str = "user@example.com", *, tier: str = "FREE",
+                   role: str = "USER", currency: str = "EUR") -> tuple[int, dict[str, str]]:
+        user = models.User(
+            email=email, hashed_password=_HASHED_PASSWORD, is_email_verified=True,
+            subscription_tier=tier, role=role, currency=currency)
+        db.add(user)
+        db.flush()
+        user_id = user.id
+        db.commit()  # leaves no read snapshot open
+        token = security.create_access_token(
+            user_id, scopes=[security.SCOPE_FULL_ACCESS, security.SCOPE_READ_ONLY],
+            email_verified=True)
+        return user_id, {"Authorization": f"Bearer {token}"}
+
+    return _make_user
+
+
+@pytest.fixture
+def add_transactions(client):
+    """Create transactions through the API; returns their ids."""
+
+    def _add(headers: dict[str, str], *rows: dict) -> list[int]:
+        ids = []
+        for row in rows:
+            body = {"transaction_type": "expense", "category": "food", **row}
+            response = client.post("/api/v1/transactions", headers=headers, json=body)
+            assert response.status_code == 201, response.text
+            ids.append(response.json()["id"])
+        return ids
+
+    return _add
+
+
+@pytest.fixture
+def load_rates(db):
+    """Store ``(date, currency, units per EUR)`` rows and publish them."""
+
+    def _load(*rows: tuple) -> None:
+        currency_service.store_rates(db, rows)
+        db.commit()
+        currency_service.reload(db)
+
+    return _load
@@ -0,0 +1,89 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.services import advice_service
+
+
+@pytest.fixture
+def created(monkeypatch):
+    """Provider clients backed by a mock transport; returns the clients created so far."""
+    clients: list[httpx.AsyncClient] = []
+
+    def _answer(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/broken":
+            return httpx.Response(500)
+        return httpx.Response(200, json={"path": request.url.path})
+
+    def _new_http_client() -> httpx.AsyncClient:
+        client = httpx.AsyncClient(transport=httpx.MockTransport(_answer))
+        clients.append(client)
+        return client
+
+    monkeypatch.setattr(advice_service, "_new_http_client", _new_http_client)
+    yield clients
+    asyncio.run(advice_service.close_http_clients())
+
+
+def _post(*paths: str) -> list:
+    async def _run():
+        return [await advice_service._post_json("groq", f"https://llm.test{path}", json={})
+                for path in paths]
+
+    return asyncio.run(_run())
+
+
+def test_open_clients_are_reused_until_closed(created):
+    advice_service.open_http_clients()
+    advice_service.open_http_clients()
+    assert len(created) == len(advice_service.PROVIDERS)
+
+    assert _post("/one", "/two") == [{"path": "/one"}, {"path": "/two"}]
+    assert len(created) == len(advice_service.PROVIDERS)
+    assert not any(client.is_closed for client in created)
+
+    asyncio.run(advice_service.close_http_clients())
+
+    assert advice_service._http_clients == {}
+    assert all(client.is_closed for client in created)
+
+
+def test_without_open_clients_each_call_uses_a_one_off_client(created):
+    assert _post("/one", "/two") == [{"path": "/one"}, {"path": "/two"}]
+
+    assert len(created) == 2
+    assert all(client.is_closed for client in created)
+    assert advice_service._http_clients == {}
+
+
+@pytest.mark.parametrize("pooled", [True, False])
+def test_error_status_raises(created, pooled):
+    if pooled:
+        advice_service.open_http_clients()
+
+    with pytest.raises(httpx.HTTPStatusError):
+        _post("/broken")
+
+    assert all(client.is_closed for client in created) is not pooled
+
+
+def test_lifespan_opens_and_closes_the_clients(created):
+    with TestClient(app):
+        assert set(advice_service._http_clients) == set(advice_service.PROVIDERS)
+        assert not any(client.is_closed for client in created)
+
+    assert advice_service._http_clients == {}
+    assert len(created) == len(advice_service.PROVIDERS)
+    assert all(client.is_closed for client in created)
+
+
+def test_provider_clients_use_the_configured_timeout():
+    client = advice_service._new_http_client()
+    try:
+        assert client.timeout == httpx.Timeout(settings.AI_HTTP_TIMEOUT_SECONDS)
+    finally:
+        asyncio.run(client.aclose())
@@ -0,0 +1,80 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.models import Transaction
+from app.services import rollup_service
+
+# 1 EUR = 1.25 USD until June 2026, 2 USD from then on.
+RATES = ((date(2026, 1, 1), "USD", Decimal("1.25")), (date(2026, 6, 1), "USD", Decimal("2")))
+
+
+@pytest.fixture
+def headers(make_user, load_rates):
+    load_rates(*RATES)
+    return make_user(tier="ELITE")[1]
+
+
+def _amount_base(db, transaction_id: int) -> Decimal:
+    db.rollback()
+    return db.get(Transaction, transaction_id).amount_base
+
+
+def test_amount_base_is_set_at_the_rate_of_occurred_at(db, headers, add_transactions):
+    march, july, euros = add_transactions(
+        headers,
+        {"amount": "100", "currency": "usd", "occurred_at": "2026-03-01T00:00:00"},
+        {"amount": "100", "currency": "USD", "occurred_at": "2026-07-01T00:00:00"},
+        {"amount": "100", "occurred_at": "2026-07-01T00:00:00"},
+    )
+
+    assert _amount_base(db, march) == Decimal("80.00")
+    assert _amount_base(db, july) == Decimal("50.00")
+    assert _amount_base(db, euros) == Decimal("100.00")
+
+
+def test_import_sets_amount_base(client, db, headers):
+    response = client.post("/api/v1/transactions/import", headers=headers, files={"file": (
+        "bank.csv", "date,amount,currency,category\n2026-03-01,-10,USD,food\n2026-07-01,-10,USD,food\n")})
+    assert response.json()["imported"] == 2
+
+    db.rollback()
+    assert sorted(db.scalars(Transaction.__table__.select().with_only_columns(
+        Transaction.amount_base)).all()) == [Decimal("5.00"), Decimal("8.00")]
+
+
+@pytest.mark.parametrize("change, expected", [
+    ({"amount": "50"}, Decimal("40.00")),
+    ({"currency": "EUR"}, Decimal("100.00")),
+    ({"occurred_at": "2026-07-01T00:00:00"}, Decimal("50.00")),
+    ({"note": "unchanged"}, Decimal("80.00")),
+])
+def test_update_recomputes_amount_base(client, db, headers, add_transactions, change, expected):
+    (transaction_id,) = add_transactions(
+        headers, {"amount": "100", "currency": "USD", "occurred_at": "2026-03-01T00:00:00"})
+
+    response = client.patch(f"/api/v1/transactions/{transaction_id}", headers=headers, json=change)
+
+    assert response.status_code == 200, response.text
+    assert _amount_base(db, transaction_id) == expected
+    assert rollup_service.verify(db) == []
+
+
+def test_aggregates_sum_amount_base(client, headers, add_transactions):
+    add_transactions(
+        headers,
+        {"amount": "100", "currency": "USD", "occurred_at": "2026-03-01T00:00:00"},
+        {"amount": "20", "occurred_at": "2026-03-02T00:00:00"},
+    )
+
+    insight = client.get("/api/v1/transactions/insights/monthly", headers=headers,
+                         params={"reference_date": "2026-03-15"}).json()
+    series = client.get("/api/v1/transactions/insights/series", headers=headers,
+                        params={"granularity": "month", "start": "2026-03-01", "end": "2026-03-31"}).json()
+    daily = client.get("/api/v1/transactions/insights/series", headers=headers,
+                       params={"granularity": "day", "start": "2026-03-01", "end": "2026-03-02"}).json()
+
+    assert Decimal(insight["total_expense"]) == Decimal("100.00")
+    assert Decimal(series["series"][0]["points"][0]["amount"]) == Decimal("100.00")
+    assert sum(Decimal(point["amount"]) for point in daily["series"][0]["points"]) == Decimal("100.00")
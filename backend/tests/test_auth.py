@@ -0,0 +1,67 @@
+import base64
+import json
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.api import deps
+from app.core import security
+from app.models import User
+from app.services import user_service
+
+
+@pytest.mark.parametrize("path", ["/api/v1/users/me", "/api/v1/transactions"])
+def test_banned_user_is_forbidden(client, db, make_user, path):
+    user_id, headers = make_user()
+    assert client.get(path, headers=headers).status_code == 200
+
+    db.get(User, user_id).is_banned = True
+    user_service.invalidate_snapshot(db, user_id)
+    db.commit()
+
+    response = client.get(path, headers=headers)
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Account is banned"
+
+
+def _tampered(token: str) -> str:
+    header, payload, signature = token.split(".")
+    claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    claims["sub"] = str(int(claims["sub"]) + 1)
+    forged = base64.urlsafe_b64encode(json.dumps(claims).encode()).rstrip(b"=").decode()
+    return f"{header}.{forged}.{signature}"
+
+
+@pytest.mark.parametrize("make_token", [
+    lambda user_id: security.create_access_token(user_id, timedelta(minutes=-1)),
+    lambda user_id: _tampered(security.create_access_token(user_id)),
+    lambda user_id: security.create_access_token(user_id).replace(".", ".x", 1),
+], ids=["expired", "tampered", "malformed"])
+def test_invalid_token_is_rejected_and_not_cached(client, make_user, make_token):
+    user_id, _ = make_user()
+    make_user("other@example.com")
+    token = make_token(user_id)
+
+    for _ in range(2):
+        response = client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 401
+        assert response.headers["WWW-Authenticate"] == "Bearer"
+    assert token not in deps._verified_tokens
+
+
+def test_cached_token_is_dropped_when_it_expires(client, make_user, monkeypatch):
+    user_id, _ = make_user()
+    token = security.create_access_token(user_id)
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+    assert token in deps._verified_tokens
+
+    # Past the token's exp: the cache must not answer, and decoding again fails.
+    exp = deps._verified_tokens[token].exp
+    monkeypatch.setattr(deps, "time", SimpleNamespace(time=lambda: exp + 1))
+    monkeypatch.setattr(deps, "decode_access_token", lambda _: security.decode_access_token(
+        security.create_access_token(user_id, timedelta(minutes=-1))))
+
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 401
+    assert token not in deps._verified_tokens
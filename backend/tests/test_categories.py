@@ -0,0 +1,31 @@
+from app.models import BudgetGoal, Transaction
+
+
+def test_transaction_category_names_follow_category_id(client, db, make_user, add_transactions):
+    _, headers = make_user()
+    (transaction_id,) = add_transactions(headers, {"amount": "3", "category": "food",
+                                                   "occurred_at": "2026-10-01T00:00:00"})
+
+    response = client.patch(f"/api/v1/transactions/{transaction_id}", headers=headers,
+                            json={"category": "travel"})
+
+    assert response.json()["category"] == "travel"
+    assert [row["category"] for row in client.get("/api/v1/transactions", headers=headers).json()] == ["travel"]
+    db.rollback()
+    assert db.get(Transaction, transaction_id).category == "travel"
+
+
+def test_budget_category_names_follow_category_id(client, db, make_user):
+    _, headers = make_user()
+    response = client.post("/api/v1/budgets", headers=headers,
+                           json={"category": "food", "limit_amount": "100", "starts_on": "2026-10-01"})
+    assert response.status_code == 201, response.text
+    assert response.json()["category"] == "food"
+    budget_id = response.json()["id"]
+
+    response = client.patch(f"/api/v1/budgets/{budget_id}", headers=headers, json={"category": "rent"})
+
+    assert response.json()["category"] == "rent"
+    assert [row["category"] for row in client.get("/api/v1/budgets", headers=headers).json()] == ["rent"]
+    db.rollback()
+    assert db.get(BudgetGoal, budget_id).category == "rent"
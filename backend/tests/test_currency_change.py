@@ -0,0 +1,192 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from app.core import security
+from app.core.config import settings
+from app.models import BudgetGoal, CurrencyChangeJob, Transaction, User
+from app.services import currency_change_service, data_version_service, rollup_service
+
+# 1 EUR = 1.25 USD until June 2026, 2 USD from then on.
+RATES = ((date(2026, 1, 1), "USD", Decimal("1.25")), (date(2026, 6, 1), "USD", Decimal("2")))
+ROWS = (
+    {"amount": "10", "occurred_at": "2026-03-01T00:00:00"},
+    {"amount": "10", "occurred_at": "2026-07-01T00:00:00"},
+    {"amount": "4", "occurred_at": "2026-03-02T00:00:00"},
+    {"amount": "4", "occurred_at": "2026-07-02T00:00:00"},
+    {"amount": "100", "category": "salary", "transaction_type": "income",
+     "occurred_at": "2026-07-03T00:00:00"},
+)
+CONVERTED = [Decimal("12.50"), Decimal("20.00"), Decimal("5.00"), Decimal("8.00"), Decimal("200.00")]
+
+
+@pytest.fixture
+def account(client, make_user, add_transactions, load_rates, monkeypatch):
+    """An ELITE user with ``ROWS`` and one budget; chunks of two rows."""
+    monkeypatch.setattr(settings, "CURRENCY_CHANGE_CHUNK_SIZE", 2)
+    load_rates(*RATES)
+    user_id, headers = make_user(tier="ELITE")
+    ids = add_transactions(headers, *ROWS)
+    response = client.post("/api/v1/budgets", headers=headers,
+                           json={"category": "food", "limit_amount": "100", "starts_on": "2026-10-01"})
+    assert response.status_code == 201, response.text
+    return user_id, headers, ids
+
+
+def _change(client, headers, **body):
+    return client.post("/api/v1/users/me/change-currency", headers=headers,
+                       json={"new_currency": "USD", **body})
+
+
+def _amounts(db, ids) -> list[tuple[Decimal, Decimal, str]]:
+    db.rollback()
+    rows = {row.id: row for row in db.scalars(select(Transaction).where(Transaction.id.in_(ids)))}
+    return [(rows[i].amount, rows[i].amount_base, rows[i].currency) for i in ids]
+
+
+def _versions(db, user_id) -> tuple[int, int]:
+    db.rollback()
+    return (data_version_service.current(db, user_id, data_version_service.TRANSACTIONS),
+            data_version_service.current(db, user_id, data_version_service.BUDGETS))
+
+
+def test_converts_in_chunks_at_each_rows_rate(client, db, account):
+    user_id, headers, ids = account
+    versions = _versions(db, user_id)
+
+    response = _change(client, headers)
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["transactions_converted"], body["budgets_converted"]) == (5, 1)
+    assert _amounts(db, ids) == [(amount, amount, "USD") for amount in CONVERTED]
+    job = db.get(CurrencyChangeJob, body["job_id"])
+    assert (job.processed_transactions, job.last_transaction_id) == (5, max(ids))
+    assert db.get(User, user_id).currency == "USD"
+    # Budgets are not dated and convert at the latest rate.
+    assert db.scalar(select(BudgetGoal.limit_amount)) == Decimal("200.00")
+    assert rollup_service.verify(db) == []
+    after = _versions(db, user_id)
+    assert after[0] > versions[0] and after[1] > versions[1]
+
+    insight = client.get("/api/v1/transactions/insights/monthly", headers=headers,
+                         params={"reference_date": "2026-07-15"}).json()
+    assert Decimal(insight["total_expense"]) == Decimal("28.00")
+    assert Decimal(insight["total_income"]) == Decimal("200.00")
+
+
+def test_without_convert_values_only_amount_base_changes(client, db, account):
+    user_id, headers, ids = account
+
+    response = _change(client, headers, convert_values=False)
+
+    assert response.status_code == 200, response.text
+    assert _amounts(db, ids) == [
+        (Decimal(row["amount"]), amount, "EUR") for row, amount in zip(ROWS, CONVERTED)]
+    assert db.scalar(select(BudgetGoal.limit_amount)) == Decimal("100.00")
+    assert rollup_service.verify(db) == []
+
+
+def test_large_history_runs_in_the_background(client, db, account, monkeypatch):
+    _, headers, ids = account
+    monkeypatch.setattr(settings, "CURRENCY_CHANGE_BACKGROUND_THRESHOLD", 4)
+
+    response = _change(client, headers)
+
+    assert response.status_code == 202, response.text
+    job_id = response.json()["job_id"]
+    # TestClient runs background tasks before returning.
+    progress = client.get(f"/api/v1/users/me/change-currency/jobs/{job_id}", headers=headers).json()
+    assert progress["status"] == "completed"
+    assert (progress["total_transactions"], progress["processed_transactions"]) == (5, 5)
+    assert [amount for amount, _, _ in _amounts(db, ids)] == CONVERTED
+
+
+def test_failed_chunk_resumes_from_the_last_committed_id(client, db, account, monkeypatch):
+    user_id, headers, ids = account
+    convert_chunk = currency_change_service._convert_chunk
+    chunks = []
+
+    def _failing_second_chunk(db, job):
+        if len(chunks) == 1:
+            raise RuntimeError("database went away")
+        chunks.append(job.last_transaction_id)
+        return convert_chunk(db, job)
+
+    monkeypatch.setattr(currency_change_service, "_convert_chunk", _failing_second_chunk)
+    assert _change(client, headers).status_code == 500
+    monkeypatch.setattr(currency_change_service, "_convert_chunk", convert_chunk)
+
+    db.rollback()
+    job_id = db.scalar(select(CurrencyChangeJob.id))
+    progress = client.get(f"/api/v1/users/me/change-currency/jobs/{job_id}", headers=headers).json()
+    assert progress["status"] == "failed"
+    assert progress["processed_transactions"] == 2
+    assert "database went away" in progress["error"]
+    # The first chunk is committed; nothing else is.
+    assert [amount for amount, _, _ in _amounts(db, ids)] == [
+        *CONVERTED[:2], *(Decimal(row["amount"]) for row in ROWS[2:])]
+    assert db.get(User, user_id).currency == "EUR"
+
+    response = client.post(f"/api/v1/users/me/change-currency/jobs/{job_id}/resume", headers=headers)
+
+    assert response.status_code == 202, response.text
+    progress = client.get(f"/api/v1/users/me/change-currency/jobs/{job_id}", headers=headers).json()
+    assert (progress["status"], progress["processed_transactions"]) == ("completed", 5)
+    assert _amounts(db, ids) == [(amount, amount, "USD") for amount in CONVERTED]
+    assert db.scalar(select(BudgetGoal.limit_amount)) == Decimal("200.00")
+    assert rollup_service.verify(db) == []
+
+
+def test_only_failed_or_stale_jobs_resume(client, account):
+    _, headers, _ = account
+    job_id = _change(client, headers).json()["job_id"]
+
+    response = client.post(f"/api/v1/users/me/change-currency/jobs/{job_id}/resume", headers=headers)
+
+    assert response.status_code == 409
+
+
+@pytest.mark.parametrize("request_write", [
+    lambda client, headers, ids: client.post("/api/v1/transactions", headers=headers, json={
+        **ROWS[0], "category": "food", "transaction_type": "expense"}),
+    lambda client, headers, ids: client.patch(f"/api/v1/transactions/{ids[0]}", headers=headers,
+                                              json={"amount": "1"}),
+    lambda client, headers, ids: client.delete(f"/api/v1/transactions/{ids[0]}", headers=headers),
+    lambda client, headers, ids: client.post("/api/v1/transactions/batch", headers=headers,
+                                             json={"operations": [{"op": "delete", "id": ids[0]}]}),
+    lambda client, headers, ids: client.post("/api/v1/transactions/import", headers=headers, files={
+        "file": ("bank.csv", "date,amount,category\n2026-10-02,-5,food\n")}),
+    lambda client, headers, ids: client.post("/api/v1/users/me/change-currency", headers=headers,
+                                             json={"new_currency": "GBP"}),
+], ids=["create", "update", "delete", "batch", "import", "change"])
+def test_writes_wait_for_an_unfinished_change(client, db, account, request_write):
+    user_id, headers, ids = account
+    db.add(CurrencyChangeJob(user_id=user_id, old_currency="EUR", new_currency="USD",
+                             convert_values=True, status="failed"))
+    db.commit()
+
+    response = request_write(client, headers, ids)
+
+    assert response.status_code == 409, response.text
+    assert _amounts(db, ids) == [
+        (Decimal(row["amount"]), Decimal(row["amount"]), "EUR") for row in ROWS]
+
+
+def test_starting_and_resuming_need_full_access(client, db, account):
+    user_id, _, _ = account
+    token = security.create_access_token(
+        user_id, scopes=[security.SCOPE_READ_ONLY], email_verified=False)
+    headers = {"Authorization": f"Bearer {token}"}
+    job = CurrencyChangeJob(user_id=user_id, old_currency="EUR", new_currency="USD",
+                            convert_values=True, status="failed")
+    db.add(job)
+    db.commit()
+
+    assert _change(client, headers).status_code == 403
+    assert client.post(f"/api/v1/users/me/change-currency/jobs/{job.id}/resume",
+                       headers=headers).status_code == 403
+    assert client.get(f"/api/v1/users/me/change-currency/jobs/{job.id}",
+                      headers=headers).status_code == 200
@@ -0,0 +1,93 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+# 1 EUR = 1.25 USD until June 2026, 2 USD from then on.
+RATES = ((date(2026, 1, 1), "USD", Decimal("1.25")), (date(2026, 6, 1), "USD", Decimal("2")))
+
+
+@pytest.fixture
+def headers(make_user, add_transactions, load_rates):
+    load_rates(*RATES)
+    _, headers = make_user(tier="ELITE")
+    add_transactions(
+        headers,
+        {"amount": "10", "occurred_at": "2026-05-10T00:00:00"},
+        {"amount": "10", "occurred_at": "2026-06-10T00:00:00"},
+        {"amount": "5", "currency": "USD", "category": "travel", "occurred_at": "2026-06-11T00:00:00"},
+        {"amount": "100", "category": "salary", "transaction_type": "income",
+         "occurred_at": "2026-06-01T00:00:00"},
+    )
+    return headers
+
+
+def _get(client, headers, path, **params):
+    response = client.get(path, headers=headers, params=params)
+    assert response.status_code == 200, response.text
+    return response
+
+
+def test_transactions_convert_at_the_rate_of_their_date(client, headers):
+    rows = _get(client, headers, "/api/v1/transactions", display_currency="usd").json()
+
+    assert {(row["occurred_at"][:10], row["amount"], row["display_amount"]) for row in rows} == {
+        ("2026-05-10", "10.00", "12.50"),
+        ("2026-06-10", "10.00", "20.00"),
+        ("2026-06-11", "5.00", "5.00"),
+        ("2026-06-01", "100.00", "200.00"),
+    }
+    assert {row["display_currency"] for row in rows} == {"USD"}
+    plain = _get(client, headers, "/api/v1/transactions").json()
+    assert {row["display_amount"] for row in plain} == {None}
+
+
+def test_budgets_convert(client, headers):
+    response = client.post("/api/v1/budgets", headers=headers,
+                           json={"category": "food", "limit_amount": "100", "starts_on": "2026-05-01"})
+    assert response.status_code == 201, response.text
+
+    (budget,) = _get(client, headers, "/api/v1/budgets", display_currency="USD").json()
+
+    assert (budget["limit_amount"], budget["display_limit_amount"]) == ("100.00", "125.00")
+    assert budget["display_currency"] == "USD"
+
+
+def test_insight_converts_and_still_adds_up(client, headers):
+    insight = _get(client, headers, "/api/v1/transactions/insights/monthly",
+                   reference_date="2026-06-15", display_currency="USD").json()
+
+    # The 5 USD expense is 2.50 EUR in June.
+    assert Decimal(insight["total_expense"]) == Decimal("25.00")
+    assert Decimal(insight["total_income"]) == Decimal("200.00")
+    assert Decimal(insight["balance"]) == Decimal(insight["total_income"]) - Decimal(insight["total_expense"])
+    assert {row["category"]: Decimal(row["amount"]) for row in insight["top_expense_categories"]} == {
+        "food": Decimal("20.00"), "travel": Decimal("5.00")}
+    assert insight["display_currency"] == "USD"
+
+
+def test_unsupported_display_currency_is_rejected(client, headers):
+    response = client.get("/api/v1/transactions", headers=headers, params={"display_currency": "XXX"})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("path", [
+    "/api/v1/transactions",
+    "/api/v1/transactions/insights/monthly",
+    "/api/v1/transactions/insights/series",
+    "/api/v1/budgets",
+])
+def test_display_currency_is_part_of_the_etag(client, headers, load_rates, path):
+    plain = _get(client, headers, path).headers["ETag"]
+    usd = _get(client, headers, path, display_currency="USD").headers["ETag"]
+    gbp = _get(client, headers, path, display_currency="GBP").headers["ETag"]
+
+    assert len({plain, usd, gbp}) == 3
+    response = client.get(path, headers={**headers, "If-None-Match": usd}, params={"display_currency": "USD"})
+    assert response.status_code == 304
+
+    # New rates change the converted representations only.
+    load_rates((date(2026, 10, 1), "USD", Decimal("1.5")))
+    assert _get(client, headers, path, display_currency="USD").headers["ETag"] != usd
+    assert _get(client, headers, path).headers["ETag"] == plain
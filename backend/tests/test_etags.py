@@ -0,0 +1,107 @@
+import pytest
+
+TRANSACTION = {"amount": "10", "category": "food", "occurred_at": "2026-10-01T12:00:00"}
+
+
+def _etag(client, headers, path: str) -> str:
+    response = client.get(path, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.headers["ETag"]
+
+
+@pytest.mark.parametrize("path", [
+    "/api/v1/transactions",
+    "/api/v1/transactions/insights/monthly",
+    "/api/v1/transactions/insights/series",
+    "/api/v1/budgets",
+])
+def test_unchanged_data_answers_304(client, make_user, add_transactions, path):
+    _, headers = make_user()
+    add_transactions(headers, TRANSACTION)
+    etag = _etag(client, headers, path)
+
+    response = client.get(path, headers={**headers, "If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+    assert client.get(path, headers={**headers, "If-None-Match": '"stale"'}).status_code == 200
+
+
+def test_etag_is_per_user(client, make_user):
+    _, first = make_user()
+    _, second = make_user("second@example.com")
+
+    assert _etag(client, first, "/api/v1/transactions") != _etag(client, second, "/api/v1/transactions")
+
+
+def _create(client, headers, transaction_id):
+    client.post("/api/v1/transactions", headers=headers, json={**TRANSACTION, "transaction_type": "expense"})
+
+
+def _update(client, headers, transaction_id):
+    client.patch(f"/api/v1/transactions/{transaction_id}", headers=headers, json={"amount": "11"})
+
+
+def _delete(client, headers, transaction_id):
+    client.delete(f"/api/v1/transactions/{transaction_id}", headers=headers)
+
+
+def _batch(client, headers, transaction_id):
+    client.post("/api/v1/transactions/batch", headers=headers,
+                json={"operations": [{"op": "delete", "id": transaction_id}]})
+
+
+def _import(client, headers, transaction_id):
+    client.post("/api/v1/transactions/import", headers=headers,
+                files={"file": ("bank.csv", "date,amount,category\n2026-10-02,-5,food\n")})
+
+
+def _change_currency(client, headers, transaction_id):
+    response = client.post("/api/v1/users/me/change-currency", headers=headers,
+                           json={"new_currency": "USD"})
+    assert response.status_code == 200, response.text
+
+
+@pytest.mark.parametrize("write", [_create, _update, _delete, _batch, _import, _change_currency])
+@pytest.mark.parametrize("path", [
+    "/api/v1/transactions",
+    "/api/v1/transactions/insights/monthly?reference_date=2026-10-15",
+    "/api/v1/transactions/insights/series?granularity=month&start=2026-01-01&end=2026-12-31",
+])
+def test_transaction_writes_change_the_etag(client, make_user, add_transactions, write, path):
+    _, headers = make_user(tier="ELITE")
+    (transaction_id,) = add_transactions(headers, TRANSACTION)
+    before = _etag(client, headers, path)
+
+    write(client, headers, transaction_id)
+
+    assert _etag(client, headers, path) != before
+
+
+def test_budget_writes_change_the_etag(client, make_user):
+    _, headers = make_user()
+    etags = [_etag(client, headers, "/api/v1/budgets")]
+
+    response = client.post("/api/v1/budgets", headers=headers,
+                           json={"category": "food", "limit_amount": "100", "starts_on": "2026-10-01"})
+    budget_id = response.json()["id"]
+    etags.append(_etag(client, headers, "/api/v1/budgets"))
+    client.patch(f"/api/v1/budgets/{budget_id}", headers=headers, json={"limit_amount": "150"})
+    etags.append(_etag(client, headers, "/api/v1/budgets"))
+    client.delete(f"/api/v1/budgets/{budget_id}", headers=headers)
+    etags.append(_etag(client, headers, "/api/v1/budgets"))
+    _change_currency(client, headers, None)
+    etags.append(_etag(client, headers, "/api/v1/budgets"))
+
+    assert len(set(etags)) == len(etags)
+
+
+def test_failed_write_keeps_the_etag(client, make_user):
+    _, headers = make_user()
+    before = _etag(client, headers, "/api/v1/transactions")
+
+    response = client.patch("/api/v1/transactions/999", headers=headers, json={"amount": "1"})
+
+    assert response.status_code == 404
+    assert _etag(client, headers, "/api/v1/transactions") == before
@@ -0,0 +1,85 @@
+import io
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app.services import currency_service
+
+ECB_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<gesmes:Envelope xmlns:gesmes="http://www.gesmes.org/xml/2002-08-01"
+                 xmlns="http://www.ecb.int/vocabulary/2002-08-01/eurofxref">
+  <gesmes:subject>Reference rates</gesmes:subject>
+  <Cube>
+    <Cube time="2026-10-16">
+      <Cube currency="USD" rate="1.0812"/>
+      <Cube currency="MKD" rate="61.495"/>
+    </Cube>
+    <Cube time="2026-10-15">
+      <Cube currency="usd" rate="1.0790"/>
+      <Cube currency="CYP" rate="N/A"/>
+    </Cube>
+  </Cube>
+</gesmes:Envelope>"""
+
+
+def test_parse_ecb_xml_yields_every_dated_rate():
+    rows = list(currency_service.parse_ecb_xml(io.BytesIO(ECB_XML)))
+
+    assert rows == [
+        (date(2026, 10, 16), "USD", Decimal("1.0812")),
+        (date(2026, 10, 16), "MKD", Decimal("61.495")),
+        (date(2026, 10, 15), "USD", Decimal("1.0790")),
+    ]
+
+
+def test_parse_ecb_xml_reads_long_histories():
+    first = date(2000, 1, 3)
+    days = "".join(
+        f'<Cube time="{first + timedelta(days=offset)}"><Cube currency="USD" rate="1.{offset:04d}"/></Cube>'
+        for offset in range(5000))
+    document = f'<Envelope xmlns="http://www.ecb.int/vocabulary/2002-08-01/eurofxref"><Cube>{days}</Cube></Envelope>'
+
+    rows = list(currency_service.parse_ecb_xml(io.BytesIO(document.encode())))
+
+    assert len(rows) == 5000
+    assert rows[-1] == (first + timedelta(days=4999), "USD", Decimal("1.4999"))
+
+
+def test_parse_ecb_csv_reads_wide_and_long_layouts():
+    wide = "Date,USD,JPY,\n2026-10-16,1.0812,N/A,\n"
+    long = "date,currency,rate\n2026-10-16,usd,1.0812\n"
+
+    assert list(currency_service.parse_ecb_csv(io.StringIO(wide))) == [
+        (date(2026, 10, 16), "USD", Decimal("1.0812"))]
+    assert list(currency_service.parse_ecb_csv(io.StringIO(long))) == [
+        (date(2026, 10, 16), "USD", Decimal("1.0812"))]
+
+
+def test_rates_corrected_in_place_reach_other_workers(db, load_rates, monkeypatch):
+    load_rates((date(2026, 10, 16), "USD", Decimal("1.10")))
+    assert currency_service.conversion_factor("EUR", "USD") == Decimal("1.10")
+
+    # Another worker overwrites the same day: same row count, same newest date.
+    currency_service.store_rates(db, [(date(2026, 10, 16), "USD", Decimal("1.20"))])
+    db.commit()
+    monkeypatch.setattr(currency_service.settings, "EXCHANGE_RATES_REFRESH_SECONDS", 0)
+
+    assert currency_service.conversion_factor("EUR", "USD") == Decimal("1.20")
+
+
+def test_display_totals_use_the_rate_of_their_period(client, make_user, add_transactions, load_rates):
+    load_rates((date(2026, 1, 1), "USD", Decimal("1.25")), (date(2026, 6, 1), "USD", Decimal("2")))
+    _, headers = make_user(tier="ELITE")
+    add_transactions(headers, {"amount": "10", "occurred_at": "2026-05-10T00:00:00"},
+                     {"amount": "10", "occurred_at": "2026-06-10T00:00:00"})
+
+    series = client.get("/api/v1/transactions/insights/series", headers=headers, params={
+        "granularity": "month", "start": "2026-05-01", "end": "2026-06-30", "display_currency": "USD",
+    }).json()
+    insight = client.get("/api/v1/transactions/insights/monthly", headers=headers, params={
+        "reference_date": "2026-06-15", "display_currency": "USD"}).json()
+
+    assert [Decimal(point["amount"]) for point in series["series"][0]["points"]] == [
+        Decimal("12.50"), Decimal("20.00")]
+    assert Decimal(insight["total_expense"]) == Decimal("20.00")
+    assert Decimal(insight["prev_total_expense"]) == Decimal("12.50")
+    assert Decimal(insight["carryover"]) == Decimal("-12.50")
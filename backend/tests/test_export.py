@@ -0,0 +1,118 @@
+import csv
+import io
+import json
+from decimal import Decimal
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from app.core import security
+from app.services import export_service
+
+ROWS = [
+    {"amount": "12.50", "category": "food", "occurred_at": "2026-10-01T08:00:00", "note": "lunch"},
+    {"amount": "1000", "category": "salary", "transaction_type": "income",
+     "occurred_at": "2026-10-02T09:00:00"},
+    {"amount": "3.99", "category": "food", "occurred_at": "2026-10-03T10:00:00", "note": 'tab\t"quote"'},
+]
+
+
+@pytest.fixture
+def exported(client, make_user, add_transactions):
+    _, headers = make_user()
+    add_transactions(headers, *ROWS)
+
+    def _export(export_format: str):
+        response = client.get("/api/v1/transactions/export", headers=headers,
+                              params={"format": export_format})
+        assert response.status_code == 200, response.text
+        assert response.headers["content-type"].startswith(export_service.MEDIA_TYPES[export_format])
+        return response
+
+    return _export
+
+
+def _records(rows: list[dict]) -> list[tuple]:
+    return sorted((row["category"], Decimal(str(row["amount"])), row["note"]) for row in rows)
+
+
+EXPECTED = [("food", Decimal("3.99"), 'tab\t"quote"'), ("food", Decimal("12.50"), "lunch"),
+            ("salary", Decimal("1000.00"), None)]
+
+
+@pytest.mark.parametrize("export_format, delimiter", [("csv", ","), ("tsv", "\t")])
+def test_delimited_exports_round_trip(exported, export_format, delimiter):
+    rows = list(csv.DictReader(io.StringIO(exported(export_format).text), delimiter=delimiter))
+
+    assert list(rows[0]) == list(export_service.EXPORT_COLUMNS)
+    assert _records([{**row, "note": row["note"] or None} for row in rows]) == EXPECTED
+
+
+def test_json_exports_round_trip(exported):
+    ndjson = [json.loads(line) for line in exported("ndjson").text.splitlines()]
+    array = json.loads(exported("json").text)
+
+    assert ndjson == array
+    assert _records(array) == EXPECTED
+    assert {row["transaction_type"] for row in array} == {"expense", "income"}
+
+
+def test_json_array_is_valid_across_chunks(monkeypatch, exported):
+    monkeypatch.setattr(export_service, "CHUNK_ROWS", 2)
+
+    assert len(json.loads(exported("json").text)) == len(ROWS)
+
+
+def _check_columnar(table: pa.Table) -> None:
+    assert table.schema.field("category").type == pa.dictionary(pa.int32(), pa.string())
+    assert table.schema.field("transaction_type").type == pa.dictionary(pa.int32(), pa.string())
+    assert table.schema.field("amount").type == pa.decimal128(14, 2)
+    assert _records(table.to_pylist()) == EXPECTED
+
+
+def test_arrow_export_round_trips(exported):
+    table = pa.ipc.open_stream(exported("arrow").content).read_all()
+
+    _check_columnar(table)
+    category = table.column("category").combine_chunks()
+    assert sorted(category.dictionary.to_pylist()) == ["food", "salary"]
+
+
+def test_parquet_export_round_trips(exported, monkeypatch):
+    monkeypatch.setattr(export_service, "COLUMNAR_BATCH_ROWS", 2)
+
+    parquet = pq.ParquetFile(io.BytesIO(exported("parquet").content))
+
+    assert parquet.metadata.num_row_groups == 2
+    _check_columnar(parquet.read())
+
+
+def test_admin_export_covers_every_user(client, make_user, add_transactions):
+    _, first = make_user()
+    _, second = make_user("second@example.com")
+    add_transactions(first, ROWS[0])
+    add_transactions(second, ROWS[1])
+    admin_id, admin = make_user("admin@example.com", role="ADMIN")
+    step_up = security.create_access_token(
+        admin_id, scopes=["admin_step_up"], email_verified=True, token_kind="admin_step_up")
+
+    response = client.get("/api/v1/admin/transactions/export",
+                          headers={**admin, "X-Admin-Step-Up-Token": step_up})
+
+    assert response.status_code == 200, response.text
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.column_names == ["user_id", *export_service.EXPORT_COLUMNS]
+    assert table.num_rows == 2
+    assert len(set(table.column("user_id").to_pylist())) == 2
+
+
+def test_admin_export_is_forbidden_to_other_users(client, make_user):
+    user_id, headers = make_user()
+    step_up = security.create_access_token(
+        user_id, scopes=["admin_step_up"], email_verified=True, token_kind="admin_step_up")
+
+    response = client.get("/api/v1/admin/transactions/export",
+                          headers={**headers, "X-Admin-Step-Up-Token": step_up})
+
+    assert response.status_code == 403
@@ -0,0 +1,107 @@
+import io
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.models import TransactionType
+from app.services import import_service, rollup_service
+
+OFX = """OFXHEADER:100
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><CURDEF>USD<BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20260105120000[-5:EST]<TRNAMT>-42.10<NAME>GROCER<MEMO>weekly</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20260110
+<TRNAMT>100.00
+<NAME>REFUND
+</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>"""
+
+QIF = "!Type:Bank\nD01/15/2026\nT-20.00\nPCafe\nLCoffee\n^\nD01/16'26\nT1,500.00\nPEmployer\nLSalary\n^\nDgarbage\nT1\n^\n"
+
+
+def test_parse_csv_signs_amounts_and_keeps_bad_rows_as_errors():
+    rows = list(import_service.parse_csv(io.StringIO(
+        "date,amount,category,note\n2026-01-02,-12.50,food,lunch\n2026-01-03,2000,,\n2026-01-04,abc,x,\n")))
+
+    assert rows[0] == {"occurred_at": "2026-01-02", "amount": Decimal("12.50"), "category": "food",
+                       "note": "lunch", "transaction_type": TransactionType.EXPENSE}
+    assert rows[1]["transaction_type"] == TransactionType.INCOME
+    assert rows[1]["category"] == import_service.DEFAULT_CATEGORY
+    assert isinstance(rows[2], import_service.ImportFormatError)
+
+
+def test_parse_ofx_reads_sgml_and_line_broken_blocks():
+    first, second = import_service.parse_ofx(io.StringIO(OFX))
+
+    assert first["amount"] == Decimal("42.10")
+    assert first["transaction_type"] == TransactionType.EXPENSE
+    assert first["currency"] == "USD"
+    # 12:00 at UTC-5.
+    assert first["occurred_at"] == datetime(2026, 1, 5, 17)
+    assert second["amount"] == Decimal("100.00")
+    assert second["transaction_type"] == TransactionType.INCOME
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("20260131230000[-5:EST]", datetime(2026, 2, 1, 4)),
+    ("20260201013000.000[+5.30:IST]", datetime(2026, 1, 31, 20)),
+    ("20260131230000", datetime(2026, 1, 31, 23)),
+    ("20260131", datetime(2026, 1, 31)),
+])
+def test_parse_ofx_date_converts_offsets_to_utc(value, expected):
+    assert import_service._parse_ofx_date(value) == expected
+
+
+def test_ofx_offset_crossing_a_month_lands_in_the_utc_month(client, db, make_user):
+    _, headers = make_user(tier="ELITE")
+    ofx = OFX.replace("20260105120000[-5:EST]", "20260131230000[-5:EST]")
+
+    response = client.post("/api/v1/transactions/import", headers=headers,
+                           files={"file": ("bank.ofx", ofx)})
+
+    assert response.json()["imported"] == 2
+    rows = client.get("/api/v1/transactions", headers=headers,
+                      params={"start_at": "2026-02-01T00:00:00"}).json()
+    assert [row["occurred_at"][:19] for row in rows] == ["2026-02-01T04:00:00"]
+    db.rollback()
+    assert rollup_service.verify(db) == []
+
+
+def test_parse_qif_reads_date_variants_and_grouped_amounts():
+    coffee, salary, bad = import_service.parse_qif(io.StringIO(QIF))
+
+    assert coffee["category"] == "Coffee"
+    assert coffee["occurred_at"] == datetime(2026, 1, 15)
+    assert salary["amount"] == Decimal("1500.00")
+    assert salary["occurred_at"] == datetime(2026, 1, 16)
+    assert isinstance(bad, import_service.ImportFormatError)
+
+
+@pytest.mark.parametrize("filename, content, imported, failed", [
+    ("bank.csv", "date,amount,category\n2026-01-02,-12.50,food\nbad,1,x\n", 1, 1),
+    ("bank.ofx", OFX, 2, 0),
+    ("bank.qif", QIF, 2, 1),
+])
+def test_import_endpoint_reports_rows(client, db, make_user, filename, content, imported, failed):
+    _, headers = make_user(tier="ELITE")
+
+    response = client.post("/api/v1/transactions/import", headers=headers,
+                           files={"file": (filename, content)})
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["imported"], body["failed"]) == (imported, failed)
+    assert [error["row"] for error in body["errors"]] == [imported + 1] * failed
+    assert len(client.get("/api/v1/transactions", headers=headers).json()) == imported
+    assert rollup_service.verify(db) == []
+
+
+def test_import_endpoint_rejects_unknown_format(client, make_user):
+    _, headers = make_user()
+
+    response = client.post("/api/v1/transactions/import", headers=headers,
+                           files={"file": ("bank.xls", "x")})
+
+    assert response.status_code == 400
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.main import app
+from app.models import User
+from app.services import last_login_service
+
+from tests.conftest import PASSWORD
+
+
+def _last_login(db, user_id: int) -> datetime | None:
+    db.rollback()
+    return db.get(User, user_id).last_login_at
+
+
+def _login(client) -> None:
+    response = client.post("/api/v1/auth/login", json={"email": "user@example.com", "password": PASSWORD})
+    assert response.status_code == 200, response.text
+
+
+@pytest.fixture
+def writer(monkeypatch):
+    """A running writer that would not flush on its own during the test."""
+    monkeypatch.setattr(settings, "LAST_LOGIN_FLUSH_SECONDS", 3600)
+    last_login_service.start_writer()
+    yield
+    last_login_service.stop_writer()
+
+
+def test_login_without_a_writer_records_last_login(client, db, make_user):
+    user_id, _ = make_user()
+
+    _login(client)
+
+    assert _last_login(db, user_id) is not None
+
+
+def test_shutdown_flushes_buffered_logins(db, make_user, monkeypatch):
+    monkeypatch.setattr(settings, "LAST_LOGIN_FLUSH_SECONDS", 3600)
+    user_id, _ = make_user()
+
+    with TestClient(app) as client:  # runs the lifespan
+        _login(client)
+        assert _last_login(db, user_id) is None
+
+    assert _last_login(db, user_id) is not None
+
+
+def test_buffered_logins_coalesce_per_user(db, make_user, writer):
+    first, _ = make_user()
+    second, _ = make_user("second@example.com")
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+
+    last_login_service.record(first, now)
+    last_login_service.record(first, now - timedelta(minutes=5))  # late arrival
+    last_login_service.record(second, now - timedelta(minutes=1))
+    last_login_service.record(first, now - timedelta(minutes=2))
+
+    assert last_login_service.flush() == 2
+    assert _last_login(db, first).replace(tzinfo=timezone.utc) == now
+    assert _last_login(db, second).replace(tzinfo=timezone.utc) == now - timedelta(minutes=1)
+    assert last_login_service.flush() == 0
+
+
+def test_failed_flush_is_retried(db, make_user, writer, monkeypatch):
+    user_id, _ = make_user()
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    last_login_service.record(user_id, now)
+    write = last_login_service._write
+
+    def _unavailable(entries):
+        raise OperationalError("UPDATE users", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(last_login_service, "_write", _unavailable)
+    assert last_login_service.flush() == 0
+    monkeypatch.setattr(last_login_service, "_write", write)
+
+    assert last_login_service.flush() == 1
+    assert _last_login(db, user_id).replace(tzinfo=timezone.utc) == now
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services import advice_service
+
+
+@pytest.fixture
+def providers(monkeypatch):
+    """Fake providers: ``name -> (seconds, answer)``; returns the providers called."""
+    called: list[str] = []
+
+    def _install(**behaviour: tuple[float, str | None]) -> list[str]:
+        def _fake(provider, seconds, answer):
+            async def _call(*args):
+                called.append(provider)
+                await asyncio.sleep(seconds)
+                return answer
+            return _call
+
+        calls = {provider: _fake(provider, *behaviour[provider]) for provider in behaviour}
+        monkeypatch.setattr(advice_service, "_PROVIDER_CALLS", calls)
+        for provider in advice_service.PROVIDERS:
+            key = "key" if provider in behaviour else None
+            monkeypatch.setattr(settings, advice_service._PROVIDER_KEYS[provider], key)
+        return called
+
+    monkeypatch.setattr(settings, "AI_PROVIDER_ADAPTIVE_ORDER", False)
+    monkeypatch.setattr(settings, "AI_HEDGE_DEFAULT_DELAY_SECONDS", 0.05)
+    monkeypatch.setattr(advice_service, "provider_stats",
+                        {provider: advice_service.ProviderStats() for provider in advice_service.PROVIDERS})
+    return _install
+
+
+def _answer() -> str | None:
+    return asyncio.run(advice_service._provider_answer())
+
+
+def test_sequential_is_the_default():
+    assert type(settings).model_fields["AI_PROVIDER_STRATEGY"].default == "sequential"
+
+
+def test_sequential_falls_back_only_when_a_provider_fails(providers, monkeypatch):
+    monkeypatch.setattr(settings, "AI_PROVIDER_STRATEGY", "sequential")
+    called = providers(groq=(0.01, None), gemini=(0.2, "gemini"), openai=(0.01, "openai"))
+
+    assert _answer() == "gemini"
+    assert called == ["groq", "gemini"]
+    assert advice_service.provider_stats["groq"].errors > 0
+    assert advice_service.provider_stats["openai"].latency is None
+
+
+def test_hedged_starts_the_next_provider_after_the_hedge_delay(providers, monkeypatch):
+    monkeypatch.setattr(settings, "AI_PROVIDER_STRATEGY", "hedged")
+    called = providers(groq=(1.0, "groq"), gemini=(0.01, "gemini"), openai=(0.01, "openai"))
+
+    assert _answer() == "gemini"
+    assert called == ["groq", "gemini"]
+
+
+def test_race_takes_the_fastest_answer(providers, monkeypatch):
+    monkeypatch.setattr(settings, "AI_PROVIDER_STRATEGY", "race")
+    called = providers(groq=(1.0, "groq"), gemini=(0.5, "gemini"), openai=(0.01, "openai"))
+
+    assert _answer() == "openai"
+    assert sorted(called) == ["gemini", "groq", "openai"]
+
+
+def test_cancelled_provider_is_recorded_as_a_failure(providers, monkeypatch):
+    monkeypatch.setattr(settings, "AI_PROVIDER_STRATEGY", "race")
+    providers(groq=(1.0, "groq"), openai=(0.05, "openai"))
+
+    assert _answer() == "openai"
+
+    stats = advice_service.provider_stats["groq"]
+    assert stats.latency is not None and 0.05 <= stats.latency < 1.0
+    assert stats.errors > 0
+    assert not stats.recent
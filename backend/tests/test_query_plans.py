@@ -0,0 +1,174 @@
+"""Query-plan regression tests for the transaction service.
+
+Every hot service query runs against a seeded scratch database, and the
+database is asked for its plan (EXPLAIN QUERY PLAN on SQLite, EXPLAIN on
+MySQL). A test fails if a statement falls back to a full table or index scan.
+
+Runs on in-memory SQLite by default. To check MySQL, point
+``QUERY_PLAN_DATABASE_URL`` at a throwaway schema, which is created and
+dropped by the tests.
+"""
+import os
+import re
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.database import Base
+from app.services import category_service, rollup_service, transaction_service
+
+CHECKED_TABLES = {"transactions", "transaction_rollups", "categories"}
+USERS = 3
+ROWS_PER_USER = 2000
+CATEGORIES = ["food", "rent", "salary", "travel", "bills", "fun"]
+
+
+def _seed(db: Session) -> int:
+    now = datetime.now(timezone.utc)
+    user_ids = []
+    for index in range(USERS):
+        user = models.User(
+            email=f"plan{index}@example.com", hashed_password="x")
+        db.add(user)
+        db.flush()
+        user_ids.append(user.id)
+
+    rows = []
+    for user_id in user_ids:
+        category_ids = category_service.ids_by_name(
+            db, user_id, CATEGORIES, create=True)
+        for index in range(ROWS_PER_USER):
+            rows.append({
+                "user_id": user_id,
+                "category_id": category_ids[CATEGORIES[index % len(CATEGORIES)]],
+                "amount": Decimal(index % 97) + Decimal("0.50"),
+                "amount_base": Decimal(index % 97) + Decimal("0.50"),
+                "currency": "EUR",
+                "transaction_type": (
+                    models.TransactionType.INCOME if index % 5 == 0 else models.TransactionType.EXPENSE
+                ),
+                "occurred_at": now - timedelta(hours=index * 7),
+                "is_deleted": False,
+            })
+    db.execute(insert(models.Transaction), rows)
+    rollup_service.rebuild(db)
+    db.commit()
+    return user_ids[0]
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _first_page_cursor(db: Session, user_id: int) -> str | None:
+    return transaction_service.next_cursor(
+        transaction_service.list_transactions(db, user_id, limit=50), 50)
+
+
+SERVICE_QUERIES: dict[str, Callable[[Session, int], object]] = {
+    "list_transactions": lambda db, user_id: transaction_service.list_transactions(db, user_id, limit=50),
+    "list_transactions_offset": lambda db, user_id: transaction_service.list_transactions(
+        db, user_id, limit=50, offset=500),
+    "list_transactions_cursor": lambda db, user_id: transaction_service.list_transactions(
+        db, user_id, limit=50, cursor=_first_page_cursor(db, user_id)),
+    "list_transactions_filtered": lambda db, user_id: transaction_service.list_transactions(
+        db, user_id, start_at=_now() - timedelta(days=30), end_at=_now(),
+        transaction_type=models.TransactionType.EXPENSE, limit=50),
+    "list_transactions_category": lambda db, user_id: transaction_service.list_transactions(
+        db, user_id, category="rent", limit=50),
+    "list_transactions_search": lambda db, user_id: transaction_service.list_transactions(
+        db, user_id, q="food", limit=50),
+    "stream_transactions": lambda db, user_id: list(transaction_service.stream_transactions(db, user_id)),
+    "monthly_summary": lambda db, user_id: transaction_service.monthly_summary(db, user_id, _now()),
+    "top_expense_categories": lambda db, user_id: transaction_service.top_expense_categories(
+        db, user_id, _now()),
+    "monthly_insight": lambda db, user_id: transaction_service.monthly_insight(db, user_id, _now().date()),
+    "time_series_day": lambda db, user_id: transaction_service.time_series(
+        db, user_id, granularity="day", start=(_now() - timedelta(days=60)).date()),
+    "time_series_week_category": lambda db, user_id: transaction_service.time_series(
+        db, user_id, granularity="week", group_by="category"),
+    "time_series_month_category": lambda db, user_id: transaction_service.time_series(
+        db, user_id, granularity="month", group_by="category"),
+    "time_series_year": lambda db, user_id: transaction_service.time_series(
+        db, user_id, granularity="year"),
+    "all_time_summary": lambda db, user_id: transaction_service.all_time_summary(db, user_id),
+    "all_time_expense_categories": lambda db, user_id: transaction_service.all_time_expense_categories(
+        db, user_id),
+    "monthly_breakdown": lambda db, user_id: transaction_service.monthly_breakdown(db, user_id, months=6),
+}
+
+
+def _capture(engine, db: Session, call: Callable[[], object]) -> list[tuple[str, object]]:
+    captured: list[tuple[str, object]] = []
+
+    def _listener(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _listener)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", _listener)
+    return captured
+
+
+def _sqlite_scans(db: Session, statement: str, parameters) -> list[str]:
+    raw = db.connection().connection.driver_connection
+    rows = raw.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    problems = []
+    for row in rows:
+        detail = row[-1]
+        match = re.match(r"SCAN (\w+)", detail)
+        if match and match.group(1) in CHECKED_TABLES:
+            problems.append(detail)
+    return problems
+
+
+def _mysql_scans(db: Session, statement: str, parameters) -> list[str]:
+    raw = db.connection().connection.driver_connection
+    with raw.cursor() as cursor:
+        cursor.execute(f"EXPLAIN {statement}", parameters)
+        columns = [column[0] for column in cursor.description]
+        rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    return [
+        f"{row['table']}: type={row['type']} key={row['key']}"
+        for row in rows
+        if row.get("table") in CHECKED_TABLES and row.get("type") in {"ALL", "index"}
+    ]
+
+
+@pytest.fixture(scope="module")
+def seeded():
+    engine = create_engine(os.environ.get("QUERY_PLAN_DATABASE_URL", "sqlite://"))
+    Base.metadata.create_all(engine)
+    try:
+        with Session(engine) as db:
+            user_id = _seed(db)
+            if engine.dialect.name == "sqlite":
+                db.execute(text("ANALYZE"))
+            else:
+                db.execute(text("ANALYZE TABLE transactions, transaction_rollups"))
+            db.commit()
+            yield engine, db, user_id
+    finally:
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+@pytest.mark.parametrize("name", SERVICE_QUERIES)
+def test_service_query_uses_indexes(seeded, name):
+    engine, db, user_id = seeded
+    explain = _sqlite_scans if engine.dialect.name == "sqlite" else _mysql_scans
+
+    statements = _capture(engine, db, lambda: SERVICE_QUERIES[name](db, user_id))
+
+    assert statements, "the query ran no SELECT"
+    problems = [problem for statement, parameters in statements
+                for problem in explain(db, statement, parameters)]
+    assert not problems, f"full scan: {problems}"
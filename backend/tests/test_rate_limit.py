@@ -0,0 +1,85 @@
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.core.rate_limit import MemoryBackend, RateLimiter, SQLiteBackend
+
+# A minute boundary just ahead of the clock: the SQLite backend prunes rows
+# whose slot has expired by wall time.
+START = (time.time() // 60 + 1) * 60
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBackend(max_keys=100)
+    return SQLiteBackend(str(tmp_path / "rate_limits.db"))
+
+
+def test_hits_expire_as_the_window_slides(backend):
+    limiter = RateLimiter("test", limit=3, window_seconds=60, buckets=6, backend=backend)
+
+    assert [limiter.hit("key", now=START + offset) for offset in (0, 10, 20, 30)] == [1, 2, 3, 4]
+    assert limiter.is_limited("key", now=START + 35)
+    # The first hit leaves the window when its slot does, at START + 60.
+    assert limiter.retry_after("key", now=START + 35) == 35
+    assert limiter.count("key", now=START + 60) == 3
+    assert limiter.count("key", now=START + 70) == 2
+    assert limiter.retry_after("key", now=START + 70) == 0
+    assert limiter.count("key", now=START + 200) == 0
+
+
+def test_hit_cost_and_reset(backend):
+    limiter = RateLimiter("test", limit=100, window_seconds=60, backend=backend)
+
+    assert limiter.hit("key", cost=40, now=START) == 40
+    assert limiter.hit("key", cost=70, now=START + 1) == 110
+    assert limiter.is_limited("key", now=START + 2)
+    assert limiter.count("other", now=START + 2) == 0
+
+    limiter.reset("key")
+    assert limiter.count("key", now=START + 2) == 0
+
+
+def test_limiters_keep_separate_counts_per_name(backend):
+    first = RateLimiter("first", limit=1, window_seconds=60, backend=backend)
+    second = RateLimiter("second", limit=1, window_seconds=60, backend=backend)
+
+    first.hit("key", now=START)
+
+    assert first.is_limited("key", now=START)
+    assert not second.is_limited("key", now=START)
+
+
+def test_memory_backend_drops_least_recently_used_keys():
+    backend = MemoryBackend(max_keys=3)
+    limiter = RateLimiter("test", limit=10, window_seconds=60, backend=backend)
+
+    for key in "abcd":
+        limiter.hit(key, now=START)
+
+    assert len(backend) == 3
+    assert limiter.count("a", now=START) == 0
+    assert limiter.count("d", now=START) == 1
+
+
+def test_sqlite_backend_is_shared_between_workers(tmp_path):
+    path = str(tmp_path / "rate_limits.db")
+    workers = [RateLimiter("shared", limit=5, window_seconds=60, backend=SQLiteBackend(path))
+               for _ in range(2)]
+
+    for index in range(5):
+        workers[index % 2].hit("ip", now=START)
+
+    assert all(worker.is_limited("ip", now=START + 1) for worker in workers)
+
+
+def test_login_is_limited_per_client_after_repeated_failures(client):
+    credentials = {"email": "nobody@example.com", "password": "wrong-password"}
+
+    for _ in range(settings.AUTH_MAX_FAILED_ATTEMPTS):
+        assert client.post("/api/v1/auth/login", json=credentials).status_code == 400
+
+    response = client.post("/api/v1/auth/login", json=credentials)
+    assert response.status_code == 429
@@ -0,0 +1,51 @@
+from decimal import Decimal
+
+from app.services import rollup_service
+
+
+def _insight(client, headers, reference_date):
+    response = client.get("/api/v1/transactions/insights/monthly", headers=headers,
+                          params={"reference_date": reference_date})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_rollups_follow_every_transaction_write(client, db, make_user, add_transactions):
+    _, headers = make_user(tier="ELITE")
+    food, snack, salary, rent = add_transactions(
+        headers,
+        {"amount": "10.5", "occurred_at": "2026-01-05T10:00:00"},
+        {"amount": "4.5", "occurred_at": "2026-01-20T10:00:00"},
+        {"amount": "1000", "category": "salary", "transaction_type": "income",
+         "occurred_at": "2026-01-01T10:00:00"},
+        {"amount": "300", "category": "rent", "occurred_at": "2025-12-01T10:00:00"},
+    )
+    assert rollup_service.verify(db) == []
+
+    for transaction_id, body in [
+        (food, {"amount": "20", "category": "groceries"}),
+        (snack, {"occurred_at": "2026-02-02T00:00:00"}),
+        (salary, {"amount": "1200"}),
+    ]:
+        response = client.patch(f"/api/v1/transactions/{transaction_id}", headers=headers, json=body)
+        assert response.status_code == 200, response.text
+    assert client.delete(f"/api/v1/transactions/{rent}", headers=headers).status_code == 204
+    db.rollback()
+    assert rollup_service.verify(db) == []
+
+    january = _insight(client, headers, "2026-01-10")
+    assert Decimal(january["total_income"]) == Decimal("1200")
+    assert Decimal(january["total_expense"]) == Decimal("20")
+    assert Decimal(_insight(client, headers, "2026-02-10")["total_expense"]) == Decimal("4.5")
+
+
+def test_rollups_follow_currency_change(client, db, make_user, add_transactions):
+    _, headers = make_user(tier="ELITE")
+    add_transactions(headers, {"amount": "100", "occurred_at": "2026-01-05T10:00:00"})
+
+    response = client.post("/api/v1/users/me/change-currency", headers=headers,
+                           json={"new_currency": "MKD"})
+    assert response.status_code == 200, response.text
+
+    assert rollup_service.verify(db) == []
+    assert Decimal(_insight(client, headers, "2026-01-10")["total_expense"]) > Decimal("100")
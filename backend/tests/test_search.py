@@ -0,0 +1,46 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import mysql
+
+from app.models import Transaction
+from app.services import search_service
+
+
+def _search(client, headers, q):
+    response = client.get("/api/v1/transactions", headers=headers, params={"q": q})
+    assert response.status_code == 200, response.text
+    return sorted(row["id"] for row in response.json())
+
+
+def test_search_matches_words_across_note_and_category(client, make_user, add_transactions):
+    _, headers = make_user(tier="ELITE")
+    coffee_beans, coffee_only, beans_only = add_transactions(
+        headers,
+        {"amount": "3", "category": "Coffee", "note": "beans from the cafe", "occurred_at": "2026-01-01T00:00:00"},
+        {"amount": "3", "category": "Coffee", "note": "espresso", "occurred_at": "2026-01-02T00:00:00"},
+        {"amount": "3", "category": "Groceries", "note": "beans", "occurred_at": "2026-01-03T00:00:00"},
+    )
+
+    assert _search(client, headers, "coffee beans") == [coffee_beans]
+    assert _search(client, headers, "coff") == [coffee_beans, coffee_only]
+    assert _search(client, headers, "bean") == [coffee_beans, beans_only]
+
+
+def test_search_without_words_is_rejected(client, make_user):
+    _, headers = make_user()
+
+    response = client.get("/api/v1/transactions", headers=headers, params={"q": "+*-"})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("query", ["coffee beans", "coffee"])
+def test_mysql_search_requires_each_word_in_note_or_category(query):
+    statement = search_service.apply_search(select(Transaction.id), query, "mysql")
+    sql = str(statement.compile(dialect=mysql.dialect(), compile_kwargs={"literal_binds": True}))
+
+    where = sql.split("WHERE", 1)[1].split("ORDER BY")[0]
+    for term in query.split():
+        assert f"MATCH (transactions.note) AGAINST ('{term}*' IN BOOLEAN MODE)" in where
+        assert f"MATCH (categories.name) AGAINST ('{term}*' IN BOOLEAN MODE)" in where
+    assert where.count("transactions.category_id IN") == len(query.split())
@@ -0,0 +1,119 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import update
+
+from app.models import TransactionRollup
+from app.services import transaction_service
+
+ROWS = (
+    {"amount": "10", "occurred_at": "2026-03-02T08:00:00"},
+    {"amount": "5", "occurred_at": "2026-03-02T20:00:00"},
+    {"amount": "7", "category": "travel", "occurred_at": "2026-03-11T08:00:00"},
+    {"amount": "1000", "category": "salary", "transaction_type": "income",
+     "occurred_at": "2026-05-31T23:00:00"},
+)
+
+
+def _series(client, headers, **params) -> dict:
+    response = client.get("/api/v1/transactions/insights/series", headers=headers, params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _points(body: dict, key: str) -> list[tuple[str, Decimal, int]]:
+    (series,) = [series for series in body["series"] if series["key"] == key]
+    return [(point["period_start"], Decimal(point["amount"]), point["count"]) for point in series["points"]]
+
+
+@pytest.fixture
+def headers(make_user, add_transactions):
+    _, headers = make_user(tier="ELITE")
+    add_transactions(headers, *ROWS)
+    return headers
+
+
+def test_day_series_fills_gaps_with_zeros(client, headers):
+    body = _series(client, headers, granularity="day", start="2026-03-01", end="2026-03-04")
+
+    assert (body["start"], body["end"]) == ("2026-03-01", "2026-03-04")
+    assert [series["key"] for series in body["series"]] == ["expense"]
+    assert _points(body, "expense") == [
+        ("2026-03-01", Decimal("0"), 0),
+        ("2026-03-02", Decimal("15"), 2),
+        ("2026-03-03", Decimal("0"), 0),
+        ("2026-03-04", Decimal("0"), 0),
+    ]
+
+
+def test_week_series_widens_the_range_to_whole_weeks(client, headers):
+    # 2026-03-04 is a Wednesday; weeks start on Monday.
+    body = _series(client, headers, granularity="week", start="2026-03-04", end="2026-03-12",
+                   group_by="category")
+
+    assert (body["start"], body["end"]) == ("2026-03-02", "2026-03-15")
+    assert _points(body, "food") == [("2026-03-02", Decimal("15"), 2), ("2026-03-09", Decimal("0"), 0)]
+    assert _points(body, "travel") == [("2026-03-02", Decimal("0"), 0), ("2026-03-09", Decimal("7"), 1)]
+
+
+def test_month_and_year_series_read_the_rollups(client, db, headers):
+    month = _series(client, headers, granularity="month", start="2026-02-10", end="2026-05-01")
+    assert (month["start"], month["end"]) == ("2026-02-01", "2026-05-31")
+    assert _points(month, "expense") == [
+        ("2026-02-01", Decimal("0"), 0), ("2026-03-01", Decimal("22"), 3),
+        ("2026-04-01", Decimal("0"), 0), ("2026-05-01", Decimal("0"), 0),
+    ]
+    assert _points(month, "income")[-1] == ("2026-05-01", Decimal("1000"), 1)
+
+    # Only the rollup path sees a change made to the rollups alone.
+    db.execute(update(TransactionRollup).values(total_amount=TransactionRollup.total_amount * 2))
+    db.commit()
+    year = _series(client, headers, granularity="year", start="2026-06-01", end="2026-06-01")
+    assert _points(year, "expense") == [("2026-01-01", Decimal("44"), 3)]
+    day = _series(client, headers, granularity="day", start="2026-03-02", end="2026-03-02")
+    assert _points(day, "expense") == [("2026-03-02", Decimal("15"), 2)]
+
+
+def test_transaction_type_filter(client, headers):
+    body = _series(client, headers, granularity="month", start="2026-03-01", end="2026-05-31",
+                   transaction_type="income")
+
+    assert [series["key"] for series in body["series"]] == ["income"]
+
+
+def test_default_range_is_the_last_buckets_up_to_today(client, make_user, add_transactions):
+    _, headers = make_user(tier="ELITE")
+    today = date.today()
+    add_transactions(headers, {"amount": "1", "occurred_at": f"{today}T00:00:00"})
+
+    body = _series(client, headers, granularity="week")
+
+    points = _points(body, "expense")
+    assert len(points) == transaction_service.DEFAULT_SERIES_SPAN["week"]
+    assert points[-1] == ((today - timedelta(days=today.weekday())).isoformat(), Decimal("1"), 1)
+
+
+@pytest.mark.parametrize("granularity, start, end, points", [
+    ("day", "2026-01-01", "2028-09-26", 1000),
+    ("day", "2026-01-01", "2028-09-27", None),
+    ("month", "1950-01-01", "2026-12-31", 924),
+])
+def test_series_is_capped_at_max_points(client, headers, granularity, start, end, points):
+    response = client.get("/api/v1/transactions/insights/series", headers=headers,
+                          params={"granularity": granularity, "start": start, "end": end})
+
+    if points is None:
+        assert response.status_code == 400
+        assert str(transaction_service.MAX_SERIES_POINTS) in response.json()["detail"]
+    else:
+        assert response.status_code == 200, response.text
+        assert len(response.json()["series"][0]["points"]) == points
+
+
+def test_start_after_end_is_rejected(client, headers):
+    response = client.get("/api/v1/transactions/insights/series", headers=headers,
+                          params={"start": "2026-03-02", "end": "2026-03-01"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "start must not be after end"
@@ -0,0 +1,166 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import insert
+
+from app.core.rate_limit import RateLimiter
+from app.models import Transaction, TransactionType
+from app.services import advice_service, category_service, rollup_service, user_service
+
+DAYS = 120
+
+
+@pytest.fixture
+def seed_daily(db):
+    """One 1.00 expense per day for the last ``DAYS`` days."""
+
+    def _seed(user_id: int) -> None:
+        category_id = category_service.id_for(db, user_id, "food")
+        now = datetime.now(timezone.utc)
+        db.execute(insert(Transaction), [{
+            "user_id": user_id, "category_id": category_id, "amount": Decimal("1"),
+            "amount_base": Decimal("1"), "currency": "EUR",
+            "transaction_type": TransactionType.EXPENSE, "occurred_at": now - timedelta(days=day),
+        } for day in range(DAYS)])
+        rollup_service.rebuild(db, user_id)
+        db.commit()
+
+    return _seed
+
+
+def _first_day(days: int) -> date:
+    return datetime.now(timezone.utc).date() - timedelta(days=days)
+
+
+def _listed(client, headers, **params) -> list[dict]:
+    response = client.get("/api/v1/transactions", headers=headers, params={"limit": 500, **params})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_page_size_is_capped_by_tier(client, make_user, seed_daily):
+    free_id, free = make_user()
+    elite_id, elite = make_user("elite@example.com", tier="ELITE")
+    seed_daily(free_id)
+    seed_daily(elite_id)
+
+    assert len(_listed(client, free)) == 50
+    assert len(_listed(client, elite)) == DAYS
+
+
+def test_history_window_limits_listing_and_export(client, make_user, seed_daily):
+    user_id, headers = make_user()
+    seed_daily(user_id)
+    first_day = _first_day(90)
+
+    rows = _listed(client, headers, start_at="2000-01-01T00:00:00", offset=50)
+    assert min(row["occurred_at"][:10] for row in rows) >= first_day.isoformat()
+    assert len(rows) < DAYS - 50
+
+    export = client.get("/api/v1/transactions/export", headers=headers, params={"format": "ndjson"})
+    assert len(export.text.strip().splitlines()) == 50 + len(rows)
+
+
+def test_history_window_clamps_series_start(client, make_user, seed_daily):
+    free_id, free = make_user()
+    elite_id, elite = make_user("elite@example.com", tier="ELITE")
+    seed_daily(free_id)
+    seed_daily(elite_id)
+    start = _first_day(200).isoformat()
+    params = {"granularity": "day", "start": start}
+
+    free_series = client.get("/api/v1/transactions/insights/series", headers=free, params=params).json()
+    elite_series = client.get("/api/v1/transactions/insights/series", headers=elite, params=params).json()
+
+    assert free_series["start"] == _first_day(90).isoformat()
+    assert elite_series["start"] == start
+
+    def _count(series):
+        return sum(point["count"] for line in series["series"] for point in line["points"])
+
+    assert _count(free_series) < _count(elite_series) == DAYS
+
+
+@pytest.mark.parametrize("granularity", ["week", "month", "year"])
+def test_history_window_cuts_the_first_bucket(client, make_user, seed_daily, granularity):
+    user_id, headers = make_user()
+    seed_daily(user_id)
+    first_day = _first_day(90)
+    params = {"granularity": granularity, "start": "2000-01-01"}
+
+    body = client.get("/api/v1/transactions/insights/series", headers=headers, params=params).json()
+
+    points = [point for line in body["series"] for point in line["points"]]
+    assert body["start"] == first_day.isoformat()
+    # Only the rows from the window's first day on, although the first bucket starts earlier.
+    assert sum(point["count"] for point in points) == 91
+    assert sum(Decimal(point["amount"]) for point in points) == Decimal("91")
+
+
+def test_history_window_zeroes_the_month_before_it(client, make_user, seed_daily):
+    free_id, free = make_user()
+    elite_id, elite = make_user("elite@example.com", tier="ELITE")
+    seed_daily(free_id)
+    seed_daily(elite_id)
+    first_day = _first_day(90)
+    today = datetime.now(timezone.utc).date()
+    days = [today - timedelta(days=day) for day in range(DAYS)]
+    params = {"reference_date": first_day.isoformat()}
+
+    free_insight = client.get("/api/v1/transactions/insights/monthly", headers=free, params=params).json()
+    elite_insight = client.get("/api/v1/transactions/insights/monthly", headers=elite, params=params).json()
+
+    in_window = sum(day >= first_day and day.month == first_day.month for day in days)
+    assert Decimal(free_insight["total_expense"]) == in_window
+    assert (Decimal(free_insight["prev_total_expense"]), Decimal(free_insight["carryover"])) == (0, 0)
+    whole_month = sum(day.replace(day=1) == first_day.replace(day=1) for day in days)
+    assert Decimal(elite_insight["total_expense"]) == whole_month >= in_window
+    assert Decimal(elite_insight["prev_total_expense"]) > 0
+
+
+def test_history_window_clamps_insight_reference_date(client, make_user):
+    _, free = make_user()
+    _, elite = make_user("elite@example.com", tier="ELITE")
+    params = {"reference_date": "2000-01-15"}
+
+    free_insight = client.get("/api/v1/transactions/insights/monthly", headers=free, params=params)
+    elite_insight = client.get("/api/v1/transactions/insights/monthly", headers=elite, params=params)
+
+    assert free_insight.json()["month"] == _first_day(90).strftime("%Y-%m")
+    assert elite_insight.json()["month"] == "2000-01"
+
+
+def test_advice_quota_answers_429_with_retry_after(client, make_user):
+    user_id, headers = make_user()
+    quota = user_service.TIER_LIMITS["FREE"]["max_advice_requests_per_day"]
+
+    for _ in range(quota):
+        response = client.post("/api/v1/advice", headers=headers, json={"question": "How am I doing?"})
+        assert response.status_code == 201, response.text
+    for _ in range(3):
+        response = client.post("/api/v1/advice", headers=headers, json={"question": "How am I doing?"})
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) > 0
+
+    # Refused requests are not counted against the quota.
+    assert advice_service._request_quotas["FREE"].count(str(user_id)) == quota
+
+
+def test_acquire_never_goes_over_the_limit():
+    limiter = RateLimiter("test", limit=10, window_seconds=60)
+
+    assert limiter.acquire("key", cost=6)
+    assert not limiter.acquire("key", cost=5)
+    assert limiter.acquire("key", cost=4)
+    assert not limiter.acquire("key")
+    assert limiter.count("key") == 10
+
+
+def test_token_budget_refuses_a_reservation_over_the_limit():
+    budget = advice_service._token_budget.limit
+
+    assert advice_service._reserve_tokens(1, budget - 100)
+    assert not advice_service._reserve_tokens(1, 200)
+    assert advice_service._reserve_tokens(1, 100)
+    assert advice_service._token_budget.count("1") == budget
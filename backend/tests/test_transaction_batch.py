@@ -0,0 +1,111 @@
+from decimal import Decimal
+
+import pytest
+
+from app.models import Category, Transaction
+from app.services import rollup_service, transaction_service
+
+WHEN = "2026-01-05T00:00:00"
+
+
+def _create(category: str, amount: str, currency: str = "EUR") -> dict:
+    return {"op": "create", "data": {
+        "category": category, "amount": amount, "currency": currency,
+        "transaction_type": "expense", "occurred_at": WHEN}}
+
+
+def _batch(client, headers, *operations, mode="atomic"):
+    response = client.post("/api/v1/transactions/batch", headers=headers,
+                           json={"mode": mode, "operations": list(operations)})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _amounts(client, headers) -> dict[int, Decimal]:
+    rows = client.get("/api/v1/transactions", headers=headers).json()
+    return {row["id"]: Decimal(row["amount"]) for row in rows}
+
+
+@pytest.fixture
+def failing_currency(monkeypatch):
+    """Make conversions from ``XXX`` raise, after the category was created."""
+    convert = transaction_service.convert_amount
+
+    def _convert(amount, from_currency, *args):
+        if from_currency == "XXX":
+            raise ValueError("No rate for XXX")
+        return convert(amount, from_currency, *args)
+
+    monkeypatch.setattr(transaction_service, "convert_amount", _convert)
+
+
+def test_atomic_batch_rolls_back_on_first_failure(client, db, make_user, add_transactions):
+    _, headers = make_user(tier="ELITE")
+    _, other_headers = make_user("other@example.com")
+    first, second = add_transactions(headers, {"amount": "1", "occurred_at": WHEN},
+                                     {"amount": "2", "occurred_at": WHEN})
+    (foreign,) = add_transactions(other_headers, {"amount": "3", "occurred_at": WHEN})
+
+    body = _batch(client, headers,
+                  {"op": "update", "id": first, "data": {"amount": "5"}},
+                  {"op": "delete", "id": foreign},
+                  {"op": "delete", "id": second})
+
+    assert body["committed"] is False
+    assert [result["status_code"] for result in body["results"]] == [424, 404, 424]
+    assert _amounts(client, headers) == {first: Decimal("1"), second: Decimal("2")}
+    assert rollup_service.verify(db) == []
+
+
+def test_best_effort_batch_commits_everything_but_the_failures(
+        client, db, make_user, add_transactions, failing_currency):
+    _, headers = make_user(tier="ELITE")
+    _, other_headers = make_user("other@example.com")
+    first, second = add_transactions(headers, {"amount": "1", "occurred_at": WHEN},
+                                     {"amount": "2", "occurred_at": WHEN})
+    (foreign,) = add_transactions(other_headers, {"amount": "3", "occurred_at": WHEN})
+
+    body = _batch(client, headers,
+                  {"op": "update", "id": first, "data": {"amount": "5"}},
+                  {"op": "delete", "id": foreign},
+                  _create("books", "9"),
+                  _create("travel", "7", currency="XXX"),
+                  {"op": "delete", "id": second},
+                  {"op": "delete", "id": second},
+                  mode="best_effort")
+
+    assert body["committed"] is True
+    assert [result["status_code"] for result in body["results"]] == [200, 404, 201, 400, 200, 404]
+    assert body["results"][3]["error"] == "No rate for XXX"
+    assert body["results"][2]["transaction"]["category"] == "books"
+    created = body["results"][2]["id"]
+    assert _amounts(client, headers) == {first: Decimal("5"), created: Decimal("9")}
+    # The failed create's category was rolled back with its savepoint.
+    assert db.query(Category).filter_by(name="travel").count() == 0
+    assert rollup_service.verify(db) == []
+
+    # A later write of the same category recreates it instead of reusing a stale id.
+    body = _batch(client, headers, _create("travel", "4"))
+    db.rollback()
+    travel = db.query(Category).filter_by(name="travel").one()
+    assert db.get(Transaction, body["results"][0]["id"]).category_id == travel.id
+    assert rollup_service.verify(db) == []
+
+
+def test_atomic_batch_reports_value_errors_as_bad_request(client, make_user, failing_currency):
+    _, headers = make_user(tier="ELITE")
+
+    body = _batch(client, headers, _create("books", "9"), _create("travel", "7", currency="XXX"))
+
+    assert body["committed"] is False
+    assert [result["status_code"] for result in body["results"]] == [424, 400]
+    assert _amounts(client, headers) == {}
+
+
+def test_batch_rejects_unknown_operations(client, make_user):
+    _, headers = make_user()
+
+    response = client.post("/api/v1/transactions/batch", headers=headers,
+                           json={"operations": [{"op": "nope"}]})
+
+    assert response.status_code == 422
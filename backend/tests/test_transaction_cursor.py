@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.models import Transaction
+from app.services import transaction_service
+
+
+def test_cursor_round_trip():
+    occurred_at = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    cursor = transaction_service.encode_cursor(Transaction(id=42, occurred_at=occurred_at))
+
+    assert "=" not in cursor
+    assert transaction_service.decode_cursor(cursor) == (occurred_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["zzz", "bm90LWpzb24", "eyJ0IjoxfQ"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as excinfo:
+        transaction_service.decode_cursor(cursor)
+    assert excinfo.value.status_code == 400
+
+
+def test_cursor_pages_cover_every_row_once(client, make_user, add_transactions):
+    _, headers = make_user()
+    start = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(days=10)
+    # Three rows per timestamp, so pages have to break ties on id.
+    created = add_transactions(headers, *(
+        {"amount": "1.50", "occurred_at": (start + timedelta(hours=index // 3)).isoformat()}
+        for index in range(25)
+    ))
+
+    seen: list[int] = []
+    params: dict = {"limit": 7}
+    while True:
+        response = client.get("/api/v1/transactions", headers=headers, params=params)
+        assert response.status_code == 200
+        seen += [row["id"] for row in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params = {"limit": 7, "cursor": cursor}
+
+    assert sorted(seen) == sorted(created)
+    assert len(seen) == len(set(seen))
+
+
+def test_cursor_and_offset_together_are_rejected(client, make_user):
+    _, headers = make_user()
+    response = client.get("/api/v1/transactions", headers=headers,
+                          params={"cursor": "abc", "offset": 3})
+    assert response.status_code == 400